@@ -1,6 +1,44 @@
+import json
+
+from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Inquiry, Batch, Student, Fee, Attendance, PlacementOutreach
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+from .models import User, Inquiry, InquiryFollowup, Batch, Student, Fee, Attendance, PlacementOutreach
+
+
+def planner_estimate(queryset):
+    """The PostgreSQL planner's row estimate for ``queryset``, or None elsewhere."""
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+    try:
+        plan = json.loads(queryset.explain(format='json'))
+    except (DatabaseError, ValueError):
+        return None
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Changelist paginator that shows the planner's estimate instead of running
+    COUNT(*) once a table is past ADMIN_EXACT_COUNT_LIMIT rows; small and
+    narrowly filtered lists still get exact counts.
+    """
+
+    @cached_property
+    def count(self):
+        estimate = planner_estimate(self.object_list)
+        if estimate is None or estimate < settings.ADMIN_EXACT_COUNT_LIMIT:
+            return super().count
+        return estimate
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) behind "N results (M total)"
+    show_full_result_count = False
 
 
 @admin.register(User)
@@ -9,7 +47,7 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('role', 'is_staff', 'is_active')
     search_fields = ('username', 'email')
     ordering = ('username',)
-    
+
     # Add role field to the admin form
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Role Info', {'fields': ('role', 'phone')}),
@@ -20,53 +58,79 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(Inquiry)
-class InquiryAdmin(admin.ModelAdmin):
+class InquiryAdmin(LargeTableAdmin):
     list_display = ('name', 'mobile', 'interested_course', 'college', 'created_at')
     list_filter = ('interested_course', 'source', 'created_at')
     search_fields = ('name', 'mobile', 'email')
+    autocomplete_fields = ('created_by',)
+    date_hierarchy = 'created_at'
+
+
+@admin.register(InquiryFollowup)
+class InquiryFollowupAdmin(LargeTableAdmin):
+    list_display = ('inquiry', 'date', 'status', 'created_by')
+    list_filter = ('status',)
+    list_select_related = ('inquiry', 'created_by')
+    search_fields = ('inquiry__name', 'inquiry__mobile', 'remark')
+    autocomplete_fields = ('inquiry', 'created_by')
 
 
 @admin.register(Batch)
 class BatchAdmin(admin.ModelAdmin):
     list_display = ('batch_name', 'course', 'trainer', 'start_date')
     list_filter = ('course', 'trainer')
+    list_select_related = ('trainer',)
     search_fields = ('batch_name',)
+    autocomplete_fields = ('trainer',)
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
-    list_display = ('get_name', 'mobile', 'course', 'batch', 'status')
+class StudentAdmin(LargeTableAdmin):
+    list_display = ('get_name', 'mobile', 'course', 'batch', 'status', 'amount_paid', 'balance_due')
     list_filter = ('status', 'course', 'batch')
+    list_select_related = ('inquiry', 'batch')
     search_fields = ('mobile', 'inquiry__name')
-    
+    readonly_fields = ('amount_paid', 'balance_due', 'last_payment_at', 'payment_count')
+    autocomplete_fields = ('inquiry', 'batch')
+    date_hierarchy = 'enrollment_date'
+
     def get_name(self, obj):
         return obj.inquiry.name
     get_name.short_description = 'Name'
 
 
 @admin.register(Fee)
-class FeeAdmin(admin.ModelAdmin):
+class FeeAdmin(LargeTableAdmin):
     list_display = ('get_student_name', 'amount', 'mode', 'date_collected')
     list_filter = ('mode', 'date_collected')
+    list_select_related = ('student__inquiry',)
     search_fields = ('student__inquiry__name', 'student__mobile')
-    
+    autocomplete_fields = ('student', 'collected_by')
+    date_hierarchy = 'date_collected'
+
     def get_student_name(self, obj):
         return obj.student.inquiry.name
     get_student_name.short_description = 'Student'
 
 
 @admin.register(Attendance)
-class AttendanceAdmin(admin.ModelAdmin):
+class AttendanceAdmin(LargeTableAdmin):
     list_display = ('get_student_name', 'batch', 'date', 'status')
     list_filter = ('status', 'batch', 'date')
-    
+    list_select_related = ('student__inquiry', 'batch')
+    autocomplete_fields = ('student', 'batch', 'trainer')
+    date_hierarchy = 'date'
+
     def get_student_name(self, obj):
         return obj.student.inquiry.name
     get_student_name.short_description = 'Student'
 
 
 @admin.register(PlacementOutreach)
-class PlacementOutreachAdmin(admin.ModelAdmin):
+class PlacementOutreachAdmin(LargeTableAdmin):
     list_display = ('company_name', 'contact_name', 'mode', 'officer', 'date')
     list_filter = ('mode', 'date')
+    list_select_related = ('officer',)
     search_fields = ('company_name', 'contact_name')
+    autocomplete_fields = ('officer',)
+    date_hierarchy = 'date'
@@ -0,0 +1,119 @@
+"""
+Async endpoints. DRF views are synchronous, so these run DRF's
+authentication, permission checks and rendering in sync_to_async around an
+async handler. They work under WSGI too, but only overlap I/O when served
+through ASGI (see start.sh).
+"""
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import cache as response_cache
+from .dashboard import adashboard_stats
+from .events import subscribe, unsubscribe
+from .models import Batch, Fee, Inquiry, PlacementOutreach, Student, User
+from .routers import may_be_stale, read_from_replica
+
+
+class AsyncAPIView(APIView):
+    """The synchronous half of an async endpoint: request setup, checks and rendering."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def start(self, request, *args, **kwargs):
+        """Authenticate and check permissions; return the DRF request and an error response, if any."""
+        self.args, self.kwargs = args, kwargs
+        request = self.request = self.initialize_request(request, *args, **kwargs)
+        self.headers = self.default_response_headers
+        try:
+            self.initial(request, *args, **kwargs)
+        except Exception as exc:
+            return request, self.finish(request, self.handle_exception(exc))
+        return request, None
+
+    def finish(self, request, response):
+        response = self.finalize_response(request, response, *self.args, **self.kwargs)
+        return response.render()
+
+
+async def dashboard_stats(request):
+    """Same payload as /api/dashboard/stats/, with the independent queries run concurrently."""
+    view = AsyncAPIView()
+    request, error = await sync_to_async(view.start)(request)
+    if error is not None:
+        return error
+    await sync_to_async(read_from_replica)(request)
+
+    models = (User, Batch, Inquiry, Student, Fee, PlacementOutreach)
+    key = await sync_to_async(response_cache.response_key)('dashboard-stats-async', request, models, daily=True)
+    data = await cache.aget(key)
+    if data is not None:
+        response_cache.record('dashboard-stats-async', 'hit')
+        return await sync_to_async(view.finish)(request, Response(data, headers={'X-Cache': 'HIT'}))
+
+    response_cache.record('dashboard-stats-async', 'miss')
+    data = await adashboard_stats()
+    if not await sync_to_async(may_be_stale)(models):
+        await cache.aset(key, data, settings.API_CACHE_TIMEOUT)
+    return await sync_to_async(view.finish)(request, Response(data, headers={'X-Cache': 'MISS'}))
+
+
+async def event_stream(user, deadline):
+    # Subscribed here, on the loop that sends the response, not the one the view ran on
+    subscriber = subscribe(user)
+    try:
+        yield 'retry: 5000\n\n'
+        while not subscriber.overflowed:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(
+                    subscriber.queue.get(), min(remaining, settings.EVENTS_HEARTBEAT_SECONDS)
+                )
+            except asyncio.TimeoutError:
+                # Keeps proxies from timing the stream out, and notices clients that left
+                yield ': keepalive\n\n'
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event['data'], separators=(',', ':'))}\n\n"
+        yield 'event: overflow\ndata: {}\n\n'
+    finally:
+        unsubscribe(subscriber)
+
+
+async def events(request):
+    """
+    Server-sent events from api.events, filtered by the caller's role. Send the
+    token in the Authorization header (fetch(), not EventSource, which cannot
+    set headers). The stream ends when the token expires, so the client
+    reconnects with a fresh one; after an ``overflow`` event it should refetch.
+    """
+    view = AsyncAPIView()
+    drf_request, error = await sync_to_async(view.start)(request)
+    if error is not None:
+        return error
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI every open stream would hold a worker for as long as it stays open
+        return await sync_to_async(view.finish)(drf_request, Response(
+            {'detail': 'Live events are only served by the ASGI server (SERVER_MODE=asgi).'},
+            status=status.HTTP_501_NOT_IMPLEMENTED,
+        ))
+
+    token = drf_request.auth
+    if token is not None:
+        deadline = token['exp']
+    else:
+        deadline = time.time() + settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+    response = StreamingHttpResponse(event_stream(drf_request.user, deadline), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
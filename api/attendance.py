@@ -0,0 +1,71 @@
+from django.db.models import CharField, Q
+from django.db.models.functions import Cast
+
+from .models import Attendance, Student
+
+COUNTERS = ('present', 'absent', 'online', 'offline', 'unmarked')
+STATUS_COUNTERS = {
+    'PRESENT_ONLINE': ('present', 'online'),
+    'PRESENT_OFFLINE': ('present', 'offline'),
+    'ABSENT': ('absent',),
+}
+
+
+def summarize(counts, expected):
+    """Counters as percentages of the ``expected`` cells; unmarked cells are neither present nor absent."""
+    counts['unmarked'] = expected - counts['present'] - counts['absent']
+    summary = {'sessions': expected, **counts}
+    for name in ('present', 'absent', 'online', 'offline'):
+        summary[f'{name}_pct'] = round(100 * counts[name] / expected, 1) if expected else None
+    return summary
+
+
+def build_attendance_matrix(batch, date_from=None, date_to=None):
+    """
+    Student x date status matrix for ``batch`` with per-student and per-date
+    summaries, pivoted from one values_list() fetch of the batch's attendance.
+    Students who left the batch but have records in the range keep their row.
+    """
+    records = Attendance.objects.filter(batch=batch)
+    if date_from:
+        records = records.filter(date__gte=date_from)
+    if date_to:
+        records = records.filter(date__lte=date_to)
+    # Dates come back as ISO text: parsing ~18k date cells in Python costs more than the query.
+    records = list(
+        records.order_by().annotate(day=Cast('date', CharField())).values_list('student_id', 'day', 'status')
+    )
+
+    dates = sorted({day for _, day, _ in records})
+    students = list(
+        Student.objects.filter(Q(batch=batch) | Q(id__in={student_id for student_id, _, _ in records}))
+        .order_by('inquiry__name', 'id')
+        .values_list('id', 'inquiry__name')
+    )
+    column = {day: index for index, day in enumerate(dates)}
+    row = {student_id: index for index, (student_id, _) in enumerate(students)}
+
+    matrix = [[None] * len(dates) for _ in students]
+    student_counts = [dict.fromkeys(COUNTERS, 0) for _ in students]
+    date_counts = [dict.fromkeys(COUNTERS, 0) for _ in dates]
+    for student_id, day, status in records:
+        i, j = row[student_id], column[day]
+        matrix[i][j] = status
+        for counter in STATUS_COUNTERS.get(status, ()):
+            student_counts[i][counter] += 1
+            date_counts[j][counter] += 1
+
+    return {
+        'batch': batch.id,
+        'from': date_from,
+        'to': date_to,
+        'dates': dates,
+        'students': [
+            {'id': student_id, 'name': name, 'statuses': matrix[i], **summarize(student_counts[i], len(dates))}
+            for i, (student_id, name) in enumerate(students)
+        ],
+        'per_date': [
+            {'date': day, **summarize(date_counts[j], len(students))}
+            for j, day in enumerate(dates)
+        ],
+    }
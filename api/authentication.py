@@ -0,0 +1,104 @@
+"""
+Stateless JWT authentication. Access tokens carry the claims the permission
+classes and queryset scoping need (role, username, is_superuser), so requests
+are authenticated from the token alone instead of loading the User row.
+
+Tokens are revoked by bumping ``User.token_version``: every token carries the
+version it was issued under, and the current version is read from the cache.
+Changing a user's role, superuser flag, active flag, username or password
+bumps it (see api.signals), which forces a fresh login with new claims.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+VERSION_CLAIM = 'ver'
+ROLE_CLAIMS = ('role', 'username', 'is_superuser')
+# Fields whose change invalidates the claims in already issued tokens
+REVOKING_FIELDS = ('role', 'username', 'is_superuser', 'is_active', 'password')
+
+TOKEN_VERSION_KEY = 'auth:token_version:{}'
+# Per-process caches (LocMem) may serve a stale version for up to this long
+TOKEN_VERSION_TIMEOUT = 300
+
+
+def get_token_version(user_id):
+    from .models import User
+
+    key = TOKEN_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(pk=user_id).values_list('token_version', flat=True).first()
+        if version is None:
+            return None
+        cache.set(key, version, TOKEN_VERSION_TIMEOUT)
+    return version
+
+
+def forget_token_version(user_id):
+    """Drop the cached version now, and again on commit so a racing read does not keep the old one."""
+    key = TOKEN_VERSION_KEY.format(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def revoke_tokens(user):
+    """Invalidate every access and refresh token issued to ``user`` so far."""
+    from .models import User
+
+    User.objects.filter(pk=user.pk).update(token_version=F('token_version') + 1)
+    forget_token_version(user.pk)
+
+
+def check_token_version(token):
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if token.get(VERSION_CLAIM) != get_token_version(user_id):
+        raise AuthenticationFailed(_('Token has been revoked.'), code='token_revoked')
+
+
+class RoleTokenUser(TokenUser):
+    """Lightweight request.user built from token claims; use ``user.id`` (not the object) in queries."""
+
+    @cached_property
+    def id(self):
+        # simplejwt writes the claim as a string; compare equal to model ids like a User would.
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def role(self):
+        return self.token['role']
+
+
+class RoleTokenAuthentication(JWTStatelessUserAuthentication):
+    def get_user(self, validated_token):
+        if any(claim not in validated_token for claim in ROLE_CLAIMS + (VERSION_CLAIM,)):
+            # Issued before role claims existed; the client has to log in again.
+            raise InvalidToken(_('Token is missing role claims.'))
+        check_token_version(validated_token)
+        return super().get_user(validated_token)
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[VERSION_CLAIM] = user.token_version
+        return token
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    # The new access token copies the refresh token's claims, so a revoked
+    # refresh token must not mint one.
+    def validate(self, attrs):
+        check_token_version(self.token_class(attrs['refresh']))
+        return super().validate(attrs)
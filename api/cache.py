@@ -0,0 +1,112 @@
+import functools
+import hashlib
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .metrics import CACHE_REQUESTS
+from .routers import may_be_stale, note_write
+
+VERSION_KEY = 'api:version:{}'
+RESPONSE_KEY = 'api:response:{name}:{scope}:{day}:{versions}:{path}'
+
+# Per-process hit/miss counters keyed by (endpoint, outcome)
+stats = Counter()
+
+
+def record(name, outcome):
+    stats[name, outcome] += 1
+    CACHE_REQUESTS.labels(name, outcome).inc()
+
+
+def version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def get_versions(models):
+    keys = [version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed with a timestamp so an evicted version never repeats an old one.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [str(versions[key]) for key in keys]
+
+
+def bump_version(model):
+    key = version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate(model):
+    """Bump now, and again on commit so reads racing the open transaction are not kept."""
+    bump_version(model)
+    note_write(model)
+    transaction.on_commit(lambda: bump_version(model))
+
+
+def cache_scope(request, per_user_roles):
+    user = request.user
+    scope = 'superuser' if user.is_superuser else user.role
+    if user.role in per_user_roles:
+        scope = f'{scope}:{user.pk}'
+    return scope
+
+
+def response_key(name, request, models, per_user_roles=(), daily=False):
+    return RESPONSE_KEY.format(
+        name=name,
+        scope=cache_scope(request, per_user_roles),
+        # Responses relative to "today" must not outlive the day they were built on
+        day=timezone.localdate().isoformat() if daily else '',
+        versions='.'.join(get_versions(models)),
+        path=hashlib.md5(request.get_full_path().encode()).hexdigest(),
+    )
+
+
+def cache_response(*models, per_user_roles=(), timeout=None, daily=False):
+    """
+    Cache a viewset action's response data, keyed by the current version of
+    every model it reads, the caller's role (and id for ``per_user_roles``,
+    whose querysets are scoped to themselves), the full request path and,
+    for ``daily`` actions whose data depends on today's date, the local date.
+    """
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            name = f'{self.basename}-{self.action}'
+            key = response_key(name, request, models, per_user_roles, daily)
+
+            data = cache.get(key)
+            if data is not None:
+                record(name, 'hit')
+                return Response(data, headers={'X-Cache': 'HIT'})
+
+            record(name, 'miss')
+            response = view_method(self, request, *args, **kwargs)
+            storable = 'no-store' not in response.get('Cache-Control', '')
+            if response.status_code == 200 and storable and not may_be_stale(models):
+                cache.set(key, response.data, timeout or settings.API_CACHE_TIMEOUT)
+                response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
+
+
+def get_stats():
+    endpoints = {}
+    for (name, outcome), count in stats.items():
+        endpoints.setdefault(name, {'hit': 0, 'miss': 0})[outcome] = count
+    for counts in endpoints.values():
+        total = counts['hit'] + counts['miss']
+        counts['hit_ratio'] = round(counts['hit'] / total, 4) if total else 0
+    return endpoints
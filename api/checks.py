@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Cache backends that each worker process keeps to itself
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def replica_needs_shared_cache(app_configs, **kwargs):
+    """The read-your-writes pins (api.routers) only work if every worker sees them."""
+    if settings.READ_REPLICA and settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return [Warning(
+            'READ_REPLICA is set but the default cache is local to each process, so a worker that '
+            'did not handle a write will not see its replica pin and may serve stale reads.',
+            hint='Set REDIS_URL (or CACHE_DIR on a single host) alongside DATABASE_REPLICA_URL.',
+            id='api.W001',
+        )]
+    return []
@@ -0,0 +1,94 @@
+"""
+Dashboard stats, built from independent parts so they can run one after
+another (the DRF endpoint) or side by side (the async endpoint).
+
+Django's async ORM runs every query on one shared thread, so it would not
+overlap them. The concurrent path instead runs each part on a small thread
+pool; each pool thread keeps its own database connection open across
+requests, even where CONN_MAX_AGE is 0.
+"""
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .models import DailyMetrics, Fee, Student
+from .serializers import FeeSerializer, StudentSerializer
+from .shaping import optimize_queryset
+
+executor = ThreadPoolExecutor(
+    max_workers=settings.DASHBOARD_WORKERS, thread_name_prefix='dashboard'
+)
+
+
+def daily_totals():
+    today = timezone.localdate()
+    is_today = Q(date=today)
+    metrics = DailyMetrics.objects.aggregate(
+        total_inquiries=Sum('inquiries'),
+        total_students=Sum('admissions'),
+        total_fees_collected=Sum('fees_total'),
+        placements=Sum('outreach'),
+        fees_today=Sum('fees_total', filter=is_today),
+        inquiries_today=Sum('inquiries', filter=is_today),
+        admissions_today=Sum('admissions', filter=is_today),
+        placements_today=Sum('outreach', filter=is_today),
+    )
+    return {key: value or 0 for key, value in metrics.items()}
+
+
+def recent_admissions():
+    queryset = optimize_queryset(Student.objects.order_by('-enrollment_date'), StudentSerializer())[:5]
+    return {'recent_admissions': StudentSerializer(queryset, many=True).data}
+
+
+def recent_fees():
+    queryset = optimize_queryset(Fee.objects.order_by('-date_collected'), FeeSerializer())[:5]
+    return {'recent_fees': FeeSerializer(queryset, many=True).data}
+
+
+STATS_PARTS = (daily_totals, recent_admissions, recent_fees)
+
+
+def dashboard_stats():
+    data = {}
+    for part in STATS_PARTS:
+        data.update(part())
+    return data
+
+
+def release_unusable_connections():
+    # CONN_MAX_AGE=0 (the ASGI setting) would make close_old_connections()
+    # reconnect for every part. There are only DASHBOARD_WORKERS pool threads,
+    # so their connections are kept; only one a failed query broke is closed.
+    for conn in connections.all(initialized_only=True):
+        if conn.connection is None:
+            continue
+        if conn.errors_occurred and not conn.is_usable():
+            conn.close()
+        else:
+            conn.errors_occurred = False
+            conn.health_check_done = False  # CONN_HEALTH_CHECKS re-checks before the next part
+
+
+def run_in_pool(part):
+    try:
+        return part()
+    finally:
+        release_unusable_connections()
+
+
+async def adashboard_stats():
+    loop = asyncio.get_running_loop()
+    # Each part runs in a copy of this context, so it reads from the database the request was routed to.
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, contextvars.copy_context().run, run_in_pool, part) for part in STATS_PARTS
+    ))
+    data = {}
+    for result in results:
+        data.update(result)
+    return data
@@ -0,0 +1,155 @@
+"""
+Live change events for dashboards, streamed to browsers as server-sent events
+by /api/events/ (api.async_views.events) so open tabs can update their
+counters instead of re-requesting /api/dashboard/stats/.
+
+Events are published from model signals and delivered after their
+transaction commits. On PostgreSQL they go through ``pg_notify``, so every
+worker process hears every write; each process runs one LISTEN connection and
+fans notifications out to its own subscribers. Elsewhere (SQLite in
+development) delivery is in-process, which only reaches subscribers in the
+worker that made the write.
+
+Each event names the roles (and user ids) that may see it; subscribers only
+receive the ones their token allows.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+
+from .models import User
+
+logger = logging.getLogger('api.events')
+
+CHANNEL = 'api_events'
+# Events a slow subscriber may fall behind by before its stream is closed
+QUEUE_SIZE = 200
+# NOTIFY payloads are limited to 8000 bytes
+MAX_PAYLOAD = 7900
+
+EVERYONE = None
+# Roles whose dashboards show every fee, admission, inquiry and attendance mark
+DASHBOARD_ROLES = (User.Role.MANAGER, User.Role.HR_ADMIN)
+
+subscribers = set()
+subscribers_lock = threading.Lock()
+listener = None
+
+
+def uses_notify():
+    return connections['default'].vendor == 'postgresql'
+
+
+def publish(event_type, data, roles=EVERYONE, users=()):
+    """Send ``data`` to subscribers whose role is in ``roles`` or whose id is in ``users``, on commit."""
+    payload = json.dumps({
+        'type': event_type,
+        'data': data,
+        'roles': None if roles is EVERYONE else list(roles),
+        'users': [user_id for user_id in users if user_id is not None],
+    }, cls=DjangoJSONEncoder, separators=(',', ':'))
+    if len(payload) > MAX_PAYLOAD:
+        logger.warning('Dropped %s event of %d bytes', event_type, len(payload))
+        return
+    if uses_notify():
+        # Queued by PostgreSQL and only sent if the transaction commits
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, payload])
+    else:
+        transaction.on_commit(lambda: deliver(payload))
+
+
+def attendance_marked(batch, day, statuses, trainer_id=None):
+    """Publish the status counts of attendance marked for ``batch`` on ``day``."""
+    counts = {}
+    for value in statuses:
+        counts[value] = counts.get(value, 0) + 1
+    publish('attendance.marked', {'batch': batch.pk, 'date': day, 'counts': counts},
+            roles=DASHBOARD_ROLES, users=(batch.trainer_id, trainer_id))
+
+
+def deliver(payload):
+    """Hand a published event to every subscriber in this process; callable from any thread."""
+    event = json.loads(payload)
+    with subscribers_lock:
+        targets = list(subscribers)
+    for subscriber in targets:
+        try:
+            subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+        except RuntimeError:
+            pass  # its loop closed while the worker shut down
+
+
+class Subscriber:
+    """One open stream: a bounded queue on the event loop serving it."""
+
+    def __init__(self, user):
+        self.role = user.role
+        self.user_id = user.id
+        self.is_superuser = user.is_superuser
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.overflowed = False
+
+    def may_see(self, event):
+        return (
+            self.is_superuser or event['roles'] is None or self.role in event['roles']
+            or self.user_id in event['users']
+        )
+
+    def offer(self, event):
+        if self.overflowed or not self.may_see(event):
+            return
+        try:
+            self.queue.put_nowait({'type': event['type'], 'data': event['data']})
+        except asyncio.QueueFull:
+            # Better to end the stream (the client reconnects and refetches) than skip events silently
+            self.overflowed = True
+
+
+def subscribe(user):
+    subscriber = Subscriber(user)
+    with subscribers_lock:
+        subscribers.add(subscriber)
+    if uses_notify():
+        start_listener()
+    return subscriber
+
+
+def unsubscribe(subscriber):
+    with subscribers_lock:
+        subscribers.discard(subscriber)
+
+
+def start_listener():
+    global listener
+    with subscribers_lock:
+        if listener is None or not listener.is_alive():
+            listener = threading.Thread(target=listen, name='api-events-listener', daemon=True)
+            listener.start()
+
+
+def listen():
+    """LISTEN on the primary for the life of the process, reconnecting after errors."""
+    while True:
+        connection = connections['default']
+        try:
+            connection.ensure_connection()
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN {CHANNEL}')
+            raw = connection.connection  # psycopg2
+            while True:
+                select.select([raw], [], [], 60)
+                raw.poll()
+                while raw.notifies:
+                    deliver(raw.notifies.pop(0).payload)
+        except Exception:
+            logger.exception('Event listener lost its connection; reconnecting')
+            connection.close()
+            time.sleep(1)
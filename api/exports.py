@@ -0,0 +1,125 @@
+import csv
+import datetime
+import json
+import tempfile
+from decimal import Decimal
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class Echo:
+    """File-like object whose write() hands the value back, for csv.writer."""
+    def write(self, value):
+        return value
+
+
+def plain_value(value):
+    if isinstance(value, datetime.datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def csv_stream(headers, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    lines = []
+    for row in rows:
+        lines.append(writer.writerow(['' if value is None else plain_value(value) for value in row]))
+        if len(lines) == CHUNK_SIZE:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def ndjson_stream(headers, rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + '\n')
+        if len(lines) == CHUNK_SIZE:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def xlsx_stream(headers, rows):
+    # A write-only workbook spools rows to disk, so memory stays flat; the zip
+    # container can only be finished at the end, then it is streamed from disk.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([
+            timezone.make_naive(value) if isinstance(value, datetime.datetime) and timezone.is_aware(value) else value
+            for value in row
+        ])
+    with tempfile.TemporaryFile() as spool:
+        workbook.save(spool)
+        spool.seek(0)
+        while chunk := spool.read(64 * 1024):
+            yield chunk
+
+
+FORMATS = {
+    'csv': (csv_stream, 'text/csv'),
+    'ndjson': (ndjson_stream, 'application/x-ndjson'),
+    'xlsx': (xlsx_stream, XLSX_CONTENT_TYPE),
+}
+
+
+def export_response(queryset, columns, ordering, export_format, filename):
+    if export_format not in FORMATS:
+        raise ValidationError({'as': f'Choose one of: {", ".join(FORMATS)}.'})
+    if export_format == 'xlsx' and Workbook is None:
+        raise ValidationError({'as': 'XLSX export requires openpyxl to be installed.'})
+
+    headers = [header for header, _ in columns]
+    rows = (
+        queryset.prefetch_related(None)
+        .order_by(*ordering)
+        .values_list(*[lookup for _, lookup in columns])
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    stream, content_type = FORMATS[export_format]
+    response = StreamingHttpResponse(stream(headers, rows), content_type=content_type)
+    stamp = timezone.localdate().strftime('%Y%m%d')
+    response['Content-Disposition'] = f'attachment; filename="{filename}-{stamp}.{export_format}"'
+    return response
+
+
+class ExportMixin:
+    """
+    Adds ``GET <list>/export/?as=csv|ndjson|xlsx``, streaming the same rows as
+    the list endpoint (role scoping and query filters included) in the
+    pagination ordering. ``?format=`` is taken by DRF's renderer negotiation.
+    """
+    export_columns = ()
+    export_filename = 'export'
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(
+            queryset,
+            self.export_columns,
+            self.pagination_class.ordering,
+            request.query_params.get('as', 'csv').lower(),
+            self.export_filename,
+        )
@@ -0,0 +1,76 @@
+from decimal import Decimal
+
+from django.db.models import Count, F, Max, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+LEDGER_FIELDS = ('amount_paid', 'balance_due', 'last_payment_at', 'payment_count')
+
+
+def apply_payment(student_id, amount, count):
+    """
+    Move one student's ledger by ``amount`` over ``count`` payments in a single
+    UPDATE, so concurrent fee writes cannot lose each other's totals.
+    """
+    from .models import Fee, Student
+
+    amount = Decimal(amount)
+    last_payment = Fee.objects.filter(student=OuterRef('pk')).order_by().values('student').annotate(
+        last=Max('date_collected')
+    ).values('last')
+    Student.objects.filter(pk=student_id).update(
+        amount_paid=F('amount_paid') + amount,
+        balance_due=F('balance_due') - amount,
+        payment_count=F('payment_count') + count,
+        last_payment_at=Subquery(last_payment),
+        updated_at=timezone.now(),
+    )
+
+
+def compute_ledger(Student, Fee, student_ids=None):
+    """
+    Ledger values for every student (or just ``student_ids``) from the Fee
+    table, with one grouped query.
+    """
+    fees = Fee.objects.all()
+    students = Student.objects.all()
+    if student_ids is not None:
+        fees = fees.filter(student_id__in=student_ids)
+        students = students.filter(id__in=student_ids)
+    paid = {
+        row['student']: row
+        for row in fees.values('student').annotate(
+            total=Sum('amount'), count=Count('id'), last=Max('date_collected')
+        )
+    }
+    ledger = {}
+    for student_id, total_fees in students.values_list('id', 'total_fees').iterator():
+        row = paid.get(student_id, {})
+        amount_paid = row.get('total') or Decimal('0')
+        ledger[student_id] = {
+            'amount_paid': amount_paid,
+            'balance_due': total_fees - amount_paid,
+            'last_payment_at': row.get('last'),
+            'payment_count': row.get('count', 0),
+        }
+    return ledger
+
+
+def find_drift(Student, Fee):
+    """Yield (student_id, field, stored, expected) for every ledger value that disagrees with Fee rows."""
+    expected = compute_ledger(Student, Fee)
+    stored = Student.objects.values_list('id', *LEDGER_FIELDS).iterator()
+    for student_id, *values in stored:
+        for field, value in zip(LEDGER_FIELDS, values):
+            if value != expected[student_id][field]:
+                yield student_id, field, value, expected[student_id][field]
+
+
+def rebuild_ledger(Student, Fee, student_ids=None):
+    """Rewrite the ledger of every student (or just ``student_ids``) from Fee rows."""
+    now = timezone.now()
+    students = [
+        Student(id=student_id, updated_at=now, **values)
+        for student_id, values in compute_ledger(Student, Fee, student_ids).items()
+    ]
+    Student.objects.bulk_update(students, LEDGER_FIELDS + ('updated_at',), batch_size=1000)
+    return len(students)
@@ -0,0 +1,174 @@
+import datetime
+import random
+
+from api.models import Attendance, Batch, Fee, Inquiry, InquiryFollowup, PlacementOutreach, Student, User
+from api.weekdays import format_days, parse_days
+
+FIRST_NAMES = ['Rahul', 'Priya', 'Amit', 'Sneha', 'Vikram', 'Anjali', 'Rohan', 'Pooja', 'Karan', 'Neha', 'Arjun', 'Kavya']
+LAST_NAMES = ['Sharma', 'Patil', 'Deshmukh', 'Kulkarni', 'Joshi', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Mehta', 'Shinde']
+COLLEGES = ['COEP', 'VIT Pune', 'MIT Pune', 'PICT', 'Symbiosis', 'Fergusson College', 'DY Patil', 'Bharati Vidyapeeth']
+LEAD_STATUSES = ['HOT', 'WARM', 'WARM', 'COLD', 'ENROLLED']
+ATTENDANCE_STATUSES = ['PRESENT_OFFLINE'] * 6 + ['PRESENT_ONLINE'] * 3 + ['ABSENT']
+FEE_MODES = ['CASH', 'UPI', 'UPI', 'NEFT', 'CHEQUE']
+CLASSROOMS = ['Orange Classroom', 'Blue Classroom', 'Green Classroom', 'Meeting Room', 'Passage']
+DAY_PATTERNS = ['Mon,Wed,Fri', 'Tue,Thu,Sat', 'Mon-Fri', 'Sat,Sun', 'Mon-Sat']
+
+
+def bulk_insert(model, objects, batch_size=5000):
+    """bulk_create() an iterable in fixed-size batches without building the whole list."""
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    model.objects.bulk_create(batch)
+
+
+def synthetic_inquiry(rng, index, **fields):
+    data = {
+        'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}',
+        'mobile': f'7{index:09d}',
+        'email': f'bench{index}@example.com',
+        'college': rng.choice(COLLEGES),
+        'degree': 'B.Tech',
+        'branch': 'CS',
+        'passout_year': 2024,
+        'interested_course': 'Data Science',
+        'source': 'benchmark',
+    }
+    data.update(fields)
+    return Inquiry(**data)
+
+
+def synthetic_schedule(rng, classrooms=CLASSROOMS):
+    """Batch schedule fields: a one or two hour slot between 08:00 and 21:30."""
+    hour, minute = rng.randrange(8, 20), rng.choice([0, 30])
+    days = rng.choice(DAY_PATTERNS)
+    return {
+        'classroom_name': rng.choice(classrooms),
+        'start_time': datetime.time(hour, minute),
+        'end_time': datetime.time(hour + rng.choice([1, 2]), minute),
+        # bulk_create() skips Batch.save(), which normally derives both
+        'days_mask': parse_days(days),
+        'days_of_week': format_days(parse_days(days)),
+    }
+
+
+def seed_inquiries(count, seed=42, batch_size=5000, offset=0, **fields):
+    """Bulk insert ``count`` synthetic inquiries (no signals) for benchmarks."""
+    rng = random.Random(seed)
+    bulk_insert(
+        Inquiry, (synthetic_inquiry(rng, index, **fields) for index in range(offset, offset + count)), batch_size
+    )
+
+
+# Row counts seed_data generates at --scale 1; attendance is students x sessions.
+FULL_SCALE = {
+    'inquiries': 200_000, 'students': 50_000, 'batches': 500, 'fees': 500_000, 'followups': 300_000, 'sessions': 100,
+}
+
+
+def scaled(scale):
+    """FULL_SCALE with every count but sessions multiplied by ``scale`` (at least 1)."""
+    return {
+        name: count if name == 'sessions' else max(1, round(count * scale)) for name, count in FULL_SCALE.items()
+    }
+
+
+def seed_dataset(inquiries=100_000, students=10_000, batches=100, sessions=30, seed=42, fees=None, followups=None):
+    """
+    Bulk insert a whole synthetic institute (no signals, so rollups and
+    ledgers are not maintained): staff, leads with follow-ups, students spread
+    over batches, fees, attendance and outreach. ``fees`` and ``followups``
+    are totals spread at random; by default each student pays 1-3 times and
+    each lead has 0-2 follow-ups. Staff accounts are shared between runs.
+    Returns the staff users by role so callers can query as each of them.
+    """
+    rng = random.Random(seed)
+    start = datetime.date(2024, 1, 1)
+    last_inquiry = Inquiry.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    staff = {role: [] for role in User.Role.values}
+    users = [
+        User(username=f'bench-{role.lower()}-{index}', role=role)
+        for role, count in [
+            (User.Role.COUNSELOR, 10), (User.Role.TRAINER, max(1, batches // 4)),
+            (User.Role.PLACEMENT_OFFICER, 3), (User.Role.MANAGER, 1), (User.Role.HR_ADMIN, 1),
+        ]
+        for index in range(count)
+    ]
+    for user in users:
+        user.set_unusable_password()
+    User.objects.bulk_create(users, ignore_conflicts=True)
+    for user in User.objects.filter(username__in=[user.username for user in users]).order_by('id'):
+        staff[user.role].append(user)
+
+    bulk_insert(Inquiry, (
+        synthetic_inquiry(
+            rng, last_inquiry + index,
+            created_by=rng.choice(staff[User.Role.COUNSELOR]),
+            lead_status=rng.choice(LEAD_STATUSES),
+            next_followup_date=start + datetime.timedelta(days=rng.randrange(365)),
+        )
+        for index in range(inquiries)
+    ))
+    inquiry_ids = list(Inquiry.objects.filter(id__gt=last_inquiry).order_by('id').values_list('id', flat=True))
+
+    if followups is None:
+        followup_inquiries = (inquiry_id for inquiry_id in inquiry_ids for _ in range(rng.randrange(3)))
+    else:
+        followup_inquiries = (rng.choice(inquiry_ids) for _ in range(followups))
+    bulk_insert(InquiryFollowup, (
+        InquiryFollowup(
+            inquiry_id=inquiry_id, date=start + datetime.timedelta(days=rng.randrange(365)),
+            status=rng.choice(LEAD_STATUSES), remark='Called',
+        )
+        for inquiry_id in followup_inquiries
+    ))
+
+    batch_objects = Batch.objects.bulk_create([
+        Batch(
+            batch_name=f'Bench {index}', course='Data Science', start_date=start,
+            trainer=staff[User.Role.TRAINER][index % len(staff[User.Role.TRAINER])], **synthetic_schedule(rng),
+        )
+        for index in range(batches)
+    ])
+    bulk_insert(Student, (
+        Student(
+            inquiry_id=inquiry_id, mobile=f'7{last_inquiry + index:09d}', email=f'bench{last_inquiry + index}@example.com',
+            course='Data Science', total_fees=30000, batch=rng.choice(batch_objects),
+            status=rng.choice(['ACTIVE'] * 7 + ['COMPLETED', 'DROPPED']),
+            enrollment_date=start + datetime.timedelta(days=rng.randrange(365)),
+        )
+        for index, inquiry_id in enumerate(inquiry_ids[:students])
+    ))
+    roster = list(Student.objects.filter(inquiry_id__in=inquiry_ids[:students]).values_list('id', 'batch_id'))
+
+    if fees is None:
+        payers = (student_id for student_id, _ in roster for _ in range(rng.randrange(1, 4)))
+    else:
+        payers = (rng.choice(roster)[0] for _ in range(fees))
+    bulk_insert(Fee, (
+        Fee(
+            student_id=student_id, amount=rng.choice([5000, 10000, 15000]), mode=rng.choice(FEE_MODES),
+            collected_by=rng.choice(staff[User.Role.COUNSELOR]),
+        )
+        for student_id in payers
+    ))
+    bulk_insert(Attendance, (
+        Attendance(
+            batch_id=batch_id, student_id=student_id, date=start + datetime.timedelta(days=day),
+            status=rng.choice(ATTENDANCE_STATUSES),
+        )
+        for student_id, batch_id in roster
+        for day in range(sessions)
+    ))
+    bulk_insert(PlacementOutreach, (
+        PlacementOutreach(
+            officer=rng.choice(staff[User.Role.PLACEMENT_OFFICER]), company_name=f'Company {index % 500}',
+            contact_name='HR', mode='CALL', phone_email=f'hr{index}@example.com',
+        )
+        for index in range(inquiries // 5)
+    ))
+    return staff
@@ -0,0 +1,98 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.attendance import build_attendance_matrix
+from api.models import Attendance, Batch, Inquiry, Student, User
+from api.views import BatchViewSet
+
+from ._synthetic import seed_inquiries
+
+STATUSES = ['PRESENT_OFFLINE'] * 6 + ['PRESENT_ONLINE'] * 3 + ['ABSENT']
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the batch attendance matrix against a per-student loop on a synthetic batch. '
+        'Seeded rows are rolled back when the benchmark finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=100)
+        parser.add_argument('--sessions', type=int, default=180)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create_user('matrix-benchmark', role=User.Role.MANAGER)
+            batch = self.seed(user, options['students'], options['sessions'], options['seed'])
+            view = BatchViewSet.as_view({'get': 'attendance_matrix'})
+
+            self.stdout.write(
+                f'{options["students"]} students x {options["sessions"]} sessions, '
+                f'{options["repeat"]} runs, median ms\n'
+            )
+            self.stdout.write(f'{"path":<22}{"ms":>10}{"queries":>10}')
+            self.report('per-student loop', options['repeat'], lambda: self.per_student(batch))
+            self.report('matrix (function)', options['repeat'], lambda: build_attendance_matrix(batch))
+            self.report('matrix (endpoint)', options['repeat'], lambda: self.endpoint(view, user, batch))
+            transaction.set_rollback(True)
+
+    def seed(self, user, students, sessions, seed):
+        rng = random.Random(seed)
+        batch = Batch.objects.create(
+            batch_name='Matrix benchmark', course='Data Science', trainer=user, start_date=datetime.date(2024, 1, 1)
+        )
+        last_id = Inquiry.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        seed_inquiries(students, seed=seed, offset=last_id)
+        Student.objects.bulk_create([
+            Student(inquiry=inquiry, mobile=inquiry.mobile, email=inquiry.email, course='Data Science', batch=batch)
+            for inquiry in Inquiry.objects.filter(id__gt=last_id)
+        ])
+        start = datetime.date(2024, 1, 1)
+        Attendance.objects.bulk_create(
+            [
+                Attendance(
+                    batch=batch, student_id=student_id, trainer=user,
+                    date=start + datetime.timedelta(days=day), status=rng.choice(STATUSES),
+                )
+                for student_id in batch.students.values_list('id', flat=True)
+                for day in range(sessions)
+                if rng.random() > 0.05
+            ],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        return batch
+
+    def per_student(self, batch):
+        # What a client had to do before: one attendance fetch per student on the roster.
+        result = {}
+        for student in batch.students.select_related('inquiry'):
+            rows = list(Attendance.objects.filter(batch=batch, student=student).values_list('date', 'status'))
+            present = sum(1 for _, status in rows if status != 'ABSENT')
+            result[student.id] = (student.inquiry.name, dict(rows), present / len(rows) if rows else None)
+        return result
+
+    def endpoint(self, view, user, batch):
+        request = APIRequestFactory().get(f'/api/batches/{batch.id}/attendance_matrix/')
+        force_authenticate(request, user)
+        response = view(request, pk=batch.id)
+        return response.render()
+
+    def report(self, label, repeat, run):
+        samples = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                run()
+                samples.append((time.perf_counter() - start) * 1000)
+        self.stdout.write(f'{label:<22}{statistics.median(samples):>10.2f}{len(ctx.captured_queries):>10}')
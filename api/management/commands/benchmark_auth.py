@@ -0,0 +1,60 @@
+import statistics
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from api.authentication import RoleTokenAuthentication
+from api.models import Batch, User
+
+from ._synthetic import seed_inquiries
+
+ENDPOINTS = ['/api/batches/{batch}/', '/api/inquiries/?page_size=10', '/api/students/?fields=id', '/api/dashboard/stats/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare queries and latency per request for database-backed JWT authentication and the '
+        'stateless role-claim authentication. Seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create_user('auth-benchmark', password='pass', role=User.Role.MANAGER)
+            batch = Batch.objects.create(batch_name='Auth benchmark', course='Data Science', start_date='2024-01-01')
+            seed_inquiries(100, created_by=user)
+            client = APIClient(SERVER_NAME='localhost')
+            access = client.post('/api/auth/token/', {'username': user.username, 'password': 'pass'}).data['access']
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+            self.stdout.write(f'{options["repeat"]} requests per endpoint, response cache hits included\n')
+            self.stdout.write(f'{"endpoint":<34}{"auth":<12}{"queries":>9}{"median ms":>11}')
+            for endpoint in ENDPOINTS:
+                url = endpoint.format(batch=batch.id)
+                for label, authentication in (('database', JWTAuthentication), ('stateless', RoleTokenAuthentication)):
+                    with mock.patch.object(APIView, 'authentication_classes', [authentication]):
+                        queries, elapsed = self.measure(client, url, options['repeat'])
+                    self.stdout.write(f'{url:<34}{label:<12}{queries:>9}{elapsed:>11.2f}')
+            transaction.set_rollback(True)
+
+    def measure(self, client, url, repeat):
+        cache.clear()
+        client.get(url)  # warm the response and token version caches
+        samples = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                response = client.get(url)
+                samples.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200, response.status_code
+        queries = sum(1 for query in ctx.captured_queries if query['sql'].startswith('SELECT'))
+        return queries, statistics.median(samples)
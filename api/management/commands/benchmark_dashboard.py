@@ -0,0 +1,86 @@
+import asyncio
+import statistics
+import time
+
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from api.dashboard import STATS_PARTS, adashboard_stats, dashboard_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the serial dashboard stats (DRF endpoint) with the concurrent async version. '
+        'Each run is wrapped in request_started/request_finished, so connection setup is timed '
+        'the way a server pays for it under the given CONN_MAX_AGE. Reads the configured database '
+        'as is; pool threads open their own connections, so seed data first (e.g. with the other '
+        'benchmark commands or real data) rather than in a transaction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument(
+            '--conn-max-age', type=int, default=None,
+            help='Override CONN_MAX_AGE for every database; 0 is what SERVER_MODE=asgi uses.',
+        )
+        parser.add_argument(
+            '--latency-ms', type=float, default=0,
+            help='Also sleep this long before every query, to stand in for a database across a network.',
+        )
+
+    def handle(self, *args, **options):
+        latency = options['latency_ms'] / 1000
+        if options['conn_max_age'] is not None:
+            for alias in connections:
+                connections[alias].close()
+                connections.settings[alias]['CONN_MAX_AGE'] = options['conn_max_age']
+
+        def delay(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        opened = []
+
+        def on_connect(sender, connection, **kwargs):
+            opened.append(connection.alias)
+            if latency and delay not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay)
+
+        def request(run):
+            request_started.send(sender=BaseHandler)
+            try:
+                run()
+            finally:
+                request_finished.send(sender=BaseHandler)
+
+        connection_created.connect(on_connect)
+        if latency:
+            for connection in connections.all(initialized_only=True):
+                connection.execute_wrappers.append(delay)
+
+        self.stdout.write(
+            f'{len(STATS_PARTS)} parts, {options["repeat"]} runs, '
+            f'CONN_MAX_AGE {connections["default"].settings_dict["CONN_MAX_AGE"]}, '
+            f'{options["latency_ms"]:g} ms simulated latency per query\n'
+        )
+        self.stdout.write(f'{"mode":<12}{"median ms":>11}{"p95 ms":>10}{"connects/run":>14}')
+        try:
+            for label, run in (('serial', dashboard_stats), ('concurrent', lambda: asyncio.run(adashboard_stats()))):
+                request(run)  # warm up pool threads
+                opened.clear()
+                samples = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    request(run)
+                    samples.append((time.perf_counter() - start) * 1000)
+                samples.sort()
+                p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) > 1 else samples[0]
+                self.stdout.write(
+                    f'{label:<12}{statistics.median(samples):>11.2f}{p95:>10.2f}'
+                    f'{len(opened) / options["repeat"]:>14.2f}'
+                )
+        finally:
+            connection_created.disconnect(on_connect)
@@ -0,0 +1,61 @@
+import resource
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import User
+from api.views import InquiryViewSet
+
+from ._synthetic import seed_inquiries
+
+
+class Command(BaseCommand):
+    help = (
+        'Stream the inquiry export at several table sizes and report rows/sec and peak memory. '
+        'Seeded rows are rolled back when the benchmark finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 100_000])
+        parser.add_argument('--formats', nargs='+', default=['csv', 'ndjson', 'xlsx'])
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create_user('export-benchmark', role=User.Role.MANAGER)
+            view = InquiryViewSet.as_view({'get': 'export'})
+            seeded = 0
+
+            self.stdout.write(f'{"rows":>10}{"format":>8}{"seconds":>10}{"rows/sec":>12}{"py peak MB":>12}{"RSS MB":>10}')
+            for rows in sorted(options['rows']):
+                seed_inquiries(rows - seeded, seed=seeded, offset=seeded)
+                seeded = rows
+                for export_format in options['formats']:
+                    self.run(view, user, rows, export_format)
+            transaction.set_rollback(True)
+
+    def run(self, view, user, rows, export_format):
+        start = time.perf_counter()
+        size = self.consume(view, user, export_format)
+        elapsed = time.perf_counter() - start
+
+        # tracemalloc slows Python down several times over, so memory gets its own pass.
+        tracemalloc.start()
+        self.consume(view, user, export_format)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # ru_maxrss is KiB on Linux; it is a process-wide high-water mark.
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(
+            f'{rows:>10}{export_format:>8}{elapsed:>10.2f}{rows / elapsed:>12.0f}'
+            f'{peak / 2**20:>12.1f}{rss:>10.0f}  ({size / 2**20:.1f} MB body)'
+        )
+
+    def consume(self, view, user, export_format):
+        request = APIRequestFactory().get('/api/inquiries/export/', {'as': export_format})
+        force_authenticate(request, user)
+        response = view(request)
+        return sum(len(chunk) for chunk in response.streaming_content)
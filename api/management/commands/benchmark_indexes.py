@@ -0,0 +1,119 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.models import Attendance, Batch, Fee, Inquiry, InquiryFollowup, PlacementOutreach, Student, User
+from api.views import AttendanceViewSet, FeeViewSet, InquiryViewSet, PlacementOutreachViewSet, StudentViewSet
+
+from ._synthetic import seed_dataset
+
+INDEXED_MODELS = [Inquiry, InquiryFollowup, Student, Fee, Attendance, PlacementOutreach]
+# Single-column foreign key indexes the composite indexes replaced
+FOREIGN_KEY_INDEXES = [(Inquiry, 'created_by'), (InquiryFollowup, 'inquiry'), (Student, 'batch')]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large dataset, then print EXPLAIN plans and timings for the hot ViewSet filters '
+        'with the pre-0013 indexes and with the current ones. Seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inquiries', type=int, default=100_000)
+        parser.add_argument('--students', type=int, default=10_000)
+        parser.add_argument('--batches', type=int, default=100)
+        parser.add_argument('--sessions', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--no-plans', action='store_true', help='Only print the timing table.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write('Seeding...')
+            staff = seed_dataset(
+                options['inquiries'], options['students'], options['batches'], options['sessions'], options['seed']
+            )
+            cases = self.cases(staff)
+
+            self.swap_indexes(current=False)
+            before = {label: self.measure(build, options['repeat']) for label, build in cases}
+            self.swap_indexes(current=True)
+            after = {label: self.measure(build, options['repeat']) for label, build in cases}
+
+            self.stdout.write(f'\n{connection.vendor}, {options["repeat"]} runs per query, median ms\n')
+            self.stdout.write(f'{"query":<30}{"before":>10}{"after":>10}{"speedup":>10}')
+            for label, _ in cases:
+                speedup = before[label][0] / after[label][0] if after[label][0] else float('inf')
+                self.stdout.write(f'{label:<30}{before[label][0]:>10.2f}{after[label][0]:>10.2f}{speedup:>9.1f}x')
+
+            if not options['no_plans']:
+                for label, _ in cases:
+                    self.stdout.write(f'\n== {label}')
+                    for phase, results in (('before', before), ('after', after)):
+                        self.stdout.write(f'-- {phase}')
+                        for line in results[label][1].splitlines():
+                            self.stdout.write(f'   {line}')
+            transaction.set_rollback(True)
+
+    def cases(self, staff):
+        manager = staff[User.Role.MANAGER][0]
+        counselor = staff[User.Role.COUNSELOR][0]
+        trainer = staff[User.Role.TRAINER][0]
+        officer = staff[User.Role.PLACEMENT_OFFICER][0]
+        batch = Batch.objects.filter(trainer=trainer).first()
+        inquiry_ids = list(Inquiry.objects.order_by('-created_at', '-id').values_list('id', flat=True)[:50])
+        return [
+            ('inquiries (counselor)', lambda: self.list_queryset(InquiryViewSet, counselor)),
+            ('inquiries (manager)', lambda: self.list_queryset(InquiryViewSet, manager)),
+            ('inquiries ?followup_due=', lambda: self.list_queryset(
+                InquiryViewSet, manager, followup_due='2024-01-03'
+            )),
+            ('followups prefetch', lambda: InquiryFollowup.objects.filter(inquiry_id__in=inquiry_ids)),
+            ('students ?batch=', lambda: self.list_queryset(StudentViewSet, manager, batch=batch.id)),
+            ('students ?status=ACTIVE', lambda: self.list_queryset(StudentViewSet, manager, status='ACTIVE')),
+            ('dashboard recent admissions', lambda: Student.objects.order_by('-enrollment_date')[:5]),
+            ('fees', lambda: self.list_queryset(FeeViewSet, manager)),
+            ('attendance ?date=', lambda: self.list_queryset(AttendanceViewSet, manager, date='2024-01-15')),
+            ('attendance (trainer)', lambda: self.list_queryset(AttendanceViewSet, trainer)),
+            ('attendance matrix', lambda: Attendance.objects.filter(
+                batch=batch, date__gte='2024-01-01', date__lte='2024-01-31'
+            ).values_list('student_id', 'date', 'status')),
+            ('outreach', lambda: self.list_queryset(PlacementOutreachViewSet, officer)),
+        ]
+
+    def list_queryset(self, viewset, user, **params):
+        """The first page of ``viewset``'s list endpoint for ``user``, as a queryset."""
+        request = Request(APIRequestFactory().get('/', params))
+        request.user = user
+        view = viewset(request=request, action='list', format_kwarg=None, args=(), kwargs={})
+        paginator = view.pagination_class()
+        return view.filter_queryset(view.get_queryset()).order_by(*paginator.ordering)[:paginator.page_size]
+
+    def measure(self, build, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(build())
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples), build().explain()
+
+    def swap_indexes(self, current):
+        """Switch between the index set from before migration 0013 and the current one."""
+        # Only used to render DDL; entering it would refuse to run inside our transaction on SQLite.
+        editor = connection.schema_editor()
+        editor.deferred_sql = []
+        statements = []
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                statements.append(index.create_sql(model, editor) if current else index.remove_sql(model, editor))
+        for model, field in FOREIGN_KEY_INDEXES:
+            index = models.Index(fields=[field], name=f'bench_{model._meta.model_name}_{field}_idx')
+            statements.append(index.remove_sql(model, editor) if current else index.create_sql(model, editor))
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(str(statement))
+            cursor.execute('ANALYZE')
@@ -0,0 +1,72 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api.models import PlacementOutreach, User
+from api.views import AttendanceViewSet, FeeViewSet, InquiryViewSet, PlacementOutreachViewSet
+
+from ._synthetic import bulk_insert, seed_dataset
+
+ENDPOINTS = {
+    'inquiries': InquiryViewSet, 'fees': FeeViewSet,
+    'attendance': AttendanceViewSet, 'outreach': PlacementOutreachViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Page through each values()-backed list endpoint at the largest page size, once through the '
+        'serializers and once through values() rows, and check both produce the same bytes. '
+        'Seeded rows are rolled back when the benchmark finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50_000, help='Rows seeded for each endpoint.')
+        parser.add_argument('--only', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver']), transaction.atomic():
+            # students x sessions attendance rows; seed_dataset adds one outreach row per five inquiries
+            staff = seed_dataset(inquiries=rows, students=max(1, rows // 5), batches=50, sessions=5, fees=rows)
+            bulk_insert(PlacementOutreach, (
+                PlacementOutreach(officer=staff[User.Role.PLACEMENT_OFFICER][0], company_name=f'Company {index}',
+                                  contact_name='HR', mode='EMAIL', phone_email=f'hr{index}@example.com')
+                for index in range(rows - rows // 5)
+            ))
+            manager = staff[User.Role.MANAGER][0]
+
+            self.stdout.write(
+                f'{"endpoint":<12}{"rows":>8}{"path":>13}{"total ms":>11}{"ms/page":>10}{"rows/sec":>11}'
+            )
+            for endpoint in options['only']:
+                bodies = {}
+                for label, fast in (('serializers', False), ('values()', True)):
+                    view = ENDPOINTS[endpoint].as_view({'get': 'list'}, fast_list=fast)
+                    start = time.perf_counter()
+                    bodies[label] = self.walk(view, manager, f'/api/{endpoint}/')
+                    elapsed = (time.perf_counter() - start) * 1000
+                    count = sum(len(page['results']) for page in bodies[label]['data'])
+                    self.stdout.write(
+                        f'{endpoint:<12}{count:>8}{label:>13}{elapsed:>11.0f}'
+                        f'{elapsed / len(bodies[label]["data"]):>10.1f}{count / elapsed * 1000:>11.0f}'
+                    )
+                if bodies['serializers']['content'] != bodies['values()']['content']:
+                    self.stderr.write(f'{endpoint}: values() output differs from the serializers')
+            transaction.set_rollback(True)
+
+    def walk(self, view, user, url):
+        """Every page of a list endpoint: their parsed data and rendered bytes."""
+        pages = {'data': [], 'content': []}
+        url = f'{url}?page_size=200'
+        while url:
+            request = APIRequestFactory().get(url)
+            force_authenticate(request, user)
+            response = view(request).render()
+            pages['data'].append(response.data)
+            pages['content'].append(response.content)
+            url = response.data['next']
+        return pages
@@ -0,0 +1,102 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Batch, User
+from api.scheduling import RESOURCES, SCHEDULE_FIELDS, find_conflicts, schedule_conflicts
+from api.weekdays import parse_days
+
+from ._synthetic import synthetic_schedule
+
+
+def pairwise_conflicts(batches):
+    """The O(n^2) scan the sweep replaces, for comparison."""
+    found = 0
+    for i, a in enumerate(batches):
+        for j in range(i + 1, len(batches)):
+            b = batches[j]
+            if a['days_mask'] & b['days_mask'] and a['start_time'] < b['end_time'] and b['start_time'] < a['end_time']:
+                found += sum(1 for field in RESOURCES if a[field] and a[field] == b[field])
+    return found
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the batch conflict sweep against a pairwise scan, and single-batch conflict checks '
+        'against loading the whole schedule. Seeded rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batches', type=int, nargs='+', default=[1_000, 5_000])
+        parser.add_argument('--checks', type=int, default=200)
+        parser.add_argument('--batches-per-trainer', type=int, default=6)
+        parser.add_argument('--batches-per-room', type=int, default=25)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"batches":>8}{"conflicts":>11}{"sweep ms":>10}{"pairwise ms":>13}'
+            f'{"check ms":>10}{"queries":>9}{"full-load check ms":>20}'
+        )
+        for count in options['batches']:
+            with transaction.atomic():
+                self.run(count, options)
+                transaction.set_rollback(True)
+
+    def run(self, count, options):
+        rng = random.Random(options['seed'])
+        trainers = User.objects.bulk_create(
+            User(username=f'schedule-trainer-{index}', role=User.Role.TRAINER)
+            for index in range(max(1, count // options['batches_per_trainer']))
+        )
+        rooms = [f'Room {index}' for index in range(max(1, count // options['batches_per_room']))]
+        Batch.objects.bulk_create(
+            Batch(
+                batch_name=f'Schedule {index}', course='Data Science', start_date='2024-01-01',
+                trainer=rng.choice(trainers), **synthetic_schedule(rng, rooms),
+            )
+            for index in range(count)
+        )
+
+        start = time.perf_counter()
+        report = schedule_conflicts()
+        sweep = (time.perf_counter() - start) * 1000
+
+        batches = list(Batch.objects.values(*SCHEDULE_FIELDS))
+        start = time.perf_counter()
+        pairs = pairwise_conflicts(batches)
+        pairwise = (time.perf_counter() - start) * 1000
+        assert pairs == len(report), (pairs, len(report))
+
+        candidates = [
+            {'trainer_id': rng.choice(trainers).id, **synthetic_schedule(rng, rooms)} for _ in range(options['checks'])
+        ]
+        samples, full_load = [], []
+        with CaptureQueriesContext(connection) as ctx:
+            for candidate in candidates:
+                start = time.perf_counter()
+                find_conflicts(candidate)
+                samples.append((time.perf_counter() - start) * 1000)
+        queries = len(ctx.captured_queries) / len(candidates)
+        for candidate in candidates[:20]:
+            start = time.perf_counter()
+            self.full_load_check(candidate)
+            full_load.append((time.perf_counter() - start) * 1000)
+
+        self.stdout.write(
+            f'{count:>8}{len(report):>11}{sweep:>10.1f}{pairwise:>13.1f}'
+            f'{statistics.median(samples):>10.2f}{queries:>9.1f}{statistics.median(full_load):>20.2f}'
+        )
+
+    def full_load_check(self, candidate):
+        mask = parse_days(candidate['days_of_week'])
+        return [
+            batch for batch in Batch.objects.values(*SCHEDULE_FIELDS)
+            if any(batch[field] == candidate[field] for field in RESOURCES)
+            and batch['days_mask'] & mask
+            and batch['start_time'] < candidate['end_time'] and candidate['start_time'] < batch['end_time']
+        ]
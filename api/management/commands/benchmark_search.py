@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from api.models import Inquiry
+from api.search import get_backend, search, search_filter
+
+from ._synthetic import seed_inquiries
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the indexed search path with the old icontains filter on a synthetic inquiry table. '
+        'Seeded rows are rolled back when the benchmark finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inquiries', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['inquiries'], options['seed'])
+            self.report(options['repeat'])
+            transaction.set_rollback(True)
+
+    def seed(self, count, seed):
+        self.stdout.write(f'Seeding {count} inquiries...')
+        seed_inquiries(count, seed)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def report(self, repeat):
+        terms = ['Kavya Iyer', 'desh', '7000012', 'Fergusson', 'rohan 4242']
+        backend = type(get_backend(Inquiry)).__name__
+        self.stdout.write(f'Backend: {backend} on {connection.vendor}, {repeat} runs per term, median ms\n')
+        self.stdout.write(f'{"term":<14}{"icontains":>12}{"indexed":>12}{"ranked":>12}{"matches":>10}')
+
+        for term in terms:
+            icontains = self.time(repeat, lambda: Inquiry.objects.filter(
+                Q(name__icontains=term) | Q(mobile__icontains=term)
+            ).order_by('-created_at', '-id'))
+            indexed = self.time(repeat, lambda: search_filter(
+                Inquiry.objects.all(), 'inquiry', term
+            ).order_by('-created_at', '-id'))
+            ranked = self.time(repeat, lambda: search(Inquiry.objects.all(), 'inquiry', term, ('id',), 50))
+            matches = search_filter(Inquiry.objects.all(), 'inquiry', term).count()
+            self.stdout.write(f'{term:<14}{icontains:>12.2f}{indexed:>12.2f}{ranked:>12.2f}{matches:>10}')
+
+    def time(self, repeat, run):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            if hasattr(result, 'values_list'):
+                list(result.values_list('id', flat=True)[:50])
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
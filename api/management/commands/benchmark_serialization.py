@@ -0,0 +1,75 @@
+import gzip
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.ledger import rebuild_ledger
+from api.middleware import BROTLI_QUALITY, brotli
+from api.models import Fee, Student
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+from api.serializers import StudentSerializer
+from api.shaping import optimize_queryset
+
+from ._synthetic import seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Render the /api/students/ payload for N students with DRF\'s JSONRenderer and with orjson, '
+        'parse it back, and report the bytes on the wire with gzip and brotli. '
+        'Seeded rows are rolled back when the benchmark finishes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=10_000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            seed_dataset(inquiries=options['students'], students=options['students'], batches=50, sessions=0)
+            rebuild_ledger(Student, Fee)
+            queryset = optimize_queryset(Student.objects.order_by('-id'), StudentSerializer())
+            serializer = StudentSerializer(queryset, many=True)
+            start = time.perf_counter()
+            data = serializer.data
+            self.stdout.write(f'{len(data)} students serialized in {(time.perf_counter() - start) * 1000:.0f} ms\n')
+            transaction.set_rollback(True)
+
+        body = JSONRenderer().render(data)
+        if ORJSONRenderer().render(data) != body:
+            self.stderr.write('orjson output differs from JSONRenderer output')
+
+        self.stdout.write(f'{"step":<24}{"median ms":>11}')
+        for label, run in (
+            ('render json', lambda: JSONRenderer().render(data)),
+            ('render orjson', lambda: ORJSONRenderer().render(data)),
+            ('parse json', lambda: JSONParser().parse(io.BytesIO(body))),
+            ('parse orjson', lambda: ORJSONParser().parse(io.BytesIO(body))),
+        ):
+            self.stdout.write(f'{label:<24}{self.median_ms(run, options["repeat"]):>11.1f}')
+
+        self.stdout.write(f'\n{"encoding":<24}{"bytes":>12}{"ratio":>8}{"median ms":>11}')
+        encodings = [('identity', lambda: body), ('gzip', lambda: gzip.compress(body, compresslevel=6))]
+        if brotli is not None:
+            encodings.append((f'br (quality {BROTLI_QUALITY})', lambda: brotli.compress(body, quality=BROTLI_QUALITY)))
+        else:
+            self.stderr.write('brotli is not installed; skipping br')
+        for label, compress in encodings:
+            size = len(compress())
+            self.stdout.write(
+                f'{label:<24}{size:>12,}{size / len(body):>8.2f}{self.median_ms(compress, options["repeat"]):>11.1f}'
+            )
+
+    def median_ms(self, run, repeat):
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - start) * 1000)
+        return statistics.median(samples)
@@ -0,0 +1,208 @@
+import datetime
+import itertools
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api import serializers
+from api.ledger import rebuild_ledger
+from api.models import (
+    Attendance, Batch, DailyMetrics, Fee, Inquiry, InquiryFollowup, PlacementOutreach, Student, User,
+)
+from api.rollups import rebuild_daily_metrics
+from api.shaping import optimize_queryset
+
+from ._synthetic import scaled, seed_dataset, seed_inquiries
+
+ENDPOINTS = {
+    'users': User, 'inquiries': Inquiry, 'batches': Batch, 'students': Student,
+    'fees': Fee, 'attendance': Attendance, 'outreach': PlacementOutreach,
+}
+SERIALIZERS = {
+    serializers.UserSerializer: User,
+    serializers.InquirySerializer: Inquiry,
+    serializers.InquiryFollowupSerializer: InquiryFollowup,
+    serializers.BatchSerializer: Batch,
+    serializers.StudentSerializer: Student,
+    serializers.FeeSerializer: Fee,
+    serializers.AttendanceSerializer: Attendance,
+    serializers.PlacementOutreachSerializer: PlacementOutreach,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Time every API list/retrieve/create path, each serializer and the dashboard stats, recording '
+        'median wall time, query count and peak Python memory. Results can be saved as a JSON baseline '
+        'and compared with a later run. Everything the suite writes is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scale', type=float, default=0.01,
+            help='Seed a synthetic dataset at this fraction of seed_data --scale 1 before running.',
+        )
+        parser.add_argument('--existing', action='store_true', help='Run against the current data instead of seeding.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--only', help='Run only the cases whose name contains this text.')
+        parser.add_argument('--output', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='Compare with a JSON file written by --output.')
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help='Relative slowdown reported as a regression (more queries always are).',
+        )
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)
+
+        # DEBUG query logging would be timed too; CaptureQueriesContext logs regardless.
+        with override_settings(DEBUG=False), transaction.atomic():
+            if not options['existing']:
+                seed_dataset(**scaled(options['scale']))
+                rebuild_ledger(Student, Fee)
+                rebuild_daily_metrics(DailyMetrics, Inquiry, Student, Fee, PlacementOutreach)
+            results = {}
+            for name, run in self.cases():
+                if options['only'] and options['only'] not in name:
+                    continue
+                results[name] = self.measure(run, options['repeat'])
+                self.stdout.write(self.format_row(name, results[name], baseline))
+            transaction.set_rollback(True)
+
+        report = {
+            'meta': {
+                'created': timezone.now().isoformat(timespec='seconds'),
+                'scale': None if options['existing'] else options['scale'],
+                'repeat': options['repeat'],
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+            },
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2, sort_keys=True)
+            self.stdout.write(f'Wrote {options["output"]}')
+        if baseline is not None:
+            regressions = self.regressions(results, baseline['results'], options['threshold'])
+            if regressions:
+                message = f'{len(regressions)} regression(s): {", ".join(regressions)}'
+                if options['fail_on_regression']:
+                    raise CommandError(message)
+                self.stdout.write(self.style.WARNING(message))
+            else:
+                self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
+
+    def cases(self):
+        """Yield (name, callable) pairs; each call performs the operation once."""
+        manager = User.objects.create_user('benchmark-suite', role=User.Role.MANAGER)
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(manager)
+        counter = itertools.count()
+
+        def request(method, url, payload=None, expect=200):
+            def run():
+                data = payload(next(counter)) if payload else None
+                response = getattr(client, method)(url, data, format='json')
+                if response.status_code != expect:
+                    raise CommandError(f'{method.upper()} {url} returned {response.status_code}: {response.data}')
+            return run
+
+        for prefix, model in ENDPOINTS.items():
+            yield f'GET /api/{prefix}/', request('get', f'/api/{prefix}/')
+            first = model.objects.order_by('id').values_list('id', flat=True).first()
+            if first is not None:
+                yield f'GET /api/{prefix}/<id>/', request('get', f'/api/{prefix}/{first}/')
+
+        # Create payloads draw on rows that exist at every scale.
+        batch = Batch.objects.order_by('id').first()
+        student = Student.objects.order_by('id').first()
+        inquiry = Inquiry.objects.order_by('id').first()
+        last_inquiry = Inquiry.objects.order_by('-id').values_list('id', flat=True).first()
+        seed_inquiries(1000, offset=last_inquiry + 1, source='benchmark-suite')
+        free_inquiries = iter(Inquiry.objects.filter(source='benchmark-suite').values_list('id', flat=True))
+        creates = {
+            'users': lambda n: {'username': f'suite-user-{n}', 'password': 'pass', 'role': User.Role.COUNSELOR},
+            'inquiries': lambda n: {
+                'name': f'Suite {n}', 'mobile': f'6{n:09d}', 'email': f'suite{n}@example.com', 'college': 'COEP',
+                'degree': 'B.Tech', 'branch': 'CS', 'passout_year': 2024, 'interested_course': 'Data Science',
+                'source': 'LinkedIn',
+            },
+            'batches': lambda n: {'course': 'Data Science', 'batch_name': f'Suite {n}', 'start_date': '2024-01-01'},
+            'students': lambda n: {
+                'inquiry': next(free_inquiries), 'mobile': f'5{n:09d}', 'email': f'suite{n}@example.com',
+                'course': 'Data Science', 'total_fees': 30000,
+            },
+            'fees': lambda n: {'student': student.id, 'amount': '1000.00', 'mode': 'UPI'},
+            'attendance': lambda n: {
+                'batch': batch.id, 'student': student.id, 'status': 'PRESENT_OFFLINE',
+                'date': (datetime.date(2030, 1, 1) + datetime.timedelta(days=n)).isoformat(),
+            },
+            'outreach': lambda n: {
+                'company_name': f'Suite {n}', 'contact_name': 'HR', 'mode': 'CALL', 'phone_email': 'hr@example.com',
+            },
+        }
+        for prefix, payload in creates.items():
+            yield f'POST /api/{prefix}/', request('post', f'/api/{prefix}/', payload, expect=201)
+        yield 'POST /api/inquiries/<id>/add_followup/', request(
+            'post', f'/api/inquiries/{inquiry.id}/add_followup/', lambda n: {'remark': 'Called', 'status': 'WARM'}, 201,
+        )
+
+        yield 'GET /api/dashboard/stats/', request('get', '/api/dashboard/stats/')
+
+        for serializer_class, model in SERIALIZERS.items():
+            instances = list(optimize_queryset(model.objects.order_by('id'), serializer_class())[:100])
+            yield f'{serializer_class.__name__}(many=True)', (
+                lambda serializer_class=serializer_class, instances=instances: serializer_class(instances, many=True).data
+            )
+
+    def measure(self, run, repeat):
+        run()  # warm up
+        samples = []
+        for _ in range(repeat):
+            cache.clear()
+            reset_queries()
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                run()
+                samples.append((time.perf_counter() - start) * 1000)
+        queries = sum(1 for query in ctx.captured_queries if 'SAVEPOINT' not in query['sql'])
+
+        # tracemalloc slows Python down several times over, so memory gets its own pass.
+        cache.clear()
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {'ms': round(statistics.median(samples), 3), 'queries': queries, 'peak_kb': round(peak / 1024, 1)}
+
+    def format_row(self, name, result, baseline):
+        row = f'{name:<44}{result["ms"]:>10.2f} ms{result["queries"]:>5} q{result["peak_kb"]:>10.1f} KiB'
+        before = (baseline or {}).get('results', {}).get(name)
+        if before:
+            change = (result['ms'] - before['ms']) / before['ms'] if before['ms'] else 0
+            row += f'   {change:+7.1%}  {before["queries"]:>3} -> {result["queries"]:<3} q'
+        return row
+
+    def regressions(self, results, baseline, threshold):
+        return [
+            name for name, result in results.items()
+            if name in baseline and (
+                result['ms'] > baseline[name]['ms'] * (1 + threshold) or result['queries'] > baseline[name]['queries']
+            )
+        ]
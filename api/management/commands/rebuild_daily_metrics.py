@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from api.models import DailyMetrics, Inquiry, Student, Fee, PlacementOutreach
+from api.rollups import rebuild_daily_metrics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailyMetrics rollup table from inquiries, students, fees and outreach.'
+
+    def handle(self, *args, **options):
+        days = rebuild_daily_metrics(DailyMetrics, Inquiry, Student, Fee, PlacementOutreach)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt daily metrics for {days} day(s).'))
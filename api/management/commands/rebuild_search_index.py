@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from api import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index from the inquiry, student and outreach tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        search.rebuild(using=options['database'])
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from api.ledger import find_drift, rebuild_ledger
+from api.models import Fee, Student
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the fee ledger columns on Student from Fee rows and report any drift. '
+        'Pass --fix to write the recomputed values.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Overwrite drifted students with recomputed totals.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drift = list(find_drift(Student, Fee))
+            for student_id, field, stored, expected in drift:
+                self.stdout.write(f'student {student_id}: {field} is {stored}, expected {expected}')
+
+            students = sorted({student_id for student_id, *_ in drift})
+            if not students:
+                self.stdout.write(self.style.SUCCESS('Fee ledger matches fee rows.'))
+                return
+            if options['fix']:
+                rebuild_ledger(Student, Fee, students)
+                self.stdout.write(self.style.SUCCESS(f'Fixed {len(students)} student(s).'))
+            else:
+                self.stdout.write(self.style.WARNING(
+                    f'{len(students)} student(s) have drifted; run with --fix to repair.'
+                ))
@@ -0,0 +1,92 @@
+"""
+Prometheus metrics, served at /metrics. Under gunicorn every worker writes
+its samples to PROMETHEUS_MULTIPROC_DIR (see gunicorn.conf.py) and the scrape
+aggregates them, so a scrape that lands on any one worker sees them all.
+
+Recording a sample is a dict lookup and an mmap write, cheap enough to do on
+every request; the request metrics are recorded by MetricsMiddleware.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+
+ROUTE_LABELS = ('route', 'action')
+
+REQUESTS = Counter('api_requests', 'HTTP requests served.', ROUTE_LABELS + ('method', 'status'))
+LATENCY = Histogram(
+    'api_request_duration_seconds',
+    'Time to produce the response, from MetricsMiddleware on; CORS preflights and static files are not timed.',
+    ROUTE_LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSE_SIZE = Histogram(
+    'api_response_size_bytes', 'Response body size as sent (compressed); streamed responses are not counted.',
+    ROUTE_LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+DB_QUERIES = Histogram(
+    'api_db_queries_per_request', 'Statements executed per request.', ROUTE_LABELS,
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+DB_TIME = Counter('api_db_query_seconds', 'Time spent executing statements.', ROUTE_LABELS)
+
+CACHE_REQUESTS = Counter('api_cache_requests', 'Response cache lookups.', ('endpoint', 'outcome'))
+
+DB_CONNECTIONS_OPENED = Counter('api_db_connections_opened', 'Database connections opened.', ('alias',))
+DB_CONNECTIONS_PERSISTENT = Gauge(
+    'api_db_connections_persistent', 'Connections kept open between requests (CONN_MAX_AGE).', ('alias',),
+    multiprocess_mode='livesum',
+)
+
+INQUIRIES_CREATED = Counter('api_inquiries_created', 'Inquiries created.')
+FEES_COLLECTED = Counter('api_fees_collected', 'Fee payments recorded.', ('mode',))
+FEES_COLLECTED_AMOUNT = Counter('api_fees_collected_amount', 'Fee amount recorded, in rupees.', ('mode',))
+
+
+class QueryCounter:
+    """A connection.execute_wrapper that only counts and times statements."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+def observe_request(request, response, seconds, queries, action):
+    match = request.resolver_match
+    labels = (match.view_name if match else 'unmatched', action or '')
+    REQUESTS.labels(*labels, request.method, response.status_code).inc()
+    LATENCY.labels(*labels).observe(seconds)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(*labels).observe(len(response.content))
+    DB_QUERIES.labels(*labels).observe(queries.count)
+    if queries.seconds:
+        DB_TIME.labels(*labels).inc(queries.seconds)
+
+
+def metrics(request):
+    """Prometheus text format. Requires ``Authorization: Bearer <METRICS_TOKEN>`` unless DEBUG is on."""
+    if settings.METRICS_TOKEN:
+        if not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {settings.METRICS_TOKEN}'):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        raise Http404
+
+    registry = REGISTRY
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
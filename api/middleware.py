@@ -0,0 +1,268 @@
+import contextlib
+import json
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections, transaction
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from . import metrics, profiling, routers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('api.profiling')
+
+# Brotli's fast levels beat gzip on size at similar speed; 10-11 are for static assets
+BROTLI_QUALITY = 5
+
+
+class AccessLogMiddleware:
+    """
+    Append one JSON line per API request to ACCESS_LOG_PATH, in the format
+    ``loadtest.py replay`` reads. With ACCESS_LOG_BODIES, write requests
+    also record their body (never for /api/auth/, which carries passwords).
+    """
+    lock = threading.Lock()
+
+    def __init__(self, get_response):
+        if not settings.ACCESS_LOG_PATH:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log = open(settings.ACCESS_LOG_PATH, 'a', buffering=1, encoding='utf-8')
+
+    def __call__(self, request):
+        if not request.path.startswith('/api/'):
+            return self.get_response(request)
+
+        body = None
+        if (
+            settings.ACCESS_LOG_BODIES and request.method not in ('GET', 'HEAD', 'OPTIONS')
+            and not request.path.startswith('/api/auth/')
+        ):
+            # Read before the view so DRF parses the cached copy.
+            body = request.body.decode('utf-8', 'replace')
+
+        start = time.time()
+        response = self.get_response(request)
+        entry = {
+            'ts': round(start, 4),
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'ms': round((time.time() - start) * 1000, 2),
+            # DRF authenticates inside the view and copies its user back onto the request
+            'role': getattr(getattr(request, 'user', None), 'role', None),
+        }
+        if body is not None:
+            entry['content_type'] = request.content_type
+            entry['body'] = body
+        with self.lock:
+            self.log.write(json.dumps(entry) + '\n')
+        return response
+
+
+class AtomicWritesMiddleware:
+    """
+    Run each write request's view in one transaction, so rows commit together
+    with the rollups and ledgers their signals maintain; an error response
+    rolls everything back. Reads stay in autocommit: they need no transaction,
+    and on SQLite one would queue them behind writers for the write lock.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return self.get_response(request)
+        with transaction.atomic():
+            response = self.get_response(request)
+            if response.status_code >= 400:
+                transaction.set_rollback(True)
+        return response
+
+
+def routed(content, routing):
+    """Iterate ``content`` with ``routing`` installed around each step."""
+    iterator = iter(content)
+    while True:
+        token = routers.current.set(routing)
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            routers.current.reset(token)
+        yield chunk
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Give each request its api.routers state, send GET admin changelists to
+    the read replica, and pin users who sent a write to the primary.
+    """
+
+    def __init__(self, get_response):
+        if not settings.READ_REPLICA:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = routers.RequestRouting()
+        token = routers.current.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.current.reset(token)
+        if response.streaming:
+            # Streamed bodies (exports) run their queries as they are sent, after the view returned
+            response.streaming_content = routed(response.streaming_content, routing)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            # DRF copies the user it authenticated onto the request
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                routers.pin_to_primary(user.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match.namespace == 'admin' and match.url_name and match.url_name.endswith('_changelist'):
+            routers.read_from_replica(request)
+
+
+class MetricsMiddleware:
+    """Record every request's count, latency, size and statement count for /metrics (api.metrics)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = metrics.QueryCounter()
+        start = time.perf_counter()
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        metrics.observe_request(
+            request, response, time.perf_counter() - start, queries, getattr(request, 'metrics_action', None),
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # ViewSets map the method to their action, e.g. {'get': 'list', 'post': 'create'}
+        actions = getattr(view_func, 'actions', None)
+        if actions:
+            request.metrics_action = actions.get(request.method.lower())
+
+
+def accepts_encoding(request, coding):
+    for item in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = item.strip().partition(';')
+        if name.strip().lower() == coding:
+            params = params.strip().lower()
+            try:
+                return not params.startswith('q=') or float(params[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress API responses of COMPRESSION_MIN_BYTES or more: brotli when the
+    client accepts it and the package is installed, gzip otherwise. Token
+    endpoints are skipped, since they put secrets next to echoed request input
+    (BREACH), and so are event streams, which must not be buffered.
+    """
+
+    def process_response(self, request, response):
+        if not request.path.startswith('/api/') or request.path.startswith('/api/auth/'):
+            return response
+        if response.get('Content-Type', '').startswith('text/event-stream') or response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_BYTES:
+            return response
+        if brotli is None or response.streaming or not accepts_encoding(request, 'br'):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Profile a REQUEST_PROFILING_SAMPLE_RATE fraction of requests: query count
+    and DB time, serializer, view and render time go out in a Server-Timing
+    header. Requests slower than SLOW_REQUEST_MS are logged with their slowest
+    statements, and statements repeated N_PLUS_ONE_THRESHOLD times or more
+    with the same shape are logged as a probable N+1. Statements are logged
+    with placeholders, never parameter values.
+    """
+    slowest_limit = 5
+
+    def __init__(self, get_response):
+        if settings.REQUEST_PROFILING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        profile = request.profile = profiling.RequestProfile()
+        token = profiling.current.set(profile)
+        try:
+            with contextlib.ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            profiling.current.reset(token)
+        profile.end = time.perf_counter()
+
+        response['Server-Timing'] = profile.server_timing()
+        self.report(request, profile)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, 'profile'):
+            request.profile.view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; the rest is render time.
+        if hasattr(request, 'profile'):
+            request.profile.view_end = time.perf_counter()
+        return response
+
+    def report(self, request, profile):
+        match = request.resolver_match
+        route = f'{match.view_name} ({match.route})' if match else 'unresolved'
+        if profile.total_ms >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                'Slow request %s %s [%s]: %.0f ms, %d queries in %.0f ms; slowest:\n%s',
+                request.method, request.get_full_path(), route, profile.total_ms, len(profile.queries),
+                profile.db_ms, '\n'.join(f'  {ms:8.1f} ms  {sql}' for ms, sql in profile.slowest(self.slowest_limit)),
+            )
+        repeated = profile.repeated_shapes(settings.N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            logger.warning(
+                'Probable N+1 in %s %s [%s]:\n%s', request.method, request.path, route,
+                '\n'.join(f'  {count:>4}x  {shape}' for count, shape in repeated),
+            )
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:00
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+FIELDS = (
+    "inquiries", "admissions", "outreach", "fee_count",
+    "fees_total", "fees_cash", "fees_upi", "fees_neft", "fees_rtgs", "fees_cheque",
+)
+
+
+def backfill_daily_metrics(apps, schema_editor):
+    # A copy of api.rollups.rebuild_daily_metrics as of this migration, on historical models
+    Inquiry = apps.get_model("api", "Inquiry")
+    Student = apps.get_model("api", "Student")
+    Fee = apps.get_model("api", "Fee")
+    PlacementOutreach = apps.get_model("api", "PlacementOutreach")
+    DailyMetrics = apps.get_model("api", "DailyMetrics")
+
+    rows = defaultdict(lambda: dict.fromkeys(FIELDS, 0))
+    for row in Inquiry.objects.annotate(day=TruncDate("created_at")).values("day").annotate(n=Count("id")):
+        rows[row["day"]]["inquiries"] = row["n"]
+    for row in Student.objects.values("enrollment_date").annotate(n=Count("id")):
+        rows[row["enrollment_date"]]["admissions"] = row["n"]
+    for row in PlacementOutreach.objects.annotate(day=TruncDate("date")).values("day").annotate(n=Count("id")):
+        rows[row["day"]]["outreach"] = row["n"]
+    fees = Fee.objects.annotate(day=TruncDate("date_collected")).values("day", "mode").annotate(
+        n=Count("id"), total=Sum("amount")
+    )
+    for row in fees:
+        day = rows[row["day"]]
+        day["fee_count"] += row["n"]
+        day["fees_total"] += row["total"]
+        day[f"fees_{row['mode'].lower()}"] += row["total"]
+
+    DailyMetrics.objects.bulk_create(
+        [DailyMetrics(date=day, **values) for day, values in sorted(rows.items())],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_inquiryfollowup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyMetrics",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("inquiries", models.PositiveIntegerField(default=0)),
+                ("admissions", models.PositiveIntegerField(default=0)),
+                ("outreach", models.PositiveIntegerField(default=0)),
+                ("fee_count", models.PositiveIntegerField(default=0)),
+                (
+                    "fees_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "fees_cash",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "fees_upi",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "fees_neft",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "fees_rtgs",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "fees_cheque",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Daily metrics",
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.RunPython(backfill_daily_metrics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:27
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def backfill_fee_ledger(apps, schema_editor):
+    # Frozen copy of api.ledger.rebuild_ledger as of this migration, on historical models
+    Student = apps.get_model("api", "Student")
+    Fee = apps.get_model("api", "Fee")
+    paid = {
+        row["student"]: row
+        for row in Fee.objects.values("student").annotate(
+            total=Sum("amount"), count=Count("id"), last=Max("date_collected")
+        )
+    }
+    students = []
+    for student_id, total_fees in Student.objects.values_list("id", "total_fees").iterator():
+        row = paid.get(student_id, {})
+        amount_paid = row.get("total") or Decimal("0")
+        students.append(Student(
+            id=student_id,
+            amount_paid=amount_paid,
+            balance_due=total_fees - amount_paid,
+            last_payment_at=row.get("last"),
+            payment_count=row.get("count", 0),
+        ))
+    Student.objects.bulk_update(
+        students, ["amount_paid", "balance_due", "last_payment_at", "payment_count"], batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_dailymetrics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="student",
+            name="amount_paid",
+            field=models.DecimalField(
+                decimal_places=2, default=0, editable=False, max_digits=10
+            ),
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="balance_due",
+            field=models.DecimalField(
+                db_index=True,
+                decimal_places=2,
+                default=0,
+                editable=False,
+                max_digits=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="last_payment_at",
+            field=models.DateTimeField(
+                blank=True, db_index=True, editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="payment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_fee_ledger, migrations.RunPython.noop),
+    ]
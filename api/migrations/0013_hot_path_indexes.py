@@ -0,0 +1,108 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0012_student_fee_ledger"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="inquiry",
+            name="created_by",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="inquiries",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="inquiryfollowup",
+            name="inquiry",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="followups",
+                to="api.inquiry",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="batch",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="students",
+                to="api.batch",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                fields=["batch", "-date"], name="attendance_batch_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(fields=["-date", "-id"], name="attendance_recent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="fee",
+            index=models.Index(
+                fields=["-date_collected", "-id"], name="fee_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inquiry",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="inquiry_recent_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inquiry",
+            index=models.Index(
+                fields=["created_by", "-created_at", "-id"],
+                name="inquiry_owner_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inquiry",
+            index=models.Index(
+                condition=models.Q(("lead_status", "ENROLLED"), _negated=True),
+                fields=["next_followup_date"],
+                name="inquiry_open_followup_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="inquiryfollowup",
+            index=models.Index(
+                fields=["inquiry", "-date", "-created_at"],
+                name="followup_inquiry_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="placementoutreach",
+            index=models.Index(fields=["-date", "-id"], name="outreach_recent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["batch", "status"], name="student_batch_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["-enrollment_date"], name="student_enrollment_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_user_token_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="batch",
+            name="trainer",
+            field=models.ForeignKey(
+                db_index=False,
+                limit_choices_to={"role": "TRAINER"},
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="batches",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="batch",
+            index=models.Index(
+                fields=["trainer", "start_time"], name="batch_trainer_time_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="batch",
+            index=models.Index(
+                fields=["classroom_name", "start_time"], name="batch_room_time_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:57
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of the api.weekdays parser as of this migration, so later
+# changes to it do not change what this backfill does.
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+DAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+ALL_DAYS = (1 << len(WEEKDAYS)) - 1
+DAY_ALIASES = {
+    "daily": ALL_DAYS,
+    "everyday": ALL_DAYS,
+    "weekdays": 0b0011111,
+    "weekends": 0b1100000,
+    "weekend": 0b1100000,
+}
+
+
+def weekday_index(token):
+    for index, name in enumerate(DAY_NAMES):
+        if len(token) >= 3 and name.startswith(token):
+            return index
+    raise ValueError(token)
+
+
+def parse_days(value):
+    """Bitmask of the weekdays in ``value``, or 0 if any of it does not parse."""
+    mask = 0
+    text = re.sub(r"\s*-\s*", "-", (value or "").strip().lower())
+    try:
+        for token in re.split(r"[\s,;/&]+", text):
+            if not token or token == "and":
+                continue
+            if token in DAY_ALIASES:
+                mask |= DAY_ALIASES[token]
+            elif "-" in token:
+                first, _, last = token.partition("-")
+                first, last = weekday_index(first), weekday_index(last)
+                for offset in range((last - first) % len(WEEKDAYS) + 1):
+                    mask |= 1 << (first + offset) % len(WEEKDAYS)
+            else:
+                mask |= 1 << weekday_index(token)
+    except ValueError:
+        return 0
+    return mask
+
+
+def format_days(mask):
+    return ",".join(day for index, day in enumerate(WEEKDAYS) if mask & 1 << index)
+
+
+def backfill_days_mask(apps, schema_editor):
+    # Text that does not parse is kept as is, with an empty mask.
+    Batch = apps.get_model("api", "Batch")
+    batches = list(Batch.objects.exclude(days_of_week__isnull=True).exclude(days_of_week=""))
+    for batch in batches:
+        batch.days_mask = parse_days(batch.days_of_week)
+        if batch.days_mask:
+            batch.days_of_week = format_days(batch.days_mask)
+    Batch.objects.bulk_update(batches, ["days_mask", "days_of_week"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0015_batch_schedule_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="batch",
+            name="days_mask",
+            field=models.PositiveSmallIntegerField(
+                db_index=True, default=0, editable=False
+            ),
+        ),
+        migrations.RunPython(backfill_days_mask, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_batch_days_mask"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="inquiryfollowup",
+            name="date",
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+        migrations.AlterField(
+            model_name="student",
+            name="enrollment_date",
+            field=models.DateField(default=django.utils.timezone.localdate),
+        ),
+    ]
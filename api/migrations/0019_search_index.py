@@ -0,0 +1,156 @@
+"""
+Search index structures (see api/search.py): FTS5 tables kept in sync by
+triggers on SQLite, a generated search_vector column plus trigram indexes on
+PostgreSQL. Other databases have nothing to install.
+
+SQLite drops a table's triggers when Django rebuilds it, so a later migration
+that alters api_inquiry, api_student or api_placementoutreach on SQLite must
+re-create their triggers and rebuild the index.
+
+The statements are frozen here rather than imported from api.search so this
+migration keeps doing the same thing as that module changes.
+"""
+from django.db import migrations
+
+SQLITE_TABLES = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS api_inquiry_fts USING fts5("
+    "name, mobile, email, college, content='api_inquiry', content_rowid='id', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS api_placementoutreach_fts USING fts5("
+    "company_name, contact_name, content='api_placementoutreach', content_rowid='id', prefix='2 3')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS api_student_fts USING fts5(name, mobile, prefix='2 3')",
+]
+SQLITE_TRIGGERS = {
+    'api_inquiry_fts_ai': """
+        CREATE TRIGGER api_inquiry_fts_ai AFTER INSERT ON api_inquiry BEGIN
+            INSERT INTO api_inquiry_fts(rowid, name, mobile, email, college)
+            VALUES (new.id, new.name, new.mobile, new.email, new.college);
+        END""",
+    'api_inquiry_fts_ad': """
+        CREATE TRIGGER api_inquiry_fts_ad AFTER DELETE ON api_inquiry BEGIN
+            INSERT INTO api_inquiry_fts(api_inquiry_fts, rowid, name, mobile, email, college)
+            VALUES ('delete', old.id, old.name, old.mobile, old.email, old.college);
+        END""",
+    'api_inquiry_fts_au': """
+        CREATE TRIGGER api_inquiry_fts_au AFTER UPDATE OF name, mobile, email, college ON api_inquiry BEGIN
+            INSERT INTO api_inquiry_fts(api_inquiry_fts, rowid, name, mobile, email, college)
+            VALUES ('delete', old.id, old.name, old.mobile, old.email, old.college);
+            INSERT INTO api_inquiry_fts(rowid, name, mobile, email, college)
+            VALUES (new.id, new.name, new.mobile, new.email, new.college);
+            UPDATE api_student_fts SET name = new.name
+            WHERE rowid IN (SELECT id FROM api_student WHERE inquiry_id = new.id);
+        END""",
+    'api_placementoutreach_fts_ai': """
+        CREATE TRIGGER api_placementoutreach_fts_ai AFTER INSERT ON api_placementoutreach BEGIN
+            INSERT INTO api_placementoutreach_fts(rowid, company_name, contact_name)
+            VALUES (new.id, new.company_name, new.contact_name);
+        END""",
+    'api_placementoutreach_fts_ad': """
+        CREATE TRIGGER api_placementoutreach_fts_ad AFTER DELETE ON api_placementoutreach BEGIN
+            INSERT INTO api_placementoutreach_fts(api_placementoutreach_fts, rowid, company_name, contact_name)
+            VALUES ('delete', old.id, old.company_name, old.contact_name);
+        END""",
+    'api_placementoutreach_fts_au': """
+        CREATE TRIGGER api_placementoutreach_fts_au
+        AFTER UPDATE OF company_name, contact_name ON api_placementoutreach BEGIN
+            INSERT INTO api_placementoutreach_fts(api_placementoutreach_fts, rowid, company_name, contact_name)
+            VALUES ('delete', old.id, old.company_name, old.contact_name);
+            INSERT INTO api_placementoutreach_fts(rowid, company_name, contact_name)
+            VALUES (new.id, new.company_name, new.contact_name);
+        END""",
+    'api_student_fts_ai': """
+        CREATE TRIGGER api_student_fts_ai AFTER INSERT ON api_student BEGIN
+            INSERT INTO api_student_fts(rowid, name, mobile)
+            VALUES (new.id, (SELECT name FROM api_inquiry WHERE id = new.inquiry_id), new.mobile);
+        END""",
+    'api_student_fts_ad': """
+        CREATE TRIGGER api_student_fts_ad AFTER DELETE ON api_student BEGIN
+            DELETE FROM api_student_fts WHERE rowid = old.id;
+        END""",
+    'api_student_fts_au': """
+        CREATE TRIGGER api_student_fts_au AFTER UPDATE OF mobile, inquiry_id ON api_student BEGIN
+            DELETE FROM api_student_fts WHERE rowid = old.id;
+            INSERT INTO api_student_fts(rowid, name, mobile)
+            VALUES (new.id, (SELECT name FROM api_inquiry WHERE id = new.inquiry_id), new.mobile);
+        END""",
+}
+SQLITE_REBUILD = [
+    "INSERT INTO api_inquiry_fts(api_inquiry_fts) VALUES ('rebuild')",
+    "INSERT INTO api_placementoutreach_fts(api_placementoutreach_fts) VALUES ('rebuild')",
+    "DELETE FROM api_student_fts",
+    "INSERT INTO api_student_fts(rowid, name, mobile) "
+    "SELECT s.id, i.name, s.mobile FROM api_student s JOIN api_inquiry i ON i.id = s.inquiry_id",
+]
+
+POSTGRES_VECTORS = {
+    'api_inquiry': (
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(mobile, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(email, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(college, '')), 'C')"
+    ),
+    'api_placementoutreach': (
+        "setweight(to_tsvector('simple', coalesce(company_name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(contact_name, '')), 'B')"
+    ),
+}
+POSTGRES_TRIGRAM_COLUMNS = [
+    ('api_inquiry', 'name'),
+    ('api_inquiry', 'mobile'),
+    ('api_student', 'mobile'),
+    ('api_placementoutreach', 'company_name'),
+    ('api_placementoutreach', 'contact_name'),
+]
+
+
+def install_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        # Databases that ran the old post_migrate installer already have these.
+        for statement in SQLITE_TABLES:
+            schema_editor.execute(statement)
+        for name, statement in SQLITE_TRIGGERS.items():
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            schema_editor.execute(statement)
+        for statement in SQLITE_REBUILD:
+            schema_editor.execute(statement)
+    elif vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for table, expression in POSTGRES_VECTORS.items():
+            schema_editor.execute(
+                f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector '
+                f'GENERATED ALWAYS AS ({expression}) STORED'
+            )
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_search_vector_gin ON {table} USING gin (search_vector)'
+            )
+        for table, column in POSTGRES_TRIGRAM_COLUMNS:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm ON {table} USING gin ({column} gin_trgm_ops)'
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        for table in ('api_inquiry_fts', 'api_placementoutreach_fts', 'api_student_fts'):
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}')
+    elif vendor == 'postgresql':
+        # pg_trgm is left installed; other schemas may use it.
+        for table, column in POSTGRES_TRIGRAM_COLUMNS:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm')
+        for table in POSTGRES_VECTORS:
+            schema_editor.execute(f'DROP INDEX IF EXISTS {table}_search_vector_gin')
+            schema_editor.execute(f'ALTER TABLE {table} DROP COLUMN IF EXISTS search_vector')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0018_sync_updated_at_tombstones"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, drop_search_index),
+    ]
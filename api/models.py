@@ -1,8 +1,14 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import F, Q
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 
+from .ledger import LEDGER_FIELDS
+from .weekdays import format_days, parse_days
+
 class User(AbstractUser):
     class Role(models.TextChoices):
         COUNSELOR = 'COUNSELOR', _('Counselor')
@@ -13,6 +19,23 @@ class User(AbstractUser):
 
     role = models.CharField(max_length=20, choices=Role.choices, default=Role.COUNSELOR)
     phone = models.CharField(max_length=15, blank=True, null=True)
+    # Embedded in issued JWTs; bumping it revokes them (api.authentication)
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+    # Delta sync cursor column (api.sync), on every model
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        # token_version only moves forward through revoke_tokens(); a stale
+        # instance must not write an older version back and revive tokens.
+        if not self._state.adding:
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and field.name != 'token_version'
+                ]
+            kwargs['update_fields'] = [name for name in update_fields if name != 'token_version']
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.username} ({self.role})"
@@ -27,8 +50,9 @@ class Inquiry(models.Model):
     passout_year = models.IntegerField()
     interested_course = models.CharField(max_length=100)
     source = models.CharField(max_length=100)
-    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='inquiries')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='inquiries', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     # Sales & Follow-up Fields
     LEAD_STATUS_CHOICES = [
@@ -42,19 +66,35 @@ class Inquiry(models.Model):
     fees_told = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     next_followup_date = models.DateField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Keyset list order, for everyone and for a counselor's own leads
+            models.Index(fields=['-created_at', '-id'], name='inquiry_recent_idx'),
+            models.Index(fields=['created_by', '-created_at', '-id'], name='inquiry_owner_recent_idx'),
+            # Follow-up queue; enrolled leads never need a follow-up
+            models.Index(
+                fields=['next_followup_date'], condition=~Q(lead_status='ENROLLED'), name='inquiry_open_followup_idx'
+            ),
+        ]
+
     def __str__(self):
         return f"{self.name} - {self.interested_course}"
 
 class InquiryFollowup(models.Model):
-    inquiry = models.ForeignKey(Inquiry, on_delete=models.CASCADE, related_name='followups')
-    date = models.DateField(default=timezone.now)
+    inquiry = models.ForeignKey(Inquiry, on_delete=models.CASCADE, related_name='followups', db_index=False)
+    # localdate, not now: a datetime default breaks rendering and is the UTC day
+    date = models.DateField(default=timezone.localdate)
     status = models.CharField(max_length=50, blank=True, null=True, help_text="Status at time of follow-up e.g. HOT/WARM")
     remark = models.TextField()
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ['-date', '-created_at']
+        indexes = [
+            models.Index(fields=['inquiry', '-date', '-created_at'], name='followup_inquiry_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.inquiry.name} - {self.date}"
@@ -62,7 +102,7 @@ class InquiryFollowup(models.Model):
 class Batch(models.Model):
     course = models.CharField(max_length=100)
     batch_name = models.CharField(max_length=100)
-    trainer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, limit_choices_to={'role': User.Role.TRAINER}, related_name='batches')
+    trainer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, limit_choices_to={'role': User.Role.TRAINER}, related_name='batches', db_index=False)
     start_date = models.DateField()
     
     # Schedule & Location
@@ -70,6 +110,8 @@ class Batch(models.Model):
     start_time = models.TimeField(null=True, blank=True)
     end_time = models.TimeField(null=True, blank=True)
     days_of_week = models.CharField(max_length=50, blank=True, null=True, help_text="Comma-separated days e.g. Mon,Tue,Wed")
+    # Derived from days_of_week on save (see api.weekdays); queried for "runs on"
+    days_mask = models.PositiveSmallIntegerField(default=0, db_index=True, editable=False)
 
     # Zoom Details
     zoom_host_account = models.CharField(max_length=100, blank=True, null=True)
@@ -77,6 +119,23 @@ class Batch(models.Model):
     zoom_meeting_id = models.CharField(max_length=50, blank=True, null=True)
     zoom_meeting_passcode = models.CharField(max_length=50, blank=True, null=True)
     zoom_link = models.URLField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Double-booking checks (api.scheduling); the trainer index also serves trainer_id lookups
+            models.Index(fields=['trainer', 'start_time'], name='batch_trainer_time_idx'),
+            models.Index(fields=['classroom_name', 'start_time'], name='batch_room_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.days_mask = parse_days(self.days_of_week, strict=False)
+        if self.days_mask:
+            self.days_of_week = format_days(self.days_mask)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'days_of_week' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'days_mask', 'updated_at'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.batch_name
@@ -119,16 +178,49 @@ class Student(models.Model):
     email = models.EmailField()
     course = models.CharField(max_length=100, choices=COURSE_CHOICES)
     total_fees = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
-    batch = models.ForeignKey(Batch, on_delete=models.SET_NULL, null=True, blank=True, related_name='students')
-    enrollment_date = models.DateField(default=timezone.now)
+    batch = models.ForeignKey(Batch, on_delete=models.SET_NULL, null=True, blank=True, related_name='students', db_index=False)
+    # localdate, not now: a datetime default breaks rendering and is the UTC day
+    enrollment_date = models.DateField(default=timezone.localdate)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='ACTIVE')
 
+    # Fee ledger, maintained from Fee writes by api.ledger; never edited directly
+    amount_paid = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False)
+    balance_due = models.DecimalField(max_digits=10, decimal_places=2, default=0, editable=False, db_index=True)
+    last_payment_at = models.DateTimeField(null=True, blank=True, editable=False, db_index=True)
+    payment_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['batch', 'status'], name='student_batch_status_idx'),
+            models.Index(fields=['-enrollment_date'], name='student_enrollment_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.mobile and self.inquiry:
             self.mobile = self.inquiry.mobile
         if not self.email and self.inquiry:
             self.email = self.inquiry.email
-        super().save(*args, **kwargs)
+        if self._state.adding:
+            self.balance_due = Decimal(self.total_fees or 0) - Decimal(self.amount_paid or 0)
+            super().save(*args, **kwargs)
+            return
+
+        # The ledger columns may have moved since this instance was loaded, so
+        # leave them to the database and only re-derive the balance there.
+        update_fields = kwargs.pop('update_fields', None)
+        if update_fields is None:
+            update_fields = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in LEDGER_FIELDS
+            ]
+        update_fields = [name for name in update_fields if name not in LEDGER_FIELDS]
+        super().save(*args, update_fields=update_fields, **kwargs)
+        if 'total_fees' in update_fields:
+            Student.objects.filter(pk=self.pk).update(
+                balance_due=F('total_fees') - F('amount_paid'), updated_at=timezone.now(),
+            )
+            self.refresh_from_db(fields=LEDGER_FIELDS)
 
     def __str__(self):
         return f"{self.inquiry.name} ({self.mobile})"
@@ -148,6 +240,12 @@ class Fee(models.Model):
     utr = models.CharField(max_length=100, blank=True, null=True)
     date_collected = models.DateTimeField(auto_now_add=True)
     collected_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='collected_fees')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date_collected', '-id'], name='fee_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.inquiry.name} - {self.amount}"
@@ -167,9 +265,14 @@ class Attendance(models.Model):
     topic_taught = models.CharField(max_length=255, blank=True, null=True)
     remarks = models.TextField(blank=True, null=True)
     trainer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='marked_attendance')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ('student', 'date')
+        indexes = [
+            models.Index(fields=['batch', '-date'], name='attendance_batch_date_idx'),
+            models.Index(fields=['-date', '-id'], name='attendance_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.inquiry.name} - {self.date} - {self.status}"
@@ -189,6 +292,49 @@ class PlacementOutreach(models.Model):
     phone_email = models.CharField(max_length=255) # Can be phone or email
     remark = models.TextField(blank=True, null=True)
     date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='outreach_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.company_name} - {self.mode}"
+
+class DailyMetrics(models.Model):
+    """One row per day of dashboard counters, kept current by api.signals."""
+    date = models.DateField(unique=True)
+    inquiries = models.PositiveIntegerField(default=0)
+    admissions = models.PositiveIntegerField(default=0)
+    outreach = models.PositiveIntegerField(default=0)
+    fee_count = models.PositiveIntegerField(default=0)
+    fees_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    fees_cash = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    fees_upi = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    fees_neft = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    fees_rtgs = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    fees_cheque = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name_plural = 'Daily metrics'
+
+    def __str__(self):
+        return f"Metrics for {self.date}"
+
+class Tombstone(models.Model):
+    """A deleted row of a synced model, reported to ``?changed_since=`` clients (api.sync)."""
+    model = models.CharField(max_length=100)  # app_label.modelname
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'id'], name='tombstone_model_deleted_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted {self.deleted_at}"
@@ -0,0 +1,158 @@
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on every ordering column, not just the first.
+
+    DRF's CursorPagination filters on the leading column and falls back to an
+    offset for ties, which degrades to OFFSET paging on columns such as
+    Attendance.date. Here the cursor carries the full (key, id) tuple, so each
+    page is a single index range scan and rows inserted while a client is
+    paging never shift or duplicate results. The last ordering column must be
+    unique.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-id',)
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+
+        self.count = None
+        if self.get_include_count(request):
+            self.count = queryset.count()
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+        ordering = self._reversed(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(queryset.model, ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_include_count(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return getattr(settings, 'PAGINATION_INCLUDE_COUNT', False)
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.cursor.position))
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.cursor.position))
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload['count'] = self.count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count'] = {'type': 'integer', 'example': 123}
+        return response_schema
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            # A values() row from the fast list path (api.values)
+            instance = self.model(**{order.lstrip('-'): instance[order.lstrip('-')] for order in ordering})
+        values = []
+        for order in ordering:
+            field = instance._meta.get_field(order.lstrip('-'))
+            values.append(field.value_to_string(instance))
+        return json.dumps(values, separators=(',', ':'))
+
+    def _seek(self, model, ordering, position):
+        try:
+            raw_values = json.loads(position)
+            if not isinstance(raw_values, list) or len(raw_values) != len(ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(order.lstrip('-')).to_python(raw)
+                for order, raw in zip(ordering, raw_values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+        # (a, b) < (x, y)  <=>  a < x OR (a = x AND b < y), per column direction.
+        condition = Q()
+        equal = {}
+        for order, value in zip(ordering, values):
+            name = order.lstrip('-')
+            lookup = '__lt' if order.startswith('-') else '__gt'
+            condition |= Q(**equal, **{name + lookup: value})
+            equal[name] = value
+        return condition
+
+    @staticmethod
+    def _reversed(ordering):
+        return tuple(order[1:] if order.startswith('-') else '-' + order for order in ordering)
+
+
+class InquiryPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class FeePagination(KeysetPagination):
+    ordering = ('-date_collected', '-id')
+
+
+class AttendancePagination(KeysetPagination):
+    ordering = ('-date', '-id')
+
+
+class PlacementOutreachPagination(KeysetPagination):
+    ordering = ('-date', '-id')
+
+
+class ReferenceDataPagination(KeysetPagination):
+    """Users and batches feed form dropdowns, so pages are larger and stable by id."""
+    page_size = 200
+    max_page_size = 1000
+    ordering = ('id',)
@@ -0,0 +1,80 @@
+"""
+Per-request profile: every statement run on any connection (through
+``connection.execute_wrapper``) and named timings such as serializer time.
+RequestProfilingMiddleware (api.middleware) creates one for each sampled
+request and reports it as a Server-Timing header and slow-request log.
+"""
+import contextlib
+import contextvars
+import re
+import time
+from collections import Counter, defaultdict
+
+current = contextvars.ContextVar('request_profile', default=None)
+
+# IN (%s, %s, %s) -> IN (...), so lookups of different sizes share a shape
+PLACEHOLDER_LIST = re.compile(r'\((?:%s, )*%s\)')
+
+
+def query_shape(sql):
+    return PLACEHOLDER_LIST.sub('(...)', sql)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.view_start = self.view_end = self.end = None
+        self.queries = []  # (ms, sql) in execution order; sql has placeholders, not values
+        self.timings = defaultdict(float)  # name -> ms
+        self.active = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(((time.perf_counter() - start) * 1000, sql))
+
+    @property
+    def total_ms(self):
+        return ((self.end or time.perf_counter()) - self.start) * 1000
+
+    @property
+    def db_ms(self):
+        return sum(ms for ms, _ in self.queries)
+
+    def slowest(self, limit):
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:limit]
+
+    def repeated_shapes(self, threshold):
+        """(count, shape) for statements run ``threshold`` or more times: probable N+1 lookups."""
+        shapes = Counter(query_shape(sql) for _, sql in self.queries if not sql.startswith(('SAVEPOINT', 'RELEASE')))
+        return [(count, shape) for shape, count in shapes.most_common() if count >= threshold]
+
+    def server_timing(self):
+        metrics = [('db', self.db_ms, f'{len(self.queries)} queries')]
+        metrics += [(name, ms, None) for name, ms in self.timings.items()]
+        if self.view_start is not None:
+            metrics.append(('view', ((self.view_end or self.end) - self.view_start) * 1000, None))
+            if self.view_end is not None:
+                metrics.append(('render', (self.end - self.view_end) * 1000, None))
+        metrics.append(('total', self.total_ms, None))
+        return ', '.join(
+            f'{name};dur={ms:.1f}' + (f';desc="{desc}"' if desc else '') for name, ms, desc in metrics
+        )
+
+
+@contextlib.contextmanager
+def measure(name):
+    """Add the time spent in the block to the current request's ``name`` timing; nested uses count once."""
+    profile = current.get()
+    if profile is None or name in profile.active:
+        yield
+        return
+    profile.active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.timings[name] += (time.perf_counter() - start) * 1000
+        profile.active.discard(name)
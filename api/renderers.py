@@ -0,0 +1,26 @@
+"""
+JSON rendering with orjson, which builds the document in C instead of
+walking it with the json module. Output is byte-for-byte what DRF's
+JSONRenderer writes with the default settings (compact, UTF-8, U+2028 and
+U+2029 escaped, aware UTC datetimes ending in ``Z``); types orjson does not
+know, such as Decimal and lazy strings, go through DRF's encoder.
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+encode_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            # Pretty-printed (e.g. the browsable API) or ASCII-only output is rare; json does it.
+            return super().render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=encode_default, option=self.options)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,90 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+from . import events
+
+COUNTER_FIELDS = ('inquiries', 'admissions', 'outreach', 'fee_count')
+AMOUNT_FIELDS = ('fees_total', 'fees_cash', 'fees_upi', 'fees_neft', 'fees_rtgs', 'fees_cheque')
+
+
+def local_date(value):
+    if hasattr(value, 'hour'):
+        return timezone.localdate(value)
+    return value
+
+
+def fee_mode_field(mode):
+    return f'fees_{mode.lower()}'
+
+
+def added(model, field, delta):
+    if delta >= 0:
+        return F(field) + delta
+    # Rows the rollup never counted (bulk_create, loaddata, raw SQL) can still be deleted;
+    # stop at zero rather than fail the delete, and leave rebuild_daily_metrics to fix the totals.
+    return Greatest(F(field) + delta, 0, output_field=model._meta.get_field(field))
+
+
+def apply_delta(day, **deltas):
+    """Add the given deltas to the DailyMetrics row for ``day``, creating it if needed."""
+    from .models import DailyMetrics
+
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        DailyMetrics.objects.get_or_create(date=day)
+        DailyMetrics.objects.filter(date=day).update(
+            **{field: added(DailyMetrics, field, delta) for field, delta in deltas.items()}, updated_at=timezone.now(),
+        )
+    # Dashboards add these to their totals (and today's figures, for today) instead of refetching
+    events.publish('counters', {'date': day, **deltas})
+
+
+def fee_deltas(amount, mode, sign=1):
+    amount = Decimal(amount) * sign
+    return {'fee_count': sign, 'fees_total': amount, fee_mode_field(mode): amount}
+
+
+def compute_daily_rows(Inquiry, Student, Fee, PlacementOutreach):
+    """
+    Recompute every day's counters from the fact tables with one grouped query
+    per table. Models are passed in so migrations can use historical models.
+    """
+    rows = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS + AMOUNT_FIELDS, 0))
+
+    for row in Inquiry.objects.annotate(day=TruncDate('created_at')).values('day').annotate(n=Count('id')):
+        rows[row['day']]['inquiries'] = row['n']
+
+    for row in Student.objects.values('enrollment_date').annotate(n=Count('id')):
+        rows[row['enrollment_date']]['admissions'] = row['n']
+
+    for row in PlacementOutreach.objects.annotate(day=TruncDate('date')).values('day').annotate(n=Count('id')):
+        rows[row['day']]['outreach'] = row['n']
+
+    fees = Fee.objects.annotate(day=TruncDate('date_collected')).values('day', 'mode').annotate(
+        n=Count('id'), total=Sum('amount')
+    )
+    for row in fees:
+        day = rows[row['day']]
+        day['fee_count'] += row['n']
+        day['fees_total'] += row['total']
+        day[fee_mode_field(row['mode'])] += row['total']
+
+    return rows
+
+
+def rebuild_daily_metrics(DailyMetrics, Inquiry, Student, Fee, PlacementOutreach):
+    rows = compute_daily_rows(Inquiry, Student, Fee, PlacementOutreach)
+    with transaction.atomic():
+        DailyMetrics.objects.all().delete()
+        DailyMetrics.objects.bulk_create(
+            [DailyMetrics(date=day, **values) for day, values in sorted(rows.items())],
+            batch_size=1000,
+        )
+    return len(rows)
@@ -0,0 +1,85 @@
+"""
+Read replica routing. When settings.READ_REPLICA names a database, safe reads
+that tolerate a little replication lag (list/retrieve and export actions,
+the dashboard, admin changelists) are sent there; every other read and every
+write uses the primary.
+
+Users read their own writes: after a write request a user is pinned to the
+primary for REPLICA_PIN_SECONDS. Cached responses built from the replica are
+not stored while one of their models was written within that window, so a
+lagging replica cannot outlive it in the response cache. Pins and write
+markers live in the default cache, so it must be shared by every worker
+(system check api.W001).
+"""
+import contextvars
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+PRIMARY = 'default'
+PIN_KEY = 'api:replica:pin:{}'
+WRITTEN_KEY = 'api:replica:written:{}'
+
+current = contextvars.ContextVar('request_routing', default=None)
+
+
+class RequestRouting:
+    """Routing state of one request, installed by ReplicaRoutingMiddleware."""
+
+    def __init__(self):
+        self.replica = False
+
+
+def read_from_replica(request):
+    """Send the rest of this request's reads to the replica, unless its user wrote recently."""
+    routing = current.get()
+    if routing is None or not settings.READ_REPLICA or request.method not in SAFE_METHODS:
+        return False
+    user_id = getattr(request.user, 'pk', None)
+    if user_id is not None and cache.get(PIN_KEY.format(user_id)):
+        return False
+    routing.replica = True
+    return True
+
+
+def pin_to_primary(user_id):
+    cache.set(PIN_KEY.format(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def note_write(model):
+    if settings.READ_REPLICA:
+        cache.set(WRITTEN_KEY.format(model._meta.label_lower), True, settings.REPLICA_PIN_SECONDS)
+
+
+def may_be_stale(models):
+    """Whether this request read from the replica while it may still lag a write to ``models``."""
+    routing = current.get()
+    if routing is None or not routing.replica:
+        return False
+    return bool(cache.get_many([WRITTEN_KEY.format(model._meta.label_lower) for model in models]))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = current.get()
+        if routing is not None and routing.replica and settings.READ_REPLICA:
+            return settings.READ_REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        # Never fall back to the instance's database: rows read from the replica are saved to the primary.
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaReadsMixin:
+    """Serve ``replica_actions`` from the read replica, when one is configured."""
+    replica_actions = ('list', 'retrieve', 'export')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.replica_actions:
+            read_from_replica(request)
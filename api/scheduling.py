@@ -0,0 +1,116 @@
+"""
+Batch scheduling conflicts: two batches conflict when they share a trainer or
+a classroom, run on a common weekday and their times overlap. Times are
+half-open, so a 10:00-11:00 batch and an 11:00-12:00 batch do not conflict.
+
+Single checks (BatchSerializer) are range scans on the (trainer, start_time)
+and (classroom_name, start_time) indexes rather than an interval-tree lookup;
+see find_conflicts for the cost. The full report sweeps each resource's
+weekday timeline once, in O(n log n + conflicts).
+"""
+import heapq
+from collections import defaultdict
+
+from .models import Batch
+from .weekdays import WEEKDAYS, format_days, masks_including, parse_days
+
+# Fields a batch books; the value identifies the resource.
+RESOURCES = ('trainer_id', 'classroom_name')
+SCHEDULE_FIELDS = ('id', 'batch_name', 'trainer_id', 'classroom_name', 'start_time', 'end_time', 'days_mask')
+
+
+def running_on(queryset, day):
+    """Batches in ``queryset`` that have started by ``day`` and meet on its weekday."""
+    return queryset.filter(days_mask__in=masks_including(day.weekday()), start_date__lte=day)
+
+
+def find_conflicts(schedule, exclude_pk=None):
+    """
+    Batches clashing with ``schedule`` (a dict of the SCHEDULE_FIELDS, with
+    days_of_week text in place of days_mask), as {resource field: [batch values, ...]}.
+
+    This is not an O(log n + conflicts) interval lookup. An interval tree
+    would live in one process and go stale across workers, so each resource
+    is a range scan on its (resource, start_time) index instead. The seek is
+    O(log n). The scan then reads every batch of that trainer or classroom
+    that starts before ``end``, filtering end_time and weekdays per row. So a
+    check costs O(log n + k), where k is that one resource's batch count, not
+    the table size.
+    """
+    mask = parse_days(schedule.get('days_of_week'), strict=False)
+    start, end = schedule.get('start_time'), schedule.get('end_time')
+    if not (mask and start and end):
+        return {}
+
+    conflicts = {}
+    for field in RESOURCES:
+        value = schedule.get(field)
+        if not value:
+            continue
+        candidates = (
+            Batch.objects.filter(**{field: value}, start_time__lt=end, end_time__gt=start)
+            .exclude(pk=exclude_pk)
+            .order_by('start_time')
+            .values(*SCHEDULE_FIELDS)
+        )
+        clashes = [batch for batch in candidates if batch['days_mask'] & mask]
+        if clashes:
+            conflicts[field] = clashes
+    return conflicts
+
+
+def sweep_conflicts(batches):
+    """
+    Every clashing pair among ``batches`` (dicts of the SCHEDULE_FIELDS), as
+    {(resource field, value, first id, second id): weekday mask}.
+    """
+    timelines = defaultdict(list)
+    for batch in batches:
+        mask = batch['days_mask']
+        start, end = batch['start_time'], batch['end_time']
+        if not (mask and start and end and start < end):
+            continue
+        for field in RESOURCES:
+            if batch[field]:
+                for day in range(len(WEEKDAYS)):
+                    if mask & 1 << day:
+                        timelines[field, batch[field], day].append((start, end, batch['id']))
+
+    pairs = defaultdict(int)
+    for (field, value, day), intervals in timelines.items():
+        intervals.sort()
+        running = []  # heap of (end, id) for batches still in session
+        for start, end, batch_id in intervals:
+            while running and running[0][0] <= start:
+                heapq.heappop(running)
+            for _, other_id in running:
+                pairs[(field, value) + tuple(sorted((other_id, batch_id)))] |= 1 << day
+            heapq.heappush(running, (end, batch_id))
+    return pairs
+
+
+def schedule_conflicts(queryset=None):
+    """The conflict report for ``queryset`` (all batches by default), one entry per clashing pair."""
+    queryset = Batch.objects.all() if queryset is None else queryset
+    batches = {
+        batch['id']: batch
+        for batch in queryset.filter(start_time__isnull=False, end_time__isnull=False, days_mask__gt=0)
+        .order_by().values(*SCHEDULE_FIELDS, 'days_of_week', 'trainer__username')
+    }
+    report = []
+    for (field, value, first, second), mask in sorted(sweep_conflicts(batches.values()).items()):
+        a, b = batches[first], batches[second]
+        report.append({
+            'resource': 'trainer' if field == 'trainer_id' else 'classroom',
+            'trainer': value if field == 'trainer_id' else None,
+            'trainer_name': a['trainer__username'] if field == 'trainer_id' else None,
+            'classroom_name': value if field == 'classroom_name' else None,
+            'days': format_days(mask),
+            'start_time': max(a['start_time'], b['start_time']),
+            'end_time': min(a['end_time'], b['end_time']),
+            'batches': [
+                {key: batch[key] for key in ('id', 'batch_name', 'start_time', 'end_time', 'days_of_week')}
+                for batch in (a, b)
+            ],
+        })
+    return report
@@ -0,0 +1,209 @@
+"""
+Indexed search over inquiries, students and placement outreach.
+
+PostgreSQL keeps a generated ``search_vector`` column plus trigram GIN
+indexes; SQLite keeps FTS5 shadow tables in sync with triggers. Both are
+created by migration 0019_search_index. Other databases fall back to
+icontains. Digits also match anywhere in a mobile number, since the
+full-text indexes only match from the start of a token.
+"""
+import re
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connections, router
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+KINDS = ('inquiry', 'student', 'outreach')
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKENS = 8
+
+
+def tokenize(query):
+    return TOKEN_RE.findall((query or '').lower())[:MAX_TOKENS]
+
+
+def mobile_digits(kind, tokens):
+    """The digits to look for anywhere in a mobile number, or '' if ``kind`` has none."""
+    if kind not in ('inquiry', 'student'):
+        return ''
+    return ''.join(token for token in tokens if token.isdigit())
+
+
+class LikeSearchBackend:
+    fields = {
+        'inquiry': ('name', 'mobile', 'email', 'college'),
+        'student': ('mobile', 'inquiry__name'),
+        'outreach': ('company_name', 'contact_name'),
+    }
+
+    def rebuild(self, connection):
+        pass
+
+    def filter(self, queryset, kind, tokens):
+        for token in tokens:
+            condition = Q()
+            for field in self.fields[kind]:
+                condition |= Q(**{field + '__icontains': token})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def rank(self, kind, tokens):
+        return Value(0.0, output_field=FloatField())
+
+    def ranked(self, queryset, kind, tokens, fields, limit):
+        queryset = self.filter(queryset, kind, tokens).annotate(search_rank=self.rank(kind, tokens))
+        return list(queryset.order_by('-search_rank', '-id').values(*fields, 'search_rank')[:limit])
+
+
+class SQLiteSearchBackend(LikeSearchBackend):
+    tables = {
+        'inquiry': 'api_inquiry_fts',
+        'student': 'api_student_fts',
+        'outreach': 'api_placementoutreach_fts',
+    }
+
+    def rebuild(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO api_inquiry_fts(api_inquiry_fts) VALUES ('rebuild')")
+            cursor.execute("INSERT INTO api_placementoutreach_fts(api_placementoutreach_fts) VALUES ('rebuild')")
+            cursor.execute("DELETE FROM api_student_fts")
+            cursor.execute(
+                "INSERT INTO api_student_fts(rowid, name, mobile) "
+                "SELECT s.id, i.name, s.mobile FROM api_student s JOIN api_inquiry i ON i.id = s.inquiry_id"
+            )
+
+    def match_expression(self, tokens):
+        # Tokens are \w+ only, so quoting cannot be broken out of.
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    def filter(self, queryset, kind, tokens):
+        table = self.tables[kind]
+        condition = Q(id__in=RawSQL(
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [self.match_expression(tokens)]
+        ))
+        digits = mobile_digits(kind, tokens)
+        if digits:
+            condition |= Q(mobile__contains=digits)
+        return queryset.filter(condition)
+
+    def ranked(self, queryset, kind, tokens, fields, limit):
+        # bm25() is only available inside the MATCH query, so the caller's scoping goes into it as
+        # a rowid subquery: one FTS pass that returns at most ``limit`` ranked, in-scope hits.
+        table = self.tables[kind]
+        try:
+            scope, scope_params = queryset.order_by().values('id').query.get_compiler(queryset.db).as_sql()
+        except EmptyResultSet:
+            return []
+        with connections[queryset.db].cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, -rank FROM {table} WHERE {table} MATCH %s AND rowid IN ({scope}) '
+                f'ORDER BY rank LIMIT %s',
+                [self.match_expression(tokens), *scope_params, limit],
+            )
+            hits = cursor.fetchall()
+        found = {row['id']: row for row in queryset.filter(id__in=[pk for pk, _ in hits]).values(*fields)}
+        rows = [{**found[pk], 'search_rank': rank} for pk, rank in hits if pk in found]
+
+        digits = mobile_digits(kind, tokens)
+        if digits and len(rows) < limit:
+            # Mid-number mobile matches the FTS prefix search cannot find rank below every hit.
+            extra = queryset.filter(mobile__contains=digits).exclude(id__in=[row['id'] for row in rows])
+            rows.extend(
+                {**row, 'search_rank': 0.0}
+                for row in extra.order_by('-id').values(*fields)[:limit - len(rows)]
+            )
+        return rows
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    vectors = {
+        'api_inquiry': (
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(mobile, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(email, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(college, '')), 'C')"
+        ),
+        'api_placementoutreach': (
+            "setweight(to_tsvector('simple', coalesce(company_name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(contact_name, '')), 'B')"
+        ),
+    }
+    trigram_columns = [
+        ('api_inquiry', 'name'),
+        ('api_inquiry', 'mobile'),
+        ('api_student', 'mobile'),
+        ('api_placementoutreach', 'company_name'),
+        ('api_placementoutreach', 'contact_name'),
+    ]
+    matches = {
+        'inquiry': (
+            "SELECT id FROM api_inquiry WHERE search_vector @@ to_tsquery('simple', %s) OR name %% %s",
+            'ts_rank(api_inquiry.search_vector, to_tsquery(\'simple\', %s)) + similarity(api_inquiry.name, %s)',
+        ),
+        'outreach': (
+            "SELECT id FROM api_placementoutreach "
+            "WHERE search_vector @@ to_tsquery('simple', %s) OR company_name %% %s",
+            'ts_rank(api_placementoutreach.search_vector, to_tsquery(\'simple\', %s)) '
+            '+ similarity(api_placementoutreach.company_name, %s)',
+        ),
+        'student': (
+            "SELECT s.id FROM api_student s JOIN api_inquiry i ON i.id = s.inquiry_id "
+            "WHERE i.search_vector @@ to_tsquery('simple', %s) OR i.name %% %s",
+            "SELECT ts_rank(i.search_vector, to_tsquery('simple', %s)) + similarity(i.name, %s) "
+            "FROM api_inquiry i WHERE i.id = api_student.inquiry_id",
+        ),
+    }
+
+    def tsquery(self, kind, tokens):
+        # Students match on name and mobile only, which carry weight A in the inquiry vector.
+        weight = 'A' if kind == 'student' else ''
+        return ' & '.join(f'{token}:*{weight}' for token in tokens)
+
+    def filter(self, queryset, kind, tokens):
+        sql, _ = self.matches[kind]
+        condition = Q(id__in=RawSQL(sql, [self.tsquery(kind, tokens), ' '.join(tokens)]))
+        digits = mobile_digits(kind, tokens)
+        if digits:
+            # Partial mobile numbers are substring matches served by the trigram index.
+            condition |= Q(mobile__contains=digits)
+        return queryset.filter(condition)
+
+    def rank(self, kind, tokens):
+        _, sql = self.matches[kind]
+        return RawSQL(sql, [self.tsquery(kind, tokens), ' '.join(tokens)], output_field=FloatField())
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend(),
+    'postgresql': PostgresSearchBackend(),
+}
+
+
+def get_backend(model=None):
+    alias = router.db_for_read(model) if model is not None else 'default'
+    return BACKENDS.get(connections[alias].vendor, LikeSearchBackend())
+
+
+def search_filter(queryset, kind, query):
+    """Restrict ``queryset`` to rows matching ``query`` without ranking."""
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset.none()
+    return get_backend(queryset.model).filter(queryset, kind, tokens)
+
+
+def search(queryset, kind, query, fields, limit=10):
+    """
+    Return up to ``limit`` rows of ``queryset`` matching ``query`` as dicts of
+    ``fields`` (which must include ``id``) plus ``search_rank``, best matches first.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    return get_backend(queryset.model).ranked(queryset, kind, tokens, fields, limit)
+
+
+def rebuild(using='default'):
+    connection = connections[using]
+    BACKENDS.get(connection.vendor, LikeSearchBackend()).rebuild(connection)
@@ -1,7 +1,11 @@
+from django.db.models import Exists, OuterRef
 from rest_framework import serializers
 from .models import User, Inquiry, InquiryFollowup, Batch, Student, Fee, Attendance, PlacementOutreach
+from .scheduling import find_conflicts
+from .shaping import ShapedSerializerMixin
+from .weekdays import format_days, parse_days
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
 
     class Meta:
@@ -15,21 +19,27 @@ class UserSerializer(serializers.ModelSerializer):
         user.save()
         return user
 
-class InquiryFollowupSerializer(serializers.ModelSerializer):
+class InquiryFollowupSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     created_by_name = serializers.ReadOnlyField(source='created_by.username')
 
     class Meta:
         model = InquiryFollowup
         fields = '__all__'
-        read_only_fields = ['created_by']
+        # add_followup takes the inquiry from the URL
+        read_only_fields = ['inquiry', 'created_by']
 
-class InquirySerializer(serializers.ModelSerializer):
+class InquirySerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     created_by_name = serializers.ReadOnlyField(source='created_by.username')
     is_admitted = serializers.SerializerMethodField()
     followups = InquiryFollowupSerializer(many=True, read_only=True)
 
     created_by = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
 
+    expandable_fields = ('followups',)
+    shape_sources = {'is_admitted': ['student_profile.id']}
+    # SQL for method fields, used by the values() list path (api.values)
+    value_expressions = {'is_admitted': Exists(Student.objects.filter(inquiry=OuterRef('pk')))}
+
     class Meta:
         model = Inquiry
         fields = '__all__'
@@ -38,7 +48,7 @@ class InquirySerializer(serializers.ModelSerializer):
     def get_is_admitted(self, obj):
         return hasattr(obj, 'student_profile')
 
-class BatchSerializer(serializers.ModelSerializer):
+class BatchSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     trainer_name = serializers.ReadOnlyField(source='trainer.username')
     course_name = serializers.ReadOnlyField(source='course')
 
@@ -46,7 +56,36 @@ class BatchSerializer(serializers.ModelSerializer):
         model = Batch
         fields = '__all__'
 
-class FeeSerializer(serializers.ModelSerializer):
+    def validate_days_of_week(self, value):
+        try:
+            parse_days(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(f'Unknown day "{exc}". Use e.g. Mon,Wed,Fri or Mon-Fri.')
+        return value
+
+    def validate(self, attrs):
+        schedule = {
+            field: attrs[field] if field in attrs else getattr(self.instance, field, None)
+            for field in ('trainer', 'classroom_name', 'start_time', 'end_time', 'days_of_week')
+        }
+        if schedule['start_time'] and schedule['end_time'] and schedule['start_time'] >= schedule['end_time']:
+            raise serializers.ValidationError({'end_time': 'End time must be after the start time.'})
+
+        trainer = schedule.pop('trainer')
+        schedule['trainer_id'] = trainer.pk if trainer else None
+        conflicts = find_conflicts(schedule, exclude_pk=getattr(self.instance, 'pk', None))
+        if conflicts:
+            raise serializers.ValidationError({
+                'trainer' if field == 'trainer_id' else field: [
+                    f'Already booked by {batch["batch_name"]} '
+                    f'({format_days(batch["days_mask"])} {batch["start_time"]:%H:%M}-{batch["end_time"]:%H:%M}).'
+                    for batch in batches
+                ]
+                for field, batches in conflicts.items()
+            })
+        return attrs
+
+class FeeSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     collected_by_name = serializers.ReadOnlyField(source='collected_by.username')
     student_name = serializers.ReadOnlyField(source='student.inquiry.name')
 
@@ -55,17 +94,19 @@ class FeeSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['collected_by', 'date_collected']
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     inquiry_details = InquirySerializer(source='inquiry', read_only=True)
     inquiry_name = serializers.ReadOnlyField(source='inquiry.name')
     batch_name = serializers.ReadOnlyField(source='batch.batch_name')
     fees = FeeSerializer(many=True, read_only=True)
 
+    expandable_fields = ('inquiry_details', 'fees')
+
     class Meta:
         model = Student
         fields = '__all__'
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     student_name = serializers.ReadOnlyField(source='student.inquiry.name')
     trainer_name = serializers.ReadOnlyField(source='trainer.username')
     batch_name = serializers.ReadOnlyField(source='batch.batch_name')
@@ -75,7 +116,38 @@ class AttendanceSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['trainer']
 
-class PlacementOutreachSerializer(serializers.ModelSerializer):
+class AttendanceEntrySerializer(serializers.Serializer):
+    student = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Attendance.STATUS_CHOICES)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+class BulkAttendanceSerializer(serializers.Serializer):
+    batch = serializers.PrimaryKeyRelatedField(queryset=Batch.objects.all())
+    date = serializers.DateField()
+    lecture_time = serializers.TimeField(required=False, allow_null=True)
+    topic_taught = serializers.CharField(max_length=255, required=False, allow_blank=True, allow_null=True)
+    remarks = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    records = AttendanceEntrySerializer(many=True, allow_empty=False)
+
+    def validate(self, attrs):
+        # One query for the whole roster instead of a lookup per row
+        roster = set(attrs['batch'].students.values_list('id', flat=True))
+        seen = set()
+        errors = []
+        for record in attrs['records']:
+            student = record['student']
+            if student not in roster:
+                errors.append({'student': [f'Student {student} is not enrolled in this batch.']})
+            elif student in seen:
+                errors.append({'student': [f'Student {student} appears more than once.']})
+            else:
+                errors.append({})
+            seen.add(student)
+        if any(errors):
+            raise serializers.ValidationError({'records': errors})
+        return attrs
+
+class PlacementOutreachSerializer(ShapedSerializerMixin, serializers.ModelSerializer):
     officer_name = serializers.ReadOnlyField(source='officer.username')
 
     class Meta:
@@ -0,0 +1,162 @@
+"""
+Sparse fieldsets (``?fields=``), opt-in expansion (``?expand=``) and the
+matching queryset: select_related, Prefetch and only() are derived from the
+serializer fields that will actually be rendered, so dropping a relation from
+the response also drops its join or prefetch query.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+from .profiling import measure
+from .sync import CURSOR_PARAM
+
+
+def split_param(value):
+    return {item.strip() for item in (value or '').split(',') if item.strip()}
+
+
+class ShapedSerializerMixin:
+    # Nested relations left out of list responses unless named in ?expand=
+    expandable_fields = ()
+    # Model paths read by fields whose source is '*', e.g. SerializerMethodFields
+    shape_sources = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        expand, list_mode, only = self.get_shape_params()
+        top_level_expand = {name.split('.', 1)[0] for name in expand}
+
+        if list_mode:
+            for name in self.expandable_fields:
+                if name not in top_level_expand:
+                    fields.pop(name, None)
+        if only:
+            for name in list(fields):
+                if name not in only and name not in top_level_expand:
+                    fields.pop(name)
+
+        for name, field in fields.items():
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if isinstance(nested, ShapedSerializerMixin):
+                nested._shape_params = (
+                    {item.split('.', 1)[1] for item in expand if item.startswith(name + '.')},
+                    list_mode,
+                    None,
+                )
+        return fields
+
+    def get_shape_params(self):
+        """Return (expand, list_mode, only) for this serializer."""
+        if hasattr(self, '_shape_params'):
+            return self._shape_params
+        request = self.context.get('request')
+        view = self.context.get('view')
+        if request is None:
+            return set(), False, None
+        only = None
+        if request.method in SAFE_METHODS and 'fields' in request.query_params:
+            only = split_param(request.query_params['fields'])
+        list_mode = getattr(view, 'action', None) == 'list'
+        return split_param(request.query_params.get('expand')), list_mode, only
+
+    def to_representation(self, instance):
+        with measure('serialize'):
+            return super().to_representation(instance)
+
+
+class Shape:
+    def __init__(self):
+        self.only = set()
+        self.select = set()
+        self.prefetch = {}
+        self.exact = True
+
+
+def resolve(model, path):
+    """Walk ``path`` from ``model``; return the final model field or None."""
+    field = None
+    for part in path:
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model
+    return field
+
+
+def collect_shape(serializer, shape, prefix=()):
+    model = serializer.Meta.model
+    for name, field in serializer.fields.items():
+        sources = serializer.shape_sources.get(name) if isinstance(serializer, ShapedSerializerMixin) else None
+        if sources is None:
+            if field.source == '*':
+                continue
+            sources = [field.source]
+
+        for source in sources:
+            path = tuple(source.split('.'))
+            if resolve(model, path) is None:
+                # A property or method we cannot see into; load every column.
+                shape.exact = False
+                continue
+            full = prefix + path
+
+            if isinstance(field, serializers.ListSerializer):
+                relation = resolve(model, path)
+                child = Shape()
+                collect_shape(field.child, child, ())
+                # Prefetching a reverse FK points each child back at its parent object,
+                # so whatever the child reads through that FK must be loaded on the parent.
+                remote = relation.field.name if relation.one_to_many else None
+                for attr in ('only', 'select'):
+                    for item in list(getattr(child, attr)):
+                        if remote and (item == remote or item.startswith(remote + '__')):
+                            getattr(child, attr).discard(item)
+                            rest = item[len(remote) + 2:]
+                            if rest:
+                                getattr(shape, attr).add('__'.join(prefix + path[:-1] + (rest,)))
+                                if attr == 'only' and '__' in rest:
+                                    shape.select.add('__'.join(prefix + path[:-1] + (rest.rsplit('__', 1)[0],)))
+                shape.prefetch['__'.join(full)] = (relation.related_model, child)
+            elif isinstance(field, serializers.BaseSerializer):
+                shape.select.add('__'.join(full))
+                collect_shape(field, shape, full)
+            else:
+                shape.only.add('__'.join(full))
+                if len(full) > 1:
+                    shape.select.add('__'.join(full[:-1]))
+
+
+def apply_shape(queryset, shape, restrict_columns=False, keep=()):
+    queryset = queryset.select_related(None)
+    if shape.select:
+        queryset = queryset.select_related(*shape.select)
+    for path, (model, child) in shape.prefetch.items():
+        queryset = queryset.prefetch_related(Prefetch(path, queryset=apply_shape(model._default_manager.all(), child)))
+    if restrict_columns and shape.exact:
+        queryset = queryset.only('pk', *shape.only, *keep)
+    return queryset
+
+
+def optimize_queryset(queryset, serializer, restrict_columns=False, keep=()):
+    """Eager-load exactly what ``serializer`` will render from ``queryset``."""
+    shape = Shape()
+    collect_shape(serializer, shape)
+    return apply_shape(queryset, shape, restrict_columns, keep)
+
+
+class ShapedQuerysetMixin:
+    """ViewSet mixin that fits get_queryset() results to the requested response shape."""
+
+    def shape_queryset(self, queryset):
+        request = self.request
+        restrict = request.method in SAFE_METHODS and 'fields' in request.query_params
+        keep = []
+        if restrict and self.pagination_class is not None:
+            # Keyset cursors read the ordering columns from each row.
+            keep = [order.lstrip('-') for order in self.pagination_class.ordering]
+        if restrict and CURSOR_PARAM in request.query_params:
+            keep.append('updated_at')
+        return optimize_queryset(queryset, self.get_serializer(), restrict, keep)
@@ -0,0 +1,299 @@
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import events, metrics
+from .authentication import REVOKING_FIELDS, revoke_tokens
+from .cache import invalidate
+from .models import User, Inquiry, InquiryFollowup, Batch, Student, Fee, Attendance, PlacementOutreach, Tombstone
+from .ledger import apply_payment
+from .rollups import apply_delta, fee_deltas, local_date
+from .sync import copied_field, touch, touch_copies
+
+
+# DailyMetrics rollups
+
+@receiver(post_save, sender=Inquiry)
+def inquiry_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        apply_delta(local_date(instance.created_at), inquiries=1)
+
+
+@receiver(post_delete, sender=Inquiry)
+def inquiry_deleted(sender, instance, **kwargs):
+    apply_delta(local_date(instance.created_at), inquiries=-1)
+
+
+@receiver(pre_save, sender=Student)
+def student_pre_save(sender, instance, raw=False, **kwargs):
+    instance._previous_enrollment_date = None
+    if instance.pk and not raw:
+        instance._previous_enrollment_date = (
+            Student.objects.filter(pk=instance.pk).values_list('enrollment_date', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Student)
+def student_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    day = local_date(instance.enrollment_date)
+    previous = getattr(instance, '_previous_enrollment_date', None)
+    if created:
+        apply_delta(day, admissions=1)
+    elif previous and previous != day:
+        apply_delta(previous, admissions=-1)
+        apply_delta(day, admissions=1)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    apply_delta(local_date(instance.enrollment_date), admissions=-1)
+
+
+@receiver(pre_save, sender=Fee)
+def fee_pre_save(sender, instance, raw=False, **kwargs):
+    instance._previous_fee = None
+    if instance.pk and not raw:
+        instance._previous_fee = (
+            Fee.objects.filter(pk=instance.pk).values('student_id', 'amount', 'mode', 'date_collected').first()
+        )
+
+
+@receiver(post_save, sender=Fee)
+def fee_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_fee', None)
+    if previous:
+        apply_delta(local_date(previous['date_collected']), **fee_deltas(previous['amount'], previous['mode'], -1))
+    if created or previous:
+        apply_delta(local_date(instance.date_collected), **fee_deltas(instance.amount, instance.mode))
+
+
+@receiver(post_delete, sender=Fee)
+def fee_deleted(sender, instance, **kwargs):
+    apply_delta(local_date(instance.date_collected), **fee_deltas(instance.amount, instance.mode, -1))
+
+
+@receiver(post_save, sender=PlacementOutreach)
+def outreach_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        apply_delta(local_date(instance.date), outreach=1)
+
+
+@receiver(post_delete, sender=PlacementOutreach)
+def outreach_deleted(sender, instance, **kwargs):
+    apply_delta(local_date(instance.date), outreach=-1)
+
+
+# Student fee ledger
+
+@receiver(post_save, sender=Fee)
+def fee_ledger_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_fee', None)
+    if previous and previous['student_id'] == instance.student_id:
+        apply_payment(instance.student_id, instance.amount - previous['amount'], 0)
+        return
+    if previous:
+        apply_payment(previous['student_id'], -previous['amount'], -1)
+    if created or previous:
+        apply_payment(instance.student_id, instance.amount, 1)
+
+
+@receiver(post_delete, sender=Fee)
+def fee_ledger_deleted(sender, instance, **kwargs):
+    apply_payment(instance.student_id, -instance.amount, -1)
+
+
+# JWT revocation
+
+@receiver(pre_save, sender=User)
+def user_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._revokes_tokens = False
+    if raw or instance._state.adding:
+        return
+    fields = [name for name in REVOKING_FIELDS if update_fields is None or name in update_fields]
+    previous = User.objects.filter(pk=instance.pk).values(*fields).first() if fields else None
+    instance._revokes_tokens = bool(previous) and any(previous[name] != getattr(instance, name) for name in fields)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, raw=False, **kwargs):
+    if getattr(instance, '_revokes_tokens', False):
+        revoke_tokens(instance)
+        instance.refresh_from_db(fields=['token_version'])
+
+
+# Response cache versions
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Batch)
+@receiver(post_delete, sender=Batch)
+@receiver(post_save, sender=Inquiry)
+@receiver(post_delete, sender=Inquiry)
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+@receiver(post_save, sender=Fee)
+@receiver(post_delete, sender=Fee)
+@receiver(post_save, sender=PlacementOutreach)
+@receiver(post_delete, sender=PlacementOutreach)
+def invalidate_cached_responses(sender, **kwargs):
+    invalidate(sender)
+
+
+@receiver(post_save, sender=InquiryFollowup)
+@receiver(post_delete, sender=InquiryFollowup)
+def invalidate_inquiry_responses(sender, **kwargs):
+    # Followups are nested inside inquiry and student payloads
+    invalidate(Inquiry)
+
+
+# Delta sync (api.sync)
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Inquiry)
+@receiver(post_delete, sender=Batch)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Fee)
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=PlacementOutreach)
+def record_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.pk)
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Batch)
+@receiver(pre_save, sender=Inquiry)
+def copied_field_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    field = copied_field(sender)
+    instance._copied_field_changed = False
+    if raw or instance._state.adding or (update_fields is not None and field not in update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+    instance._copied_field_changed = previous is not None and previous != getattr(instance, field)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Batch)
+@receiver(post_save, sender=Inquiry)
+def copied_field_saved(sender, instance, **kwargs):
+    if getattr(instance, '_copied_field_changed', False):
+        touch_copies(sender, instance.pk)
+
+
+@receiver(pre_delete, sender=User)
+@receiver(pre_delete, sender=Batch)
+@receiver(pre_delete, sender=Inquiry)
+def copied_field_deleted(sender, instance, **kwargs):
+    # SET_NULL clears the copies with an UPDATE that leaves updated_at alone
+    touch_copies(sender, instance.pk)
+
+
+@receiver(post_save, sender=InquiryFollowup)
+@receiver(post_delete, sender=InquiryFollowup)
+def touch_followup_parents(sender, instance, raw=False, **kwargs):
+    # Followups are nested in inquiry payloads, and inquiries in student payloads
+    if not raw:
+        touch(Inquiry.objects.filter(pk=instance.inquiry_id))
+        touch(Student.objects.filter(inquiry_id=instance.inquiry_id))
+
+
+@receiver(post_save, sender=Inquiry)
+def touch_inquiry_student(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        touch(Student.objects.filter(inquiry_id=instance.pk))
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def touch_admitted_inquiry(sender, instance, created=True, raw=False, **kwargs):
+    # Inquiry.is_admitted reports whether a student row exists
+    if created and not raw:
+        touch(Inquiry.objects.filter(pk=instance.inquiry_id))
+
+
+# Live events (api.events); counter deltas are published by rollups.apply_delta
+
+@receiver(post_save, sender=Fee)
+def publish_fee(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.publish('fee.collected', {
+            'id': instance.pk,
+            'student': instance.student_id,
+            'student_name': Inquiry.objects.filter(student_profile=instance.student_id).values_list(
+                'name', flat=True).first(),
+            'amount': instance.amount,
+            'mode': instance.mode,
+            'date_collected': instance.date_collected,
+        }, roles=events.DASHBOARD_ROLES)
+
+
+@receiver(post_save, sender=Student)
+def publish_admission(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        inquiry = instance.inquiry
+        events.publish('admission', {
+            'id': instance.pk,
+            'inquiry': inquiry.pk,
+            'name': inquiry.name,
+            'course': instance.course,
+            'batch': instance.batch_id,
+            'enrollment_date': instance.enrollment_date,
+        }, roles=events.DASHBOARD_ROLES, users=(inquiry.created_by_id,))
+
+
+@receiver(post_save, sender=Inquiry)
+def publish_inquiry(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.publish('inquiry.created', {
+            'id': instance.pk,
+            'name': instance.name,
+            'interested_course': instance.interested_course,
+            'source': instance.source,
+            'lead_status': instance.lead_status,
+            'created_at': instance.created_at,
+        }, roles=events.DASHBOARD_ROLES, users=(instance.created_by_id,))
+
+
+@receiver(post_save, sender=Attendance)
+def publish_attendance(sender, instance, raw=False, **kwargs):
+    # bulk_mark saves without signals and publishes its own event
+    if not raw:
+        events.attendance_marked(instance.batch, instance.date, [instance.status], instance.trainer_id)
+
+
+# Prometheus counters (api.metrics)
+
+@receiver(post_save, sender=Inquiry)
+def count_inquiry(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(metrics.INQUIRIES_CREATED.inc)
+
+
+@receiver(post_save, sender=Fee)
+def count_fee(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        mode, amount = instance.mode, float(instance.amount)
+
+        def record():
+            metrics.FEES_COLLECTED.labels(mode).inc()
+            metrics.FEES_COLLECTED_AMOUNT.labels(mode).inc(amount)
+        transaction.on_commit(record)
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    metrics.DB_CONNECTIONS_OPENED.labels(connection.alias).inc()
+
+
+@receiver(request_finished)
+def track_persistent_connections(sender, **kwargs):
+    # Connected after Django's close_old_connections, so this sees what it kept open.
+    for connection in connections.all(initialized_only=True):
+        metrics.DB_CONNECTIONS_PERSISTENT.labels(connection.alias).set(connection.connection is not None)
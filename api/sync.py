@@ -0,0 +1,162 @@
+"""
+Delta sync: ``GET <list>/?changed_since=<cursor>`` returns the rows of the
+list endpoint (same scoping and filters) changed since the cursor, and the ids
+of rows deleted since then, so offline clients refresh without a full reload.
+Pass ``0`` for the first sync, then the returned cursor until ``has_more`` is
+false; keep the last cursor for the next sync.
+
+Changes are read from the indexed ``updated_at`` column and deletions from
+Tombstone rows written by post_delete signals. A row whose payload embeds
+another row (followups in an inquiry, the inquiry in a student, names copied
+from users and batches) is touched when that row changes (see api.signals).
+Rows that merely leave the caller's scope, such as a reassigned inquiry, are
+not reported as deletions.
+
+The cursor holds an (updated_at, id) position in each stream. It never moves
+past ``now - SYNC_SETTLE_SECONDS``, so a transaction that commits a little
+after stamping its rows is still picked up: delivery is at least once and
+clients apply upserts idempotently. Tombstones are pruned after
+SYNC_TOMBSTONE_DAYS (prune_tombstones); an older cursor gets 410 Gone and the
+client must resync from ``0``.
+"""
+import base64
+import datetime
+import json
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from . import routers
+
+CURSOR_PARAM = 'changed_since'
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Fields other payloads copy (trainer_name, batch_name, student_name...), and the rows copying them
+COPIED_FIELDS = {
+    'api.User': ('username', (
+        ('api.Inquiry', 'created_by'), ('api.Batch', 'trainer'), ('api.Fee', 'collected_by'),
+        ('api.Attendance', 'trainer'), ('api.PlacementOutreach', 'officer'),
+    )),
+    'api.Batch': ('batch_name', (('api.Student', 'batch'), ('api.Attendance', 'batch'))),
+    'api.Inquiry': ('name', (('api.Fee', 'student__inquiry'), ('api.Attendance', 'student__inquiry'))),
+}
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Deletions this far back are no longer kept; sync again from changed_since=0.'
+    default_code = 'cursor_expired'
+
+
+def touch(queryset):
+    """Mark rows changed for sync clients without running their save()."""
+    return queryset.update(updated_at=timezone.now())
+
+
+def copied_field(model):
+    return COPIED_FIELDS.get(model._meta.label, (None, ()))[0]
+
+
+def touch_copies(model, pk):
+    """Touch the rows that show a copied field of ``model`` row ``pk``."""
+    for label, lookup in COPIED_FIELDS.get(model._meta.label, (None, ()))[1]:
+        touch(apps.get_model(label).objects.filter(**{lookup: pk}))
+
+
+def to_micros(value):
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(value):
+    return EPOCH + timedelta(microseconds=value)
+
+
+def encode_cursor(upserts, deletions):
+    values = [to_micros(upserts[0]), upserts[1], to_micros(deletions[0]), deletions[1]]
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """(upserts position, deletions position) of a cursor; None for ``0``, the first sync."""
+    if value == '0':
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(value + '=' * (-len(value) % 4)))
+        if not (isinstance(values, list) and len(values) == 4 and all(type(v) is int for v in values)):
+            raise ValueError
+        return (from_micros(values[0]), values[1]), (from_micros(values[2]), values[3])
+    except (ValueError, TypeError, OverflowError):
+        raise ValidationError({CURSOR_PARAM: 'Invalid cursor.'})
+
+
+def after(field, position):
+    stamp, pk = position
+    return Q(**{f'{field}__gt': stamp}) | Q(**{field: stamp, 'id__gt': pk})
+
+
+def read_stream(queryset, field, position, horizon, limit):
+    """
+    Up to ``limit`` rows after ``position`` and settled before ``horizon``, the
+    position to resume from, and whether more rows are waiting.
+    """
+    if position is not None:
+        queryset = queryset.filter(after(field, position))
+    rows = list(queryset.filter(**{f'{field}__lte': horizon}).order_by(field, 'id')[:limit + 1])
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (getattr(rows[-1], field), rows[-1].pk), True
+    # Caught up: resume from the horizon, since nothing later has settled yet
+    return rows, (horizon, 0), False
+
+
+class SyncMixin:
+    """Answers ``?changed_since=`` on the list action with upserts and deletions."""
+
+    def list(self, request, *args, **kwargs):
+        if CURSOR_PARAM in request.query_params:
+            return self.changes(request)
+        return super().list(request, *args, **kwargs)
+
+    def changes(self, request):
+        cursor = decode_cursor(request.query_params[CURSOR_PARAM])
+        now = timezone.now()
+        if cursor is not None and cursor[1][0] < now - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+            raise CursorExpired()
+
+        settle = settings.SYNC_SETTLE_SECONDS
+        routing = routers.current.get()
+        if routing is not None and routing.replica:
+            # Rows still in flight to the replica must not be skipped either
+            settle += settings.REPLICA_PIN_SECONDS
+        horizon = now - timedelta(seconds=settle)
+        limit = self.paginator.get_page_size(request)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        upserts, upserts_at, more_upserts = read_stream(
+            queryset, 'updated_at', cursor and cursor[0], horizon, limit,
+        )
+        if cursor is None:
+            # A full sync has nothing to delete
+            deletions, deletions_at, more_deletions = [], (horizon, 0), False
+        else:
+            from .models import Tombstone
+
+            tombstones = Tombstone.objects.filter(model=queryset.model._meta.label_lower)
+            deletions, deletions_at, more_deletions = read_stream(
+                tombstones, 'deleted_at', cursor[1], horizon, limit,
+            )
+        return Response({
+            'upserts': self.get_serializer(upserts, many=True).data,
+            'deletions': [tombstone.object_id for tombstone in deletions],
+            'cursor': encode_cursor(upserts_at, deletions_at),
+            'has_more': more_upserts or more_deletions,
+        }, headers={
+            # The cursor depends on the clock as well as the data, so no cache may replay it
+            'Cache-Control': 'no-store',
+        })
@@ -1,3 +1,1452 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import gzip
+import io
+import json
+import tempfile
+import uuid
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.db.models import Sum
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from openpyxl import load_workbook
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import (
+    User, Inquiry, InquiryFollowup, Batch, Student, Fee, Attendance, PlacementOutreach, DailyMetrics, Tombstone,
+)
+from . import cache as response_cache, events
+from .authentication import RoleTokenObtainPairSerializer, revoke_tokens
+from .checks import replica_needs_shared_cache
+from .dashboard import adashboard_stats
+from .ledger import find_drift, rebuild_ledger
+from .middleware import AtomicWritesMiddleware
+from .pagination import FeePagination
+from .parsers import ORJSONParser
+from .profiling import RequestProfile
+from .renderers import ORJSONRenderer
+from .routers import WRITTEN_KEY
+from .sync import encode_cursor
+from .weekdays import format_days, parse_days
+
+
+def make_inquiry(index, **kwargs):
+    data = {
+        'name': f'Lead {index}',
+        'mobile': f'90000{index:05d}',
+        'email': f'lead{index}@example.com',
+        'college': 'ABC College',
+        'degree': 'B.Tech',
+        'branch': 'CS',
+        'passout_year': 2024,
+        'interested_course': 'Data Science',
+        'source': 'LinkedIn',
+    }
+    data.update(kwargs)
+    return Inquiry.objects.create(**data)
+
+
+def make_student(index, batch=None, **kwargs):
+    inquiry = make_inquiry(index)
+    return Student.objects.create(inquiry=inquiry, course='Data Science', batch=batch, **kwargs)
+
+
+class APITestMixin:
+    def setUp(self):
+        cache.clear()
+        response_cache.stats.clear()
+        self.manager = User.objects.create_user('manager', password='pass', role=User.Role.MANAGER)
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager)
+
+
+class KeysetPaginationTests(APITestMixin, TestCase):
+    def test_pages_follow_created_at_then_id(self):
+        for i in range(7):
+            make_inquiry(i, created_by=self.manager)
+
+        seen = []
+        url = '/api/inquiries/?page_size=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+
+        expected = list(Inquiry.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_inserts_between_pages_do_not_shift_results(self):
+        batch = Batch.objects.create(course='Data Science', batch_name='DS-1', start_date=datetime.date(2024, 1, 1))
+        students = [make_student(i, batch=batch) for i in range(6)]
+        day = datetime.date(2024, 2, 1)
+        for student in students[:4]:
+            Attendance.objects.create(batch=batch, student=student, date=day, status='ABSENT')
+
+        first = self.client.get('/api/attendance/?page_size=2')
+        Attendance.objects.create(batch=batch, student=students[4], date=day, status='ABSENT')
+        second = self.client.get(first.data['next'])
+
+        first_ids = [row['id'] for row in first.data['results']]
+        second_ids = [row['id'] for row in second.data['results']]
+        self.assertFalse(set(first_ids) & set(second_ids))
+        self.assertTrue(all(a > b for a, b in zip(first_ids + second_ids, (first_ids + second_ids)[1:])))
+
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual([row['id'] for row in previous.data['results']], first_ids)
+
+    def test_page_size_is_bounded(self):
+        request = Request(APIRequestFactory().get('/api/fees/', {'page_size': 100000}))
+        self.assertEqual(FeePagination().get_page_size(request), FeePagination.max_page_size)
+
+    def test_count_is_opt_in(self):
+        student = make_student(1)
+        Fee.objects.create(student=student, amount=1000, mode='CASH')
+
+        response = self.client.get('/api/fees/')
+        self.assertNotIn('count', response.data)
+
+        response = self.client.get('/api/fees/?count=true')
+        self.assertEqual(response.data['count'], 1)
+
+        with override_settings(PAGINATION_INCLUDE_COUNT=True):
+            self.assertEqual(self.client.get('/api/fees/').data['count'], 1)
+            self.assertNotIn('count', self.client.get('/api/fees/?count=false').data)
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get('/api/inquiries/?cursor=bogus')
+        self.assertEqual(response.status_code, 404)
+
+
+class QueryCountTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.batch = Batch.objects.create(
+            course='Data Science', batch_name='DS-1', trainer=self.trainer, start_date=datetime.date(2024, 1, 1)
+        )
+        self.created = 0
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.created += 1
+            student = make_student(self.created, batch=self.batch)
+            student.inquiry.created_by = self.manager
+            student.inquiry.save()
+            InquiryFollowup.objects.create(inquiry=student.inquiry, remark='Called', created_by=self.manager)
+            Fee.objects.create(student=student, amount=500, mode='UPI', collected_by=self.manager)
+            Fee.objects.create(student=student, amount=700, mode='CASH', collected_by=self.manager)
+            Attendance.objects.create(
+                batch=self.batch, student=student, date=datetime.date(2024, 2, 1),
+                status='PRESENT_OFFLINE', trainer=self.trainer
+            )
+            PlacementOutreach.objects.create(
+                officer=self.manager, company_name='Acme', contact_name='HR', mode='CALL', phone_email='hr@acme.test'
+            )
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return sum(1 for query in ctx.captured_queries if query['sql'].startswith('SELECT'))
+
+    def test_list_query_counts_do_not_grow_with_rows(self):
+        urls = [
+            '/api/inquiries/', '/api/students/', '/api/fees/', '/api/attendance/',
+            '/api/outreach/', '/api/batches/', '/api/dashboard/stats/',
+        ]
+        self.add_rows(2)
+        small = {url: self.count_queries(url) for url in urls}
+        self.add_rows(6)
+        large = {url: self.count_queries(url) for url in urls}
+        self.assertEqual(small, large)
+
+    def test_student_list_query_budget(self):
+        self.add_rows(5)
+        # student + batch + inquiry join; nested relations are opt-in
+        self.assertEqual(self.count_queries('/api/students/'), 1)
+        # plus followups and fees prefetches
+        self.assertEqual(self.count_queries('/api/students/?expand=inquiry_details.followups,fees'), 3)
+
+
+class ResponseShapingTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = make_student(1)
+        Fee.objects.create(student=self.student, amount=500, mode='UPI')
+
+    def test_list_leaves_out_nested_relations_unless_expanded(self):
+        row = self.client.get('/api/students/').data['results'][0]
+        self.assertNotIn('fees', row)
+        self.assertNotIn('inquiry_details', row)
+        self.assertEqual(row['inquiry_name'], self.student.inquiry.name)
+
+        row = self.client.get('/api/students/?expand=fees,inquiry_details.followups').data['results'][0]
+        self.assertEqual(len(row['fees']), 1)
+        self.assertEqual(row['inquiry_details']['followups'], [])
+
+    def test_retrieve_keeps_full_shape(self):
+        data = self.client.get(f'/api/students/{self.student.id}/').data
+        self.assertIn('fees', data)
+        self.assertIn('followups', data['inquiry_details'])
+
+    def test_sparse_fieldsets_restrict_keys_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/students/?fields=id,mobile')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'mobile'})
+        select = next(query['sql'] for query in ctx.captured_queries if query['sql'].startswith('SELECT'))
+        self.assertNotIn('JOIN', select)
+        self.assertNotIn('"total_fees"', select)
+
+
+class StatelessAuthTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.client = APIClient()
+
+    def login(self, username='trainer', password='pass'):
+        response = self.client.post('/api/auth/token/', {'username': username, 'password': password})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def get(self, url, access):
+        return self.client.get(url, HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_requests_are_authenticated_from_claims(self):
+        tokens = self.login()
+        claims = AccessToken(tokens['access'])
+        self.assertEqual((claims['role'], claims['username'], claims['is_superuser']), ('TRAINER', 'trainer', False))
+
+        own = Batch.objects.create(course='DS', batch_name='Mine', trainer=self.trainer, start_date=datetime.date(2024, 1, 1))
+        Batch.objects.create(course='DS', batch_name='Other', start_date=datetime.date(2024, 1, 1))
+        self.get('/api/batches/', tokens['access'])  # warm the token version cache
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.get('/api/batches/?fields=id,batch_name', tokens['access'])
+        self.assertEqual([row['id'] for row in response.data['results']], [own.id])
+        self.assertFalse([query for query in ctx.captured_queries if 'FROM "api_user"' in query['sql']])
+
+        self.assertEqual(self.get('/api/users/me/', tokens['access']).data['username'], 'trainer')
+        self.assertEqual(self.get('/api/dashboard/cache_stats/', tokens['access']).status_code, 403)
+
+    def test_role_change_revokes_issued_tokens(self):
+        tokens = self.login()
+        self.trainer.last_name = 'Unrelated'
+        self.trainer.save()
+        self.assertEqual(self.get('/api/batches/', tokens['access']).status_code, 200)
+
+        self.trainer.role = User.Role.MANAGER
+        self.trainer.save()
+        self.assertEqual(self.get('/api/batches/', tokens['access']).status_code, 401)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': tokens['refresh']})
+        self.assertEqual(response.status_code, 401)
+
+        tokens = self.login()
+        self.assertEqual(AccessToken(tokens['access'])['role'], 'MANAGER')
+        self.assertEqual(self.get('/api/dashboard/cache_stats/', tokens['access']).status_code, 200)
+
+        revoke_tokens(self.trainer)
+        self.assertEqual(self.get('/api/batches/', tokens['access']).status_code, 401)
+
+    def test_tokens_without_role_claims_are_rejected(self):
+        access = AccessToken.for_user(self.trainer)
+        self.assertEqual(self.get('/api/batches/', access).status_code, 401)
+
+    def test_token_user_id_matches_model_ids(self):
+        access = self.login()['access']
+        batch = Batch.objects.create(course='DS', batch_name='Mine', trainer=self.trainer, start_date=datetime.date(2024, 1, 1))
+        student = make_student(1, batch=batch)
+        response = self.client.post('/api/attendance/bulk_mark/', {
+            'batch': batch.id, 'date': '2024-03-04', 'records': [{'student': student.id, 'status': 'ABSENT'}],
+        }, format='json', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Attendance.objects.get().trainer_id, self.trainer.id)
+
+
+class DailyMetricsTests(APITestMixin, TestCase):
+    def snapshot(self):
+        return list(DailyMetrics.objects.order_by('date').values())
+
+    def test_rollups_follow_writes(self):
+        student = make_student(1)
+        fee = Fee.objects.create(student=student, amount=1000, mode='CASH')
+        PlacementOutreach.objects.create(company_name='Acme', contact_name='HR', mode='CALL', phone_email='x')
+
+        today = DailyMetrics.objects.get()
+        self.assertEqual((today.inquiries, today.admissions, today.outreach, today.fee_count), (1, 1, 1, 1))
+        self.assertEqual(today.fees_cash, 1000)
+
+        fee.amount = 1500
+        fee.mode = 'UPI'
+        fee.save()
+        today.refresh_from_db()
+        self.assertEqual((today.fees_cash, today.fees_upi, today.fees_total, today.fee_count), (0, 1500, 1500, 1))
+
+        student.inquiry.delete()
+        today.refresh_from_db()
+        self.assertEqual((today.inquiries, today.admissions, today.fee_count, today.fees_total), (0, 0, 0, 0))
+
+    def test_deleting_uncounted_rows(self):
+        # bulk_create() sends no signals, so today's rollup never counted this row
+        inquiry, = Inquiry.objects.bulk_create([Inquiry(
+            name='Imported', mobile='9000000000', email='i@example.com', college='ABC College', degree='B.Tech',
+            branch='CS', passout_year=2024, interested_course='Data Science', source='Import',
+        )])
+        self.assertEqual(self.client.delete(f'/api/inquiries/{inquiry.id}/').status_code, 204)
+        self.assertEqual(DailyMetrics.objects.get().inquiries, 0)
+
+    def test_rebuild_matches_incremental_rollups(self):
+        for i in range(3):
+            student = make_student(i, enrollment_date=datetime.date(2024, 1, 1 + i))
+            Fee.objects.create(student=student, amount=100 * (i + 1), mode='NEFT')
+        incremental = self.snapshot()
+        DailyMetrics.objects.all().delete()
+        call_command('rebuild_daily_metrics', stdout=open('/dev/null', 'w'))
+        rebuilt = self.snapshot()
+        strip = lambda rows: [{k: v for k, v in row.items() if k not in ('id', 'updated_at')} for row in rows]
+        self.assertEqual(strip(incremental), strip(rebuilt))
+
+    def test_dashboard_reads_rollups(self):
+        student = make_student(1)
+        Fee.objects.create(student=student, amount=2500, mode='UPI')
+        make_student(2, enrollment_date=datetime.date(2020, 5, 1))
+
+        response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.data['total_inquiries'], 2)
+        self.assertEqual(response.data['total_students'], 2)
+        self.assertEqual(response.data['admissions_today'], 1)
+        self.assertEqual(response.data['total_fees_collected'], 2500)
+        self.assertEqual(response.data['fees_today'], 2500)
+        self.assertEqual(response.data['placements'], 0)
+
+
+class AtomicWritesTests(TransactionTestCase):
+    def test_only_writes_run_in_a_transaction(self):
+        seen = {}
+
+        def view(request):
+            seen[request.method] = connection.in_atomic_block
+            if request.method == 'POST':
+                make_inquiry(Inquiry.objects.count())
+            return HttpResponse(status=int(request.GET.get('status', 200)))
+
+        middleware = AtomicWritesMiddleware(view)
+        middleware(RequestFactory().get('/api/inquiries/'))
+        middleware(RequestFactory().post('/api/inquiries/'))
+        self.assertEqual(seen, {'GET': False, 'POST': True})
+        self.assertEqual(Inquiry.objects.count(), 1)
+
+        middleware(RequestFactory().post('/api/inquiries/?status=400'))
+        self.assertEqual(Inquiry.objects.count(), 1)
+
+
+class AsyncDashboardTests(APITestMixin, TransactionTestCase):
+    # The pool threads use their own connections, so the data has to be committed.
+
+    def test_matches_the_serial_endpoint(self):
+        batch = Batch.objects.create(batch_name='Async', course='DS', start_date=datetime.date(2024, 1, 1))
+        student = make_student(1, batch=batch, total_fees=5000)
+        Fee.objects.create(student=student, amount=1200, mode='UPI', collected_by=self.manager)
+
+        expected = self.client.get('/api/dashboard/stats/').json()
+        response = self.client.get('/api/async/dashboard/stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(response.json()['recent_fees'][0]['amount'], '1200.00')
+        self.assertEqual(self.client.get('/api/async/dashboard/stats/')['X-Cache'], 'HIT')
+
+    def test_pool_threads_keep_their_connections(self):
+        # SERVER_MODE=asgi sets CONN_MAX_AGE to 0; that must not close the pool threads' connections.
+        with mock.patch.dict(connections.settings['default'], CONN_MAX_AGE=0), \
+                mock.patch.object(type(connections['default']), 'close', autospec=True) as close:
+            for _ in range(3):
+                asyncio.run(adashboard_stats())
+        close.assert_not_called()
+
+    def test_requires_authentication(self):
+        self.assertEqual(APIClient().get('/api/async/dashboard/stats/').status_code, 401)
+
+
+class FeeLedgerTests(APITestMixin, TestCase):
+    def ledger(self, student):
+        student.refresh_from_db()
+        return student.amount_paid, student.balance_due, student.payment_count
+
+    def test_ledger_follows_fee_writes(self):
+        student = make_student(1, total_fees=10000)
+        other = make_student(2, total_fees=5000)
+        self.assertEqual(self.ledger(student), (0, 10000, 0))
+
+        response = self.client.post('/api/fees/', {'student': student.id, 'amount': '4000', 'mode': 'UPI'})
+        self.assertEqual(response.status_code, 201)
+        fee_id = response.data['id']
+        self.assertEqual(self.ledger(student), (4000, 6000, 1))
+        self.assertIsNotNone(student.last_payment_at)
+
+        self.client.patch(f'/api/fees/{fee_id}/', {'amount': '2500'})
+        self.assertEqual(self.ledger(student), (2500, 7500, 1))
+
+        self.client.patch(f'/api/fees/{fee_id}/', {'student': other.id})
+        self.assertEqual(self.ledger(student), (0, 10000, 0))
+        self.assertIsNone(student.last_payment_at)
+        self.assertEqual(self.ledger(other), (2500, 2500, 1))
+
+        self.client.patch(f'/api/students/{other.id}/', {'total_fees': '3000', 'amount_paid': '9999'})
+        self.assertEqual(self.ledger(other), (2500, 500, 1))
+
+        self.client.delete(f'/api/fees/{fee_id}/')
+        self.assertEqual(self.ledger(other), (0, 3000, 0))
+
+    def test_balance_filters(self):
+        owing = make_student(1, total_fees=10000)
+        settled = make_student(2, total_fees=3000)
+        Fee.objects.create(student=owing, amount=1000, mode='CASH')
+        Fee.objects.create(student=settled, amount=3000, mode='UPI')
+
+        response = self.client.get('/api/students/?balance_due__gt=0')
+        self.assertEqual([row['id'] for row in response.data['results']], [owing.id])
+        response = self.client.get('/api/students/?balance_due__lte=0&payment_count__gte=1')
+        self.assertEqual([row['id'] for row in response.data['results']], [settled.id])
+        self.assertEqual(self.client.get('/api/students/?balance_due__gt=lots').status_code, 400)
+
+    def test_reconcile_reports_and_fixes_drift(self):
+        student = make_student(1, total_fees=8000)
+        Fee.objects.create(student=student, amount=3000, mode='CASH')
+        Student.objects.filter(pk=student.pk).update(amount_paid=0, payment_count=5)
+
+        out = io.StringIO()
+        call_command('reconcile_fee_ledger', stdout=out)
+        self.assertIn(f'student {student.id}: amount_paid is 0', out.getvalue())
+        self.assertIn(f'student {student.id}: payment_count is 5, expected 1', out.getvalue())
+        self.assertEqual(self.ledger(student), (0, 5000, 5))
+
+        call_command('reconcile_fee_ledger', '--fix', stdout=out)
+        self.assertEqual(self.ledger(student), (3000, 5000, 1))
+        out = io.StringIO()
+        call_command('reconcile_fee_ledger', stdout=out)
+        self.assertIn('matches', out.getvalue())
+
+    def test_rebuild_reads_only_the_given_students(self):
+        drifted, other = make_student(1, total_fees=8000), make_student(2, total_fees=8000)
+        for student in (drifted, other):
+            Fee.objects.create(student=student, amount=3000, mode='CASH')
+        Student.objects.update(amount_paid=0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(rebuild_ledger(Student, Fee, [drifted.id]), 1)
+        reads = [query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(reads), 2)
+        self.assertTrue(all(f'IN ({drifted.id})' in sql for sql in reads))
+        self.assertEqual(self.ledger(drifted), (3000, 5000, 1))
+        self.assertEqual(self.ledger(other)[0], 0)
+
+
+class ResponseCacheTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.other_trainer = User.objects.create_user('other', password='pass', role=User.Role.TRAINER)
+        self.batch = Batch.objects.create(
+            course='Data Science', batch_name='DS-1', trainer=self.trainer, start_date=datetime.date(2024, 1, 1)
+        )
+
+    def test_hits_until_model_changes(self):
+        self.assertEqual(self.client.get('/api/batches/')['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/batches/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertFalse([query for query in ctx.captured_queries if query['sql'].startswith('SELECT')])
+
+        self.batch.batch_name = 'DS-1 Morning'
+        self.batch.save()
+        response = self.client.get('/api/batches/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['batch_name'], 'DS-1 Morning')
+
+    def test_dashboard_is_rebuilt_after_midnight(self):
+        evening = timezone.make_aware(datetime.datetime(2024, 3, 1, 23, 59))
+        urls = ('/api/dashboard/stats/', '/api/batches/?runs_on=today')
+        with mock.patch('django.utils.timezone.now', return_value=evening):
+            for url in urls:
+                self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+                self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+        with mock.patch('django.utils.timezone.now', return_value=evening + datetime.timedelta(minutes=2)):
+            for url in urls:
+                self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+
+    def test_trainer_scoped_responses_are_not_shared(self):
+        self.client.force_authenticate(self.trainer)
+        self.assertEqual(len(self.client.get('/api/batches/').data['results']), 1)
+        self.client.force_authenticate(self.other_trainer)
+        self.assertEqual(len(self.client.get('/api/batches/').data['results']), 0)
+
+    def test_query_string_is_part_of_the_key(self):
+        trainers = self.client.get('/api/users/?role=TRAINER').data['results']
+        managers = self.client.get('/api/users/?role=MANAGER').data['results']
+        self.assertEqual({u['username'] for u in trainers}, {'trainer', 'other'})
+        self.assertEqual([u['username'] for u in managers], ['manager'])
+
+    def test_dashboard_is_invalidated_by_fee(self):
+        student = make_student(1)
+        self.assertEqual(self.client.get('/api/dashboard/stats/').data['total_fees_collected'], 0)
+        Fee.objects.create(student=student, amount=900, mode='CASH')
+        self.assertEqual(self.client.get('/api/dashboard/stats/').data['total_fees_collected'], 900)
+
+    def test_cache_stats(self):
+        self.client.get('/api/batches/')
+        self.client.get('/api/batches/')
+        stats = self.client.get('/api/dashboard/cache_stats/').data
+        self.assertEqual(stats['batch-list'], {'hit': 1, 'miss': 1, 'hit_ratio': 0.5})
+
+        self.client.force_authenticate(self.trainer)
+        self.assertEqual(self.client.get('/api/dashboard/cache_stats/').status_code, 403)
+
+
+class ListFilterTests(APITestMixin, TestCase):
+    def test_followup_queue_skips_enrolled_leads(self):
+        due = make_inquiry(1, lead_status='HOT', next_followup_date=datetime.date(2024, 3, 1))
+        make_inquiry(2, lead_status='ENROLLED', next_followup_date=datetime.date(2024, 3, 1))
+        make_inquiry(3, lead_status='WARM', next_followup_date=datetime.date(2024, 4, 1))
+
+        response = self.client.get('/api/inquiries/?followup_due=2024-03-15')
+        self.assertEqual([row['id'] for row in response.data['results']], [due.id])
+        response = self.client.get('/api/inquiries/?lead_status=ENROLLED')
+        self.assertEqual([row['name'] for row in response.data['results']], ['Lead 2'])
+        self.assertEqual(self.client.get('/api/inquiries/?followup_due=2024-02-30').status_code, 400)
+
+    def test_students_by_status(self):
+        active = make_student(1)
+        make_student(2, status='DROPPED')
+        response = self.client.get('/api/students/?status=ACTIVE')
+        self.assertEqual([row['id'] for row in response.data['results']], [active.id])
+
+    def test_attendance_by_date(self):
+        student = make_student(1)
+        batch = Batch.objects.create(batch_name='DS-1', course='Data Science', start_date=datetime.date(2024, 1, 1))
+        for day in (1, 2):
+            Attendance.objects.create(
+                batch=batch, student=student, date=datetime.date(2024, 3, day), status='PRESENT_OFFLINE'
+            )
+        rows = self.client.get('/api/attendance/', {'date': '2024-03-02'}).data['results']
+        self.assertEqual([row['date'] for row in rows], ['2024-03-02'])
+        self.assertEqual(self.client.get('/api/attendance/', {'date': 'bad'}).status_code, 400)
+
+    def test_inquiry_list_filters(self):
+        counselor = User.objects.create_user('asha', password='pass', role=User.Role.COUNSELOR)
+        match = make_inquiry(1, college='COEP Pune', interested_course='Data Analytics', created_by=counselor)
+        make_inquiry(2, college='COEP Pune', interested_course='Data Analytics')
+        make_inquiry(3, college='VIT', interested_course='Data Analytics', created_by=counselor)
+        Inquiry.objects.update(created_at=timezone.make_aware(datetime.datetime(2024, 3, 1, 10)))
+        Inquiry.objects.filter(pk=match.pk).update(created_at=timezone.make_aware(datetime.datetime(2024, 3, 2, 23)))
+
+        query = {'interested_course': 'Data Analytics', 'college': 'coep', 'created_by_name': 'ASH'}
+        rows = self.client.get('/api/inquiries/', query).data['results']
+        self.assertEqual([row['id'] for row in rows], [match.id])
+        dates = {'created_from': '2024-03-02', 'created_to': '2024-03-02'}
+        self.assertEqual([row['id'] for row in self.client.get('/api/inquiries/', dates).data['results']], [match.id])
+        self.assertEqual(self.client.get('/api/inquiries/', {'created_to': 'bad'}).status_code, 400)
+
+    def test_student_list_filters_page_on_the_server(self):
+        students = [make_student(index) for index in range(1, 4)]
+        Inquiry.objects.filter(pk=students[0].inquiry_id).update(college='COEP')
+        Student.objects.filter(pk=students[1].pk).update(enrollment_date=datetime.date(2024, 1, 5))
+
+        rows = self.client.get('/api/students/', {'college': 'coep'}).data['results']
+        self.assertEqual([row['id'] for row in rows], [students[0].id])
+        query = {'enrolled_from': '2024-01-01', 'enrolled_to': '2024-01-31', 'course': 'Data Science'}
+        rows = self.client.get('/api/students/', query).data['results']
+        self.assertEqual([row['id'] for row in rows], [students[1].id])
+        rows = self.client.get('/api/students/', {'search': students[2].mobile[-4:]}).data['results']
+        self.assertEqual([row['id'] for row in rows], [students[2].id])
+
+        # The next link keeps the filters, so "load more" pages through the filtered rows only
+        Inquiry.objects.update(college='COEP')
+        response = self.client.get('/api/students/', {'college': 'coep', 'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+
+class SearchTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.counselor = User.objects.create_user('counselor', password='pass', role=User.Role.COUNSELOR)
+        self.rahul = make_inquiry(1, name='Rahul Sharma', college='COEP', created_by=self.counselor)
+        self.priya = make_inquiry(2, name='Priya Patil', college='VIT Pune', created_by=self.manager)
+        Student.objects.create(inquiry=self.rahul, course='Data Science')
+        PlacementOutreach.objects.create(company_name='Infosys', contact_name='Rahul Mehta', mode='CALL', phone_email='x')
+
+    def test_prefix_search_across_types(self):
+        response = self.client.get('/api/search/', {'q': 'rah'})
+        self.assertEqual([row['id'] for row in response.data['inquiries']], [self.rahul.id])
+        self.assertEqual([row['name'] for row in response.data['students']], ['Rahul Sharma'])
+        self.assertEqual([row['contact_name'] for row in response.data['outreach']], ['Rahul Mehta'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.priya.name = 'Priyanka Patil'
+        self.priya.save()
+        self.assertEqual(len(self.client.get('/api/search/', {'q': 'priyanka'}).data['inquiries']), 1)
+
+        self.rahul.name = 'Rohit Sharma'
+        self.rahul.save()
+        response = self.client.get('/api/search/', {'q': 'rohit', 'type': 'student'})
+        self.assertEqual([row['name'] for row in response.data['students']], ['Rohit Sharma'])
+        self.assertNotIn('inquiries', response.data)
+
+        self.priya.delete()
+        self.assertEqual(self.client.get('/api/search/', {'q': 'priyanka'}).data['inquiries'], [])
+
+    def test_results_are_ranked(self):
+        make_inquiry(3, name='Amit Kumar', college='Sharma Institute')
+        rows = self.client.get('/api/search/', {'q': 'sharma', 'type': 'inquiry'}).data['inquiries']
+        self.assertEqual(rows[0]['id'], self.rahul.id)
+        self.assertGreaterEqual(rows[0]['search_rank'], rows[1]['search_rank'])
+
+    def test_inquiry_search_respects_role_scope(self):
+        self.client.force_authenticate(self.counselor)
+        self.assertEqual(self.client.get('/api/search/', {'q': 'priya'}).data['inquiries'], [])
+        response = self.client.get('/api/inquiries/', {'search': self.rahul.mobile[:6]})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.rahul.id])
+
+    def test_digits_match_mid_number(self):
+        response = self.client.get('/api/inquiries/', {'search': self.rahul.mobile[-4:]})
+        self.assertEqual([row['id'] for row in response.data['results']], [self.rahul.id])
+        response = self.client.get('/api/search/', {'q': self.rahul.mobile[-4:]})
+        self.assertEqual([row['id'] for row in response.data['inquiries']], [self.rahul.id])
+        self.assertEqual([row['name'] for row in response.data['students']], ['Rahul Sharma'])
+
+    def test_ranking_applies_the_scope_inside_one_fts_query(self):
+        for index in range(3, 10):
+            make_inquiry(index, name=f'Sharma {index}', created_by=self.manager)
+        self.client.force_authenticate(self.counselor)
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.client.get('/api/search/', {'q': 'sharma', 'type': 'inquiry'}).data['inquiries']
+        self.assertEqual([row['id'] for row in rows], [self.rahul.id])
+        if connection.vendor == 'sqlite':
+            fts = [query['sql'] for query in queries.captured_queries if 'MATCH' in query['sql']]
+            self.assertEqual(len(fts), 1)
+            self.assertIn('"created_by_id"', fts[0])
+            self.assertIn('LIMIT', fts[0])
+
+    def test_limit_is_clamped(self):
+        for limit in ('-5', '0'):
+            response = self.client.get('/api/search/', {'q': 'rah', 'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['inquiries']), 1)
+        self.client.force_authenticate(User.objects.create_user('po', password='pass', role=User.Role.PLACEMENT_OFFICER))
+        self.assertEqual(self.client.get('/api/search/', {'q': 'rah'}).data['inquiries'], [])
+
+
+class BulkAttendanceTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.batch = Batch.objects.create(
+            course='Data Science', batch_name='DS-1', trainer=self.trainer, start_date=datetime.date(2024, 1, 1)
+        )
+        self.students = [make_student(i, batch=self.batch) for i in range(30)]
+        self.outsider = make_student(99)
+        self.client.force_authenticate(self.trainer)
+
+    def payload(self, students, status='PRESENT_OFFLINE', **extra):
+        data = {
+            'batch': self.batch.id,
+            'date': '2024-03-01',
+            'topic_taught': 'Pandas',
+            'records': [{'student': student.id, 'status': status} for student in students],
+        }
+        data.update(extra)
+        return data
+
+    def test_marks_roster_in_constant_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/attendance/bulk_mark/', self.payload(self.students), format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['records']), 30)
+        self.assertEqual(Attendance.objects.filter(date='2024-03-01').count(), 30)
+        self.assertLess(len(ctx.captured_queries), 10)
+
+    def test_resubmitting_updates_existing_rows(self):
+        self.client.post('/api/attendance/bulk_mark/', self.payload(self.students[:2]), format='json')
+        response = self.client.post(
+            '/api/attendance/bulk_mark/', self.payload(self.students[:2], status='ABSENT'), format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Attendance.objects.values_list('status', flat=True).distinct()), ['ABSENT'])
+        self.assertEqual(Attendance.objects.count(), 2)
+
+    def test_per_row_errors_reject_the_whole_roster(self):
+        data = self.payload([self.students[0], self.outsider, self.students[0]])
+        data['records'].append({'student': self.students[1].id, 'status': 'LATE'})
+        response = self.client.post('/api/attendance/bulk_mark/', data, format='json')
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['records']
+        self.assertEqual(len(errors), 4)
+        self.assertIn('status', errors[3])
+
+        data['records'].pop()
+        errors = self.client.post('/api/attendance/bulk_mark/', data, format='json').data['records']
+        self.assertEqual([bool(row) for row in errors], [False, True, True])
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_trainer_cannot_mark_another_batch(self):
+        other = User.objects.create_user('other', password='pass', role=User.Role.TRAINER)
+        self.client.force_authenticate(other)
+        response = self.client.post('/api/attendance/bulk_mark/', self.payload(self.students[:1]), format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class AttendanceMatrixTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.batch = Batch.objects.create(
+            course='Data Science', batch_name='DS-1', trainer=self.trainer, start_date=datetime.date(2024, 1, 1)
+        )
+        self.first, self.second = make_student(1, batch=self.batch), make_student(2, batch=self.batch)
+        marks = [
+            (self.first, '2024-03-01', 'PRESENT_OFFLINE'), (self.first, '2024-03-02', 'PRESENT_ONLINE'),
+            (self.first, '2024-03-03', 'ABSENT'), (self.second, '2024-03-01', 'PRESENT_ONLINE'),
+        ]
+        for student, day, status in marks:
+            Attendance.objects.create(batch=self.batch, student=student, date=day, status=status)
+
+    def test_matrix_and_percentages(self):
+        url = f'/api/batches/{self.batch.id}/attendance_matrix/'
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(url).data
+        self.assertEqual(sum(1 for query in ctx.captured_queries if query['sql'].startswith('SELECT')), 3)
+
+        self.assertEqual(data['dates'], ['2024-03-01', '2024-03-02', '2024-03-03'])
+        first, second = data['students']
+        self.assertEqual(first['statuses'], ['PRESENT_OFFLINE', 'PRESENT_ONLINE', 'ABSENT'])
+        self.assertEqual((first['present'], first['absent'], first['present_pct'], first['online_pct']), (2, 1, 66.7, 33.3))
+        self.assertEqual(second['statuses'], ['PRESENT_ONLINE', None, None])
+        self.assertEqual((second['unmarked'], second['present_pct']), (2, 33.3))
+        self.assertEqual([day['present_pct'] for day in data['per_date']], [100.0, 50.0, 0.0])
+
+        data = self.client.get(url, {'from': '2024-03-02', 'to': '2024-03-02'}).data
+        self.assertEqual(data['dates'], ['2024-03-02'])
+        self.assertEqual(self.client.get(url, {'from': 'March'}).status_code, 400)
+
+    def test_trainers_only_see_their_batches(self):
+        other = User.objects.create_user('other', password='pass', role=User.Role.TRAINER)
+        self.client.force_authenticate(other)
+        response = self.client.get(f'/api/batches/{self.batch.id}/attendance_matrix/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ScheduleConflictTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.batch = Batch.objects.create(
+            course='Data Science', batch_name='DS-1', trainer=self.trainer, start_date=datetime.date(2024, 1, 1),
+            classroom_name='Blue Classroom', start_time=datetime.time(10), end_time=datetime.time(12),
+            days_of_week='Mon,Wed,Fri',
+        )
+
+    def post(self, **fields):
+        data = {
+            'course': 'Data Analytics', 'batch_name': 'DA-1', 'start_date': '2024-02-01',
+            'start_time': '11:00', 'end_time': '13:00', 'days_of_week': 'Mon-Fri',
+        }
+        data.update(fields)
+        return self.client.post('/api/batches/', data)
+
+    def test_parse_days(self):
+        self.assertEqual(format_days(parse_days('Mon - Fri')), 'Mon,Tue,Wed,Thu,Fri')
+        self.assertEqual(format_days(parse_days('tuesday, thurs & weekends')), 'Tue,Thu,Sat,Sun')
+        self.assertEqual(parse_days(''), 0)
+        with self.assertRaises(ValueError):
+            parse_days('Monkey')
+
+    def test_double_booking_is_rejected(self):
+        response = self.post(trainer=self.trainer.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('DS-1', response.data['trainer'][0])
+        response = self.post(classroom_name='Blue Classroom')
+        self.assertEqual(list(response.data), ['classroom_name'])
+
+        # Other days, back-to-back times or another room are fine
+        self.assertEqual(self.post(trainer=self.trainer.id, days_of_week='Tue,Thu').status_code, 201)
+        self.assertEqual(self.post(classroom_name='Blue Classroom', start_time='12:00').status_code, 201)
+        self.assertEqual(self.post(classroom_name='Orange Classroom', trainer=self.trainer.id, days_of_week='Sat').status_code, 201)
+
+        self.assertEqual(self.post(days_of_week='Someday').data['days_of_week'][0][:11], 'Unknown day')
+        self.assertIn('end_time', self.post(start_time='14:00').data)
+
+    def test_days_are_stored_as_a_mask(self):
+        self.assertEqual((self.batch.days_mask, self.batch.days_of_week), (0b10101, 'Mon,Wed,Fri'))
+        self.client.patch(f'/api/batches/{self.batch.id}/', {'days_of_week': 'tuesday - thursday'})
+        self.batch.refresh_from_db()
+        self.assertEqual((self.batch.days_mask, self.batch.days_of_week), (0b1110, 'Tue,Wed,Thu'))
+
+        Batch.objects.filter(pk=self.batch.pk).update(days_of_week='on demand', days_mask=0)
+        self.batch.refresh_from_db()
+        self.batch.save(update_fields=['days_of_week'])
+        self.assertEqual((self.batch.days_mask, self.batch.days_of_week), (0, 'on demand'))
+
+    def test_runs_on_and_today(self):
+        weekend = Batch.objects.create(
+            course='DA', batch_name='Weekend', trainer=self.trainer, start_date=datetime.date(2024, 1, 1),
+            start_time=datetime.time(9), end_time=datetime.time(10), days_of_week='weekends',
+            zoom_link='https://zoom.us/j/1',
+        )
+        Batch.objects.create(
+            course='DA', batch_name='Not started', start_date=datetime.date(2030, 1, 1), days_of_week='Sat',
+        )
+        make_student(1, batch=weekend)
+        make_student(2, batch=weekend, status='DROPPED')
+        saturday = datetime.date(2024, 6, 1)
+        Attendance.objects.create(batch=weekend, student=weekend.students.first(), date=saturday, status='ABSENT')
+
+        response = self.client.get('/api/batches/', {'runs_on': '2024-06-03', 'fields': 'batch_name'})
+        self.assertEqual([row['batch_name'] for row in response.data['results']], ['DS-1'])
+        self.assertEqual(self.client.get('/api/batches/', {'runs_on': 'Monday'}).status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/batches/', {'runs_on': 'today'}).data,
+            self.client.get('/api/batches/', {'runs_on': timezone.localdate().isoformat()}).data,
+        )
+
+        self.client.force_authenticate(self.trainer)
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get('/api/batches/today/', {'date': '2024-06-01'}).data
+        self.assertEqual(sum(1 for query in ctx.captured_queries if query['sql'].startswith('SELECT')), 1)
+        self.assertEqual(data['weekday'], 'Sat')
+        session, = data['sessions']
+        self.assertEqual(
+            (session['batch_name'], session['trainer_name'], session['zoom_link'], session['roster_size'], session['attendance_marked']),
+            ('Weekend', 'trainer', 'https://zoom.us/j/1', 1, True),
+        )
+        self.assertEqual(self.client.get('/api/batches/today/', {'date': '2024-06-02'}).data['sessions'][0]['attendance_marked'], False)
+
+    def test_update_checks_against_other_batches(self):
+        url = f'/api/batches/{self.batch.id}/'
+        self.assertEqual(self.client.patch(url, {'end_time': '12:30'}).status_code, 200)
+        other = Batch.objects.create(
+            course='DA', batch_name='DA-2', start_date=datetime.date(2024, 1, 1), classroom_name='Blue Classroom',
+            start_time=datetime.time(14), end_time=datetime.time(15), days_of_week='Fri',
+        )
+        response = self.client.patch(f'/api/batches/{other.id}/', {'start_time': '12:00'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_conflict_report(self):
+        Batch.objects.create(
+            course='DA', batch_name='DA-2', trainer=self.trainer, start_date=datetime.date(2024, 1, 1),
+            classroom_name='Blue Classroom', start_time=datetime.time(11), end_time=datetime.time(13),
+            days_of_week='Fri-Mon',
+        )
+        Batch.objects.create(
+            course='DA', batch_name='Legacy', start_date=datetime.date(2024, 1, 1), classroom_name='Blue Classroom',
+            start_time=datetime.time(10), end_time=datetime.time(11), days_of_week='alternate days',
+        )
+        report = self.client.get('/api/batches/conflicts/').data
+        self.assertEqual([(entry['resource'], entry['days']) for entry in report], [
+            ('classroom', 'Mon,Fri'), ('trainer', 'Mon,Fri'),
+        ])
+        self.assertEqual((report[1]['trainer_name'], str(report[1]['start_time']), str(report[1]['end_time'])), (
+            'trainer', '11:00:00', '12:00:00',
+        ))
+        self.assertEqual([batch['batch_name'] for batch in report[0]['batches']], ['DS-1', 'DA-2'])
+
+        other = User.objects.create_user('other', password='pass', role=User.Role.TRAINER)
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get('/api/batches/conflicts/').data, [])
+
+
+class BenchmarkToolingTests(TestCase):
+    def test_seed_data_rebuilds_rollups(self):
+        call_command('seed_data', scale=0.0005, stdout=io.StringIO())
+        self.assertEqual((Inquiry.objects.count(), Student.objects.count(), Fee.objects.count()), (100, 25, 250))
+        self.assertEqual(Attendance.objects.count(), 25 * 100)
+        self.assertEqual(list(find_drift(Student, Fee)), [])
+        self.assertEqual(DailyMetrics.objects.aggregate(n=Sum('fee_count'))['n'], 250)
+
+    def test_suite_writes_and_compares_a_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/baseline.json'
+            options = {'scale': 0.0005, 'repeat': 1, 'only': 'inquiries', 'stdout': io.StringIO()}
+            call_command('benchmark_suite', output=path, **options)
+            with open(path) as handle:
+                report = json.load(handle)
+            self.assertEqual(report['results']['GET /api/inquiries/']['queries'], 1)
+            self.assertIn('POST /api/inquiries/<id>/add_followup/', report['results'])
+
+            report['results']['GET /api/inquiries/']['queries'] = 0
+            with open(path, 'w') as handle:
+                json.dump(report, handle)
+            with self.assertRaisesMessage(CommandError, 'GET /api/inquiries/'):
+                call_command('benchmark_suite', compare=path, threshold=100, fail_on_regression=True, **options)
+        self.assertFalse(Inquiry.objects.exists())
+
+
+class DateDefaultTests(APITestMixin, TestCase):
+    @override_settings(TIME_ZONE='Asia/Kolkata')
+    def test_dates_default_to_the_local_day(self):
+        evening = datetime.datetime(2024, 3, 1, 20, 0, tzinfo=datetime.timezone.utc)
+        inquiry = make_inquiry(1)
+        with mock.patch('django.utils.timezone.now', return_value=evening):
+            response = self.client.post('/api/students/', {
+                'inquiry': inquiry.id, 'course': 'Data Science', 'mobile': inquiry.mobile, 'email': inquiry.email,
+            })
+            followup = InquiryFollowup.objects.create(inquiry=inquiry, remark='Called')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['enrollment_date'], '2024-03-02')
+        self.assertEqual(followup.date, datetime.date(2024, 3, 2))
+
+
+class FollowupTests(APITestMixin, TestCase):
+    def test_add_followup_takes_the_inquiry_from_the_url(self):
+        inquiry, other = make_inquiry(1), make_inquiry(2)
+        response = self.client.post(
+            f'/api/inquiries/{inquiry.id}/add_followup/', {'remark': 'Called', 'inquiry': other.id}, format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['inquiry'], inquiry.id)
+        self.assertEqual(list(other.followups.all()), [])
+
+        response = self.client.post(f'/api/inquiries/{inquiry.id}/add_followup/', {'remark': 'Again'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(inquiry.followups.count(), 2)
+
+
+class SQLiteLockingTests(APITestMixin, TransactionTestCase):
+    def test_only_writes_take_the_write_lock(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite transaction mode')
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/outreach/')
+        self.assertFalse(any(query['sql'].startswith('BEGIN') for query in ctx.captured_queries))
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.post('/api/outreach/', {
+                'company_name': 'Acme', 'contact_name': 'HR', 'mode': 'CALL', 'phone_email': 'hr@acme.test',
+            }, format='json')
+        self.assertEqual(ctx.captured_queries[0]['sql'], 'BEGIN IMMEDIATE')
+
+
+class AccessLogTests(TestCase):
+    def test_logs_api_requests_for_replay(self):
+        manager = User.objects.create_user('manager', password='pass', role=User.Role.MANAGER)
+        with tempfile.NamedTemporaryFile('r', suffix='.log') as log:
+            with override_settings(ACCESS_LOG_PATH=log.name, ACCESS_LOG_BODIES=True):
+                client = APIClient()  # middleware is loaded on the client's first request
+                client.post('/api/auth/token/', {'username': 'manager', 'password': 'pass'}, format='json')
+                client.force_authenticate(manager)
+                client.get('/api/inquiries/?page_size=5')
+                client.post('/api/outreach/', {'company_name': 'Acme'}, format='json')
+            login, listing, create = [json.loads(line) for line in log]
+
+        self.assertNotIn('body', login)
+        self.assertEqual(
+            {key: listing[key] for key in ('method', 'path', 'status', 'role')},
+            {'method': 'GET', 'path': '/api/inquiries/?page_size=5', 'status': 200, 'role': 'MANAGER'},
+        )
+        self.assertEqual((create['status'], json.loads(create['body'])), (400, {'company_name': 'Acme'}))
+        self.assertEqual(create['content_type'], 'application/json')
+
+
+@override_settings(REQUEST_PROFILING_SAMPLE_RATE=1.0)
+class RequestProfilingTests(APITestMixin, TestCase):
+    def test_server_timing_header(self):
+        make_inquiry(1)
+        response = self.client.get('/api/inquiries/')
+        timing = dict(metric.split(';', 1) for metric in response['Server-Timing'].split(', '))
+        self.assertEqual(set(timing), {'db', 'serialize', 'view', 'render', 'total'})
+        self.assertIn('desc="', timing['db'])
+
+        with override_settings(REQUEST_PROFILING_SAMPLE_RATE=0.0):
+            self.assertNotIn('Server-Timing', self.client.get('/api/inquiries/'))
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_route_and_sql(self):
+        with self.assertLogs('api.profiling', 'WARNING') as logs:
+            self.client.get('/api/inquiries/?page_size=5')
+        self.assertIn('[inquiry-list (', logs.output[0])
+        self.assertIn('FROM "api_inquiry"', logs.output[0])
+
+    def test_repeated_query_shapes(self):
+        profile = RequestProfile()
+        execute = lambda sql, params, many, context: None  # noqa: E731
+        for size in (1, 3, 2):
+            sql = f'SELECT * FROM "api_fee" WHERE "student_id" IN ({", ".join(["%s"] * size)})'
+            profile(execute, sql, [1] * size, False, {})
+        profile(execute, 'SELECT 1', [], False, {})
+        self.assertEqual(profile.repeated_shapes(3), [(3, 'SELECT * FROM "api_fee" WHERE "student_id" IN (...)')])
+
+
+class MetricsTests(APITestMixin, TestCase):
+    def sample(self, name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    @override_settings(METRICS_TOKEN='scrape-token')
+    def test_metrics_endpoint(self):
+        student = make_student(1)
+        listed = self.sample('api_requests_total', route='inquiry-list', action='list', method='GET', status='200')
+        paid = self.sample('api_fees_collected_amount_total', mode='UPI')
+        hits = self.sample('api_cache_requests_total', endpoint='batch-list', outcome='hit')
+
+        self.client.get('/api/inquiries/')
+        self.client.get('/api/inquiries/')
+        self.client.get('/api/batches/')
+        self.client.get('/api/batches/')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/fees/', {'student': student.id, 'amount': '1500.00', 'mode': 'UPI'}, format='json')
+
+        self.assertEqual(
+            self.sample('api_requests_total', route='inquiry-list', action='list', method='GET', status='200'), listed + 2,
+        )
+        self.assertEqual(self.sample('api_fees_collected_amount_total', mode='UPI'), paid + 1500)
+        self.assertEqual(self.sample('api_cache_requests_total', endpoint='batch-list', outcome='hit'), hits + 1)
+        self.assertGreater(self.sample('api_db_queries_per_request_count', route='fee-list', action='create'), 0)
+
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-token')
+        self.assertEqual(response['Content-Type'], CONTENT_TYPE_LATEST)
+        self.assertIn('api_request_duration_seconds_bucket{action="list",le="0.005",route="inquiry-list"}', response.content.decode())
+
+    def test_metrics_are_hidden_without_a_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+
+HAS_REPLICA = 'replica' in settings.DATABASES
+
+
+@skipUnless(HAS_REPLICA, 'needs a replica database: run with --settings=backend.test_settings')
+@override_settings(READ_REPLICA='replica')
+class ReplicaRoutingTests(APITestMixin, TestCase):
+    databases = {'default', 'replica'} if HAS_REPLICA else {'default'}
+
+    def setUp(self):
+        super().setUp()
+        # Rows only the replica has show which database served a read
+        Inquiry.objects.using('replica').bulk_create([Inquiry(
+            name='Replica Lead', mobile='9999900000', email='replica@example.com', college='ABC College',
+            degree='B.Tech', branch='CS', passout_year=2024, interested_course='Data Science', source='LinkedIn',
+        )])
+        self.other = APIClient()
+        self.other.force_authenticate(User.objects.create_user('manager2', role=User.Role.MANAGER))
+        cache.clear()
+
+    def names(self, client, url='/api/inquiries/'):
+        return [row['name'] for row in client.get(url).data['results']]
+
+    def test_reads_go_to_the_replica_until_the_user_writes(self):
+        make_inquiry(1)
+        self.assertEqual(self.names(self.client), ['Replica Lead'])
+        replica_id = Inquiry.objects.using('replica').get().id
+        self.assertEqual(self.client.get(f'/api/inquiries/{replica_id}/').data['name'], 'Replica Lead')
+        self.assertEqual(self.client.get('/api/users/me/').data['username'], 'manager')
+
+        response = self.client.post('/api/inquiries/', {
+            'name': 'Fresh Lead', 'mobile': '9000000002', 'email': 'fresh@example.com', 'college': 'ABC College',
+            'degree': 'B.Tech', 'branch': 'CS', 'passout_year': 2024, 'interested_course': 'Data Science',
+            'source': 'LinkedIn',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.names(self.client), ['Fresh Lead', 'Lead 1'])
+        self.assertEqual(self.names(self.other), ['Replica Lead'])
+
+    def test_admin_changelists_read_from_the_replica(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pass'))
+        response = self.client.get('/admin/api/inquiry/')
+        self.assertContains(response, 'Replica Lead')
+
+    def test_streamed_exports_read_from_the_replica(self):
+        make_inquiry(1)
+        response = self.client.get('/api/inquiries/export/?as=csv')
+        body = b''.join(response.streaming_content).decode()
+        self.assertIn('Replica Lead', body)
+        self.assertNotIn('Lead 1', body)
+
+    def test_responses_read_during_the_lag_window_are_not_cached(self):
+        self.client.post('/api/batches/', {'course': 'DS', 'batch_name': 'New', 'start_date': '2024-01-01'}, format='json')
+        self.assertNotIn('X-Cache', self.other.get('/api/batches/'))
+
+        cache.delete(WRITTEN_KEY.format('api.batch'))
+        self.assertEqual(self.other.get('/api/batches/')['X-Cache'], 'MISS')
+        self.assertEqual(self.other.get('/api/batches/')['X-Cache'], 'HIT')
+
+
+class ReplicaCacheCheckTests(TestCase):
+    def test_replica_with_a_process_local_cache_warns(self):
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://x'}}
+        with override_settings(READ_REPLICA='replica', CACHES=locmem):
+            self.assertEqual([message.id for message in replica_needs_shared_cache(None)], ['api.W001'])
+        with override_settings(READ_REPLICA='replica', CACHES=redis):
+            self.assertEqual(replica_needs_shared_cache(None), [])
+        with override_settings(READ_REPLICA=None, CACHES=locmem):
+            self.assertEqual(replica_needs_shared_cache(None), [])
+
+
+class ExportTests(APITestMixin, TestCase):
+    def read(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_csv_export_respects_role_scope(self):
+        counselor = User.objects.create_user('counselor', password='pass', role=User.Role.COUNSELOR)
+        make_inquiry(1, name='Mine', created_by=counselor)
+        make_inquiry(2, name='Theirs', created_by=self.manager)
+
+        self.client.force_authenticate(counselor)
+        response = self.client.get('/api/inquiries/export/')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = self.read(response).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,name,mobile'))
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Mine', lines[1])
+
+    def test_ndjson_export_applies_list_filters(self):
+        batch = Batch.objects.create(course='SQL', batch_name='SQL-1', start_date=datetime.date(2024, 1, 1))
+        student = make_student(1, batch=batch)
+        Attendance.objects.create(batch=batch, student=student, date=datetime.date(2024, 3, 1), status='ABSENT')
+        Attendance.objects.create(batch=batch, student=student, date=datetime.date(2024, 3, 2), status='ABSENT')
+
+        response = self.client.get('/api/attendance/export/', {'as': 'ndjson', 'date': '2024-03-02'})
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(rows, [{
+            'id': rows[0]['id'], 'date': '2024-03-02', 'lecture_time': None, 'batch': 'SQL-1',
+            'student': 'Lead 1', 'mobile': student.mobile, 'status': 'ABSENT', 'topic_taught': None,
+            'remarks': None, 'trainer': None,
+        }])
+
+    def test_xlsx_export(self):
+        student = make_student(1)
+        Fee.objects.create(student=student, amount=1200, mode='UPI', collected_by=self.manager)
+        response = self.client.get('/api/fees/export/', {'as': 'xlsx'})
+        workbook = load_workbook(io.BytesIO(self.read(response)), read_only=True)
+        rows = list(workbook.active.values)
+        self.assertEqual(rows[0][:4], ('id', 'student', 'mobile', 'amount'))
+        self.assertEqual(rows[1][1:5], ('Lead 1', student.mobile, 1200, 'UPI'))
+
+    def test_unknown_format_is_rejected(self):
+        self.assertEqual(self.client.get('/api/students/export/', {'as': 'pdf'}).status_code, 400)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(APITestMixin, TestCase):
+    def sync(self, url, cursor):
+        response = self.client.get(url, {'changed_since': cursor, 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'no-store')
+        return response.data
+
+    def drain(self, url, cursor='0'):
+        upserts, deletions = [], []
+        while True:
+            data = self.sync(url, cursor)
+            upserts += [row['id'] for row in data['upserts']]
+            deletions += data['deletions']
+            cursor = data['cursor']
+            if not data['has_more']:
+                return upserts, deletions, cursor
+
+    def test_changes_and_deletions_since_cursor(self):
+        inquiries = [make_inquiry(i) for i in range(3)]
+        upserts, deletions, cursor = self.drain('/api/inquiries/')
+        self.assertEqual(upserts, [inquiry.id for inquiry in inquiries])
+        self.assertEqual(deletions, [])
+        self.assertEqual(self.drain('/api/inquiries/', cursor)[:2], ([], []))
+
+        inquiries[0].lead_status = 'HOT'
+        inquiries[0].save()
+        deleted_id = inquiries[1].id
+        inquiries[1].delete()
+        upserts, deletions, cursor = self.drain('/api/inquiries/', cursor)
+        self.assertEqual(upserts, [inquiries[0].id])
+        self.assertEqual(deletions, [deleted_id])
+
+    def test_nested_and_copied_changes_touch_the_embedding_rows(self):
+        batch = Batch.objects.create(course='SQL', batch_name='SQL-1', start_date=datetime.date(2024, 1, 1))
+        student = make_student(1, batch=batch)
+        fee = Fee.objects.create(student=student, amount=500, mode='UPI')
+        _, _, student_cursor = self.drain('/api/students/')
+        _, _, fee_cursor = self.drain('/api/fees/')
+
+        self.client.post(f'/api/inquiries/{student.inquiry_id}/add_followup/', {'remark': 'Called'}, format='json')
+        self.assertEqual(self.drain('/api/students/', student_cursor)[0], [student.id])
+
+        inquiry = student.inquiry
+        inquiry.name = 'Renamed Lead'
+        inquiry.save()
+        upserts, _, fee_cursor = self.drain('/api/fees/', fee_cursor)
+        self.assertEqual(upserts, [fee.id])
+
+        inquiry.remark = 'No name change'
+        inquiry.save()
+        self.assertEqual(self.drain('/api/fees/', fee_cursor)[0], [])
+
+    def test_stale_and_invalid_cursors(self):
+        old = timezone.now() - datetime.timedelta(days=91)
+        response = self.client.get('/api/batches/', {'changed_since': encode_cursor((old, 0), (old, 0))})
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(self.client.get('/api/batches/', {'changed_since': 'bogus'}).status_code, 400)
+
+    def test_prune_tombstones(self):
+        make_inquiry(1).delete()
+        make_inquiry(2).delete()
+        Tombstone.objects.filter(pk=Tombstone.objects.order_by('id').first().pk).update(
+            deleted_at=timezone.now() - datetime.timedelta(days=100),
+        )
+        call_command('prune_tombstones', stdout=io.StringIO())
+        self.assertEqual(Tombstone.objects.count(), 1)
+
+
+class LiveEventsTests(APITestMixin, TestCase):
+    def published(self, work):
+        with mock.patch('api.events.deliver') as deliver, self.captureOnCommitCallbacks(execute=True):
+            work()
+        return [json.loads(call.args[0]) for call in deliver.call_args_list]
+
+    def test_writes_publish_events_on_commit(self):
+        def work():
+            student = make_student(1)
+            Fee.objects.create(student=student, amount=1200, mode='UPI')
+
+        published = self.published(work)
+        self.assertEqual(
+            [event['type'] for event in published if event['type'] != 'counters'],
+            ['inquiry.created', 'admission', 'fee.collected'],
+        )
+        fee = next(event for event in published if event['type'] == 'fee.collected')
+        self.assertEqual((fee['data']['student_name'], fee['data']['amount']), ('Lead 1', 1200))
+        self.assertEqual(fee['roles'], ['MANAGER', 'HR_ADMIN'])
+        self.assertIn({'fee_count': 1, 'fees_total': '1200', 'fees_upi': '1200'}, [
+            {key: value for key, value in event['data'].items() if key != 'date'}
+            for event in published if event['type'] == 'counters'
+        ])
+
+    def test_bulk_mark_publishes_one_attendance_event(self):
+        trainer = User.objects.create_user('trainer', role=User.Role.TRAINER)
+        batch = Batch.objects.create(course='DS', batch_name='DS-1', trainer=trainer, start_date=datetime.date(2024, 1, 1))
+        students = [make_student(i, batch=batch) for i in range(3)]
+        published = self.published(lambda: self.client.post('/api/attendance/bulk_mark/', {
+            'batch': batch.id, 'date': '2024-03-04', 'records': [
+                {'student': student.id, 'status': status}
+                for student, status in zip(students, ['PRESENT_ONLINE', 'PRESENT_ONLINE', 'ABSENT'])
+            ],
+        }, format='json'))
+        self.assertEqual([(event['type'], event['data']['counts'], event['users']) for event in published], [
+            ('attendance.marked', {'PRESENT_ONLINE': 2, 'ABSENT': 1}, [trainer.id, self.manager.id]),
+        ])
+
+    async def test_subscribers_only_receive_events_for_their_role(self):
+        trainer = events.subscribe(User(id=7, role=User.Role.TRAINER))
+        other_trainer = events.subscribe(User(id=8, role=User.Role.TRAINER))
+        manager = events.subscribe(User(id=9, role=User.Role.MANAGER))
+        try:
+            events.deliver(json.dumps({
+                'type': 'attendance.marked', 'data': {'batch': 1}, 'roles': ['MANAGER', 'HR_ADMIN'], 'users': [7],
+            }))
+            await asyncio.sleep(0)
+            self.assertEqual(trainer.queue.get_nowait(), {'type': 'attendance.marked', 'data': {'batch': 1}})
+            self.assertEqual(manager.queue.qsize(), 1)
+            self.assertTrue(other_trainer.queue.empty())
+        finally:
+            for subscriber in (trainer, other_trainer, manager):
+                events.unsubscribe(subscriber)
+
+    async def test_stream_is_served_over_asgi_only(self):
+        token = await sync_to_async(RoleTokenObtainPairSerializer.get_token)(self.manager)
+        headers = {'Authorization': f'Bearer {token.access_token}'}
+        response = await AsyncClient().get('/api/events/', headers=headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+
+        event = {'type': 'counters', 'data': {'inquiries': 1}, 'roles': None, 'users': []}
+        await sync_to_async(events.deliver)(json.dumps(event))
+        self.assertEqual(await anext(stream), b'event: counters\ndata: {"inquiries":1}\n\n')
+        await stream.aclose()
+
+        response = await sync_to_async(self.client.get)('/api/events/', HTTP_AUTHORIZATION=headers['Authorization'])
+        self.assertEqual(response.status_code, 501)
+
+
+class JSONRenderingTests(APITestMixin, TestCase):
+    def test_orjson_output_matches_drf(self):
+        data = {
+            'amount': Decimal('1200.50'),
+            'at': datetime.datetime(2024, 3, 1, 9, 30, 0, 250000, tzinfo=datetime.timezone.utc),
+            'ist': datetime.datetime(2024, 3, 1, 15, 0, tzinfo=datetime.timezone(datetime.timedelta(hours=5.5))),
+            'day': datetime.date(2024, 3, 1),
+            'time': datetime.time(9, 30),
+            'id': uuid.UUID(int=1),
+            'label': gettext_lazy('Hot'),
+            'text': 'Priya \u2028 Sharma \u2029 – पुणे',
+            'nested': [{1: None, 'ok': True}, 1.5],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(data, 'application/json; indent=2'),
+                         JSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_parser(self):
+        self.assertEqual(ORJSONParser().parse(io.BytesIO('{"name": "पुणे", "n": [1, 2.5]}'.encode())),
+                         {'name': 'पुणे', 'n': [1, 2.5]})
+        for body in (b'{"n": NaN}', b'{"n": 1'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+    def test_api_responses_are_compressed_above_threshold(self):
+        for i in range(20):
+            make_inquiry(i)
+        response = self.client.get('/api/inquiries/', HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['results'][0]['name'], 'Lead 19')
+
+        self.assertFalse(self.client.get('/api/inquiries/').has_header('Content-Encoding'))
+        small = self.client.get('/api/users/me/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(small.has_header('Content-Encoding'))
+
+        User.objects.create_user('counselor', password='pass', role=User.Role.COUNSELOR)
+        with self.settings(COMPRESSION_MIN_BYTES=0):
+            response = self.client.post('/api/auth/token/', {'username': 'counselor', 'password': 'pass'},
+                                        HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class ValuesListTests(APITestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        batch = Batch.objects.create(course='Data Science', batch_name='DS-1', trainer=trainer,
+                                     start_date=datetime.date(2024, 1, 1))
+        admitted = make_student(1, batch=batch)
+        make_inquiry(2, created_by=self.manager, fees_told=Decimal('45000.50'),
+                     next_followup_date=datetime.date(2024, 3, 1), remark='Call   back')
+        make_inquiry(3, lead_status='ENROLLED')
+        Fee.objects.create(student=admitted, amount=Decimal('500.25'), mode='UPI', collected_by=self.manager)
+        Fee.objects.create(student=admitted, amount=700, mode='CASH', utr='UTR1')
+        Fee.objects.create(student=admitted, amount=100, mode='CASH', collected_by=trainer)
+        for day, lecture_time, marked_by in ((1, datetime.time(9, 30), trainer), (2, None, None), (3, None, trainer)):
+            Attendance.objects.create(batch=batch, student=admitted, date=datetime.date(2024, 2, day),
+                                      lecture_time=lecture_time, status='PRESENT_ONLINE', trainer=marked_by)
+        PlacementOutreach.objects.create(officer=self.manager, company_name='Acme', contact_name='HR', mode='CALL',
+                                         phone_email='hr@acme.test')
+        PlacementOutreach.objects.create(company_name='Globex', contact_name='CTO', mode='EMAIL',
+                                         phone_email='cto@globex.test', remark='Warm')
+        PlacementOutreach.objects.create(officer=trainer, company_name='Initech', contact_name='HR', mode='VISIT',
+                                         phone_email='hr@initech.test')
+
+    def get_both(self, url):
+        from .values import build_rows
+
+        cache.clear()
+        with mock.patch('api.values.build_rows', wraps=build_rows) as fast:
+            response = self.client.get(url)
+        cache.clear()
+        with mock.patch('api.values.ValuesListMixin.fast_list', False):
+            expected = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, expected, fast.called
+
+    def test_output_is_byte_identical_to_serializers(self):
+        for endpoint in ('inquiries', 'fees', 'attendance', 'outreach'):
+            for query in ('', '?page_size=2', '?fields=id,student_name,created_by_name,is_admitted,officer_name'):
+                url = f'/api/{endpoint}/{query}'
+                response, expected, fast = self.get_both(url)
+                self.assertTrue(fast, url)
+                self.assertEqual(response.content, expected.content, url)
+
+        response, _, _ = self.get_both('/api/fees/?page_size=2')
+        page = self.client.get(response.data['next'])
+        self.assertEqual([row['id'] for row in page.data['results']], [Fee.objects.order_by('id').first().id])
+
+    def test_null_relation_omits_dotted_fields_like_drf(self):
+        rows = {row['utr']: row for row in self.client.get('/api/fees/').data['results']}
+        self.assertNotIn('collected_by_name', rows['UTR1'])
+        self.assertIsNone(rows['UTR1']['collected_by'])
+
+    def test_nested_expansion_uses_serializers(self):
+        response, expected, fast = self.get_both('/api/inquiries/?expand=followups')
+        self.assertFalse(fast)
+        self.assertEqual(response.content, expected.content)
+
+    def test_single_query_per_page(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/inquiries/')
+        selects = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('SELECT')]
+        self.assertEqual(len(selects), 1)
+        self.assertIn('EXISTS', selects[0])
+
+
+class AdminTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('root', password='pass', role=User.Role.MANAGER)
+        self.client.force_login(self.admin)
+        trainer = User.objects.create_user('trainer', password='pass', role=User.Role.TRAINER)
+        self.batch = Batch.objects.create(course='Data Science', batch_name='DS-1', trainer=trainer,
+                                          start_date=datetime.date(2024, 1, 1))
+        self.created = 0
+
+    def add_rows(self, count):
+        for _ in range(count):
+            self.created += 1
+            student = make_student(self.created, batch=self.batch)
+            InquiryFollowup.objects.create(inquiry=student.inquiry, remark='Called', created_by=self.admin)
+            Fee.objects.create(student=student, amount=500, mode='UPI', collected_by=self.admin)
+            Attendance.objects.create(batch=self.batch, student=student, date=datetime.date(2024, 2, 1),
+                                      status='PRESENT_OFFLINE', trainer=self.admin)
+            PlacementOutreach.objects.create(officer=self.admin, company_name='Acme', contact_name='HR', mode='CALL',
+                                             phone_email='hr@acme.test')
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        urls = [f'/admin/api/{name}/' for name in (
+            'inquiry', 'inquiryfollowup', 'batch', 'student', 'fee', 'attendance', 'placementoutreach',
+        )]
+        self.add_rows(2)
+        small = {url: self.count_queries(url) for url in urls}
+        self.add_rows(5)
+        self.assertEqual({url: self.count_queries(url) for url in urls}, small)
+
+    def test_change_forms_use_autocomplete(self):
+        self.add_rows(3)
+        fee = Fee.objects.first()
+        body = self.client.get(f'/admin/api/fee/{fee.id}/change/').content.decode()
+        self.assertIn('admin-autocomplete', body)
+        # Only the selected student is rendered into the form
+        self.assertIn(fee.student.inquiry.name, body)
+        others = Student.objects.exclude(id=fee.student_id).select_related('inquiry')
+        self.assertFalse(any(student.inquiry.name in body for student in others))
+
+    def test_large_changelists_show_the_planner_estimate(self):
+        self.add_rows(2)
+        with mock.patch('api.admin.planner_estimate', return_value=2_500_000), \
+                CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/admin/api/fee/')
+        self.assertEqual(response.context['cl'].result_count, 2_500_000)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in ctx.captured_queries))
+
+        with mock.patch('api.admin.planner_estimate', return_value=40):
+            response = self.client.get('/admin/api/fee/')
+        self.assertEqual(response.context['cl'].result_count, 2)
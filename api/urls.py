@@ -4,9 +4,10 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
+from .async_views import dashboard_stats as async_dashboard_stats, events
 from .views import (
     InquiryViewSet, BatchViewSet, StudentViewSet, FeeViewSet,
-    AttendanceViewSet, PlacementOutreachViewSet, DashboardViewSet, UserViewSet
+    AttendanceViewSet, PlacementOutreachViewSet, DashboardViewSet, UserViewSet, SearchViewSet
 )
 
 router = DefaultRouter()
@@ -18,9 +19,12 @@ router.register(r'fees', FeeViewSet, basename='fee')
 router.register(r'attendance', AttendanceViewSet, basename='attendance')
 router.register(r'outreach', PlacementOutreachViewSet, basename='outreach')
 router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'search', SearchViewSet, basename='search')
 
 urlpatterns = [
     path('auth/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('async/dashboard/stats/', async_dashboard_stats, name='dashboard-stats-async'),
+    path('events/', events, name='events'),
     path('', include(router.urls)),
 ]
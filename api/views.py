@@ -1,11 +1,34 @@
+import datetime
+
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models import Sum, Count, Q
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from .models import User, Inquiry, InquiryFollowup, Batch, Student, Fee, Attendance, PlacementOutreach
 from .serializers import (
     UserSerializer, InquirySerializer, InquiryFollowupSerializer, BatchSerializer, StudentSerializer,
-    FeeSerializer, AttendanceSerializer, PlacementOutreachSerializer
+    FeeSerializer, AttendanceSerializer, BulkAttendanceSerializer, PlacementOutreachSerializer
+)
+from .attendance import build_attendance_matrix
+from .dashboard import dashboard_stats
+from .events import attendance_marked
+from .scheduling import running_on, schedule_conflicts
+from .weekdays import WEEKDAYS
+from .exports import ExportMixin
+from .routers import ReplicaReadsMixin
+from .shaping import ShapedQuerysetMixin
+from .sync import SyncMixin
+from .values import ValuesListMixin
+from .cache import cache_response, get_stats as get_cache_stats
+from .search import search, search_filter
+from .pagination import (
+    KeysetPagination, InquiryPagination, FeePagination, AttendancePagination,
+    PlacementOutreachPagination, ReferenceDataPagination
 )
 
 # Custom Permissions
@@ -29,24 +52,83 @@ class IsManager(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.role == User.Role.MANAGER or request.user.is_superuser
 
-class InquiryViewSet(viewsets.ModelViewSet):
+def query_date(request, param):
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({param: 'Enter a date as YYYY-MM-DD.'})
+    return parsed
+
+def query_day(request, param):
+    """Like query_date(), but also accepts "today"."""
+    if request.query_params.get(param) == 'today':
+        return timezone.localdate()
+    return query_date(request, param)
+
+def local_day_start(day):
+    """The aware datetime at which ``day`` starts in the current time zone."""
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+def scope_inquiries(queryset, user):
+    if user.role == User.Role.COUNSELOR:
+        return queryset.filter(created_by_id=user.id)
+    if user.role in [User.Role.HR_ADMIN, User.Role.MANAGER]:
+        return queryset
+    return queryset.none()
+
+class InquiryViewSet(ReplicaReadsMixin, SyncMixin, ValuesListMixin, ExportMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = InquirySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = InquiryPagination
+    export_filename = 'inquiries'
+    export_columns = [
+        ('id', 'id'), ('name', 'name'), ('mobile', 'mobile'), ('email', 'email'), ('college', 'college'),
+        ('degree', 'degree'), ('branch', 'branch'), ('passout_year', 'passout_year'),
+        ('interested_course', 'interested_course'), ('source', 'source'), ('lead_status', 'lead_status'),
+        ('fees_told', 'fees_told'), ('next_followup_date', 'next_followup_date'), ('remark', 'remark'),
+        ('created_by', 'created_by__username'), ('created_at', 'created_at'),
+    ]
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Inquiry.objects.none()
+        queryset = scope_inquiries(self.shape_queryset(Inquiry.objects.all()), self.request.user)
 
-        if user.role == User.Role.COUNSELOR:
-            queryset = Inquiry.objects.filter(created_by=user)
-        elif user.role in [User.Role.HR_ADMIN, User.Role.MANAGER]:
-            queryset = Inquiry.objects.all()
-        
         # Search functionality
-        search = self.request.query_params.get('search')
-        if search:
-            queryset = queryset.filter(Q(name__icontains=search) | Q(mobile__icontains=search))
-        
+        term = self.request.query_params.get('search')
+        if term:
+            queryset = search_filter(queryset, 'inquiry', term)
+
+        lead_status = self.request.query_params.get('lead_status')
+        if lead_status:
+            queryset = queryset.filter(lead_status=lead_status)
+
+        course = self.request.query_params.get('interested_course')
+        if course:
+            queryset = queryset.filter(interested_course=course)
+        college = self.request.query_params.get('college')
+        if college:
+            queryset = queryset.filter(college__icontains=college)
+        created_by_name = self.request.query_params.get('created_by_name')
+        if created_by_name:
+            queryset = queryset.filter(created_by__username__icontains=created_by_name)
+
+        # Local calendar days, bounded on created_at itself so its index can be used
+        created_from = query_date(self.request, 'created_from')
+        if created_from:
+            queryset = queryset.filter(created_at__gte=local_day_start(created_from))
+        created_to = query_date(self.request, 'created_to')
+        if created_to:
+            queryset = queryset.filter(created_at__lt=local_day_start(created_to + datetime.timedelta(days=1)))
+
+        # Follow-up queue: open leads due on or before the given date
+        followup_due = query_date(self.request, 'followup_due')
+        if followup_due:
+            queryset = queryset.exclude(lead_status='ENROLLED').filter(next_followup_date__lte=followup_due)
+
         return queryset
 
     def perform_create(self, serializer):
@@ -55,7 +137,7 @@ class InquiryViewSet(viewsets.ModelViewSet):
         # But wait, perform_create is called after validation. 
         # If 'created_by' is in validated_data, it stays. If not, we set it to current user.
         if 'created_by' not in serializer.validated_data:
-            serializer.save(created_by=self.request.user)
+            serializer.save(created_by_id=self.request.user.id)
         else:
             serializer.save()
 
@@ -64,113 +146,291 @@ class InquiryViewSet(viewsets.ModelViewSet):
         inquiry = self.get_object()
         serializer = InquiryFollowupSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(inquiry=inquiry, created_by=request.user)
+            serializer.save(inquiry=inquiry, created_by_id=request.user.id)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class BatchViewSet(viewsets.ModelViewSet):
+class BatchViewSet(ReplicaReadsMixin, SyncMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = BatchSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ReferenceDataPagination
 
     def get_queryset(self):
+        queryset = self.scope(self.shape_queryset(Batch.objects.all()))
+        runs_on = query_day(self.request, 'runs_on')
+        if runs_on:
+            queryset = running_on(queryset, runs_on)
+        return queryset
+
+    def scope(self, queryset):
         user = self.request.user
         if user.role == User.Role.TRAINER:
-            return Batch.objects.filter(trainer=user)
-        return Batch.objects.all()
+            return queryset.filter(trainer_id=user.id)
+        return queryset
+
+    @cache_response(Batch, User, per_user_roles=(User.Role.TRAINER,), daily=True)  # ?runs_on=today
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response(Batch, User, per_user_roles=(User.Role.TRAINER,))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=True, methods=['get'])
+    def attendance_matrix(self, request, pk=None):
+        batch = self.get_object()
+        return Response(build_attendance_matrix(batch, query_date(request, 'from'), query_date(request, 'to')))
+
+    @action(detail=False, methods=['get'])
+    def today(self, request):
+        """The day's sessions (?date=, default today) with roster size, in one query."""
+        day = query_day(request, 'date') or timezone.localdate()
+        sessions = (
+            running_on(self.scope(Batch.objects.all()), day)
+            .annotate(
+                trainer_name=F('trainer__username'),
+                roster_size=Count('students', filter=Q(students__status='ACTIVE')),
+                attendance_marked=Exists(Attendance.objects.filter(batch=OuterRef('pk'), date=day)),
+            )
+            .order_by('start_time', 'id')
+            .values(
+                'id', 'batch_name', 'course', 'trainer', 'trainer_name', 'start_time', 'end_time', 'classroom_name',
+                'zoom_link', 'zoom_meeting_id', 'zoom_meeting_passcode', 'zoom_host_account',
+                'roster_size', 'attendance_marked',
+            )
+        )
+        return Response({'date': day, 'weekday': WEEKDAYS[day.weekday()], 'sessions': list(sessions)})
+
+    @action(detail=False, methods=['get'])
+    @cache_response(Batch, User, per_user_roles=(User.Role.TRAINER,))
+    def conflicts(self, request):
+        """Every pair of batches double-booking a trainer or classroom; trainers see pairs involving their own."""
+        report = schedule_conflicts()
+        if request.user.role == User.Role.TRAINER:
+            own = set(Batch.objects.filter(trainer_id=request.user.id).values_list('id', flat=True))
+            report = [entry for entry in report if any(batch['id'] in own for batch in entry['batches'])]
+        return Response(report)
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(ReplicaReadsMixin, SyncMixin, ExportMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    export_filename = 'students'
+    export_columns = [
+        ('id', 'id'), ('name', 'inquiry__name'), ('mobile', 'mobile'), ('email', 'email'), ('course', 'course'),
+        ('total_fees', 'total_fees'), ('amount_paid', 'amount_paid'), ('balance_due', 'balance_due'),
+        ('last_payment_at', 'last_payment_at'), ('batch', 'batch__batch_name'),
+        ('enrollment_date', 'enrollment_date'), ('status', 'status'),
+    ]
+    # Range filters on the indexed fee ledger, e.g. ?balance_due__gt=0
+    ledger_filters = ('amount_paid', 'balance_due', 'last_payment_at', 'payment_count')
     queryset = Student.objects.all()
     
     def get_queryset(self):
-        queryset = Student.objects.all()
+        queryset = self.shape_queryset(Student.objects.all())
         batch_id = self.request.query_params.get('batch')
         mobile = self.request.query_params.get('mobile')
+        student_status = self.request.query_params.get('status')
         
         if batch_id:
             queryset = queryset.filter(batch_id=batch_id)
         if mobile:
             queryset = queryset.filter(mobile=mobile)
-            
+        if student_status:
+            queryset = queryset.filter(status=student_status)
+
+        term = self.request.query_params.get('search')
+        if term:
+            queryset = search_filter(queryset, 'student', term)
+        course = self.request.query_params.get('course')
+        if course:
+            queryset = queryset.filter(course=course)
+        college = self.request.query_params.get('college')
+        if college:
+            queryset = queryset.filter(inquiry__college__icontains=college)
+        created_by_name = self.request.query_params.get('created_by_name')
+        if created_by_name:
+            queryset = queryset.filter(inquiry__created_by__username__icontains=created_by_name)
+        enrolled_from = query_date(self.request, 'enrolled_from')
+        if enrolled_from:
+            queryset = queryset.filter(enrollment_date__gte=enrolled_from)
+        enrolled_to = query_date(self.request, 'enrolled_to')
+        if enrolled_to:
+            queryset = queryset.filter(enrollment_date__lte=enrolled_to)
+
+        return self.filter_ledger(queryset)
+
+    def filter_ledger(self, queryset):
+        for name in self.ledger_filters:
+            field = Student._meta.get_field(name)
+            for lookup in ('gt', 'gte', 'lt', 'lte'):
+                param = f'{name}__{lookup}'
+                if param not in self.request.query_params:
+                    continue
+                try:
+                    value = field.to_python(self.request.query_params[param])
+                except DjangoValidationError as exc:
+                    raise ValidationError({param: exc.messages})
+                queryset = queryset.filter(**{param: value})
         return queryset
 
-class FeeViewSet(viewsets.ModelViewSet):
+class FeeViewSet(ReplicaReadsMixin, SyncMixin, ValuesListMixin, ExportMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = FeeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FeePagination
+    export_filename = 'fees'
+    export_columns = [
+        ('id', 'id'), ('student', 'student__inquiry__name'), ('mobile', 'student__mobile'), ('amount', 'amount'),
+        ('mode', 'mode'), ('utr', 'utr'), ('date_collected', 'date_collected'),
+        ('collected_by', 'collected_by__username'),
+    ]
     queryset = Fee.objects.all()
 
+    def get_queryset(self):
+        return self.shape_queryset(Fee.objects.all())
+
     def perform_create(self, serializer):
-        serializer.save(collected_by=self.request.user)
+        serializer.save(collected_by_id=self.request.user.id)
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(ReplicaReadsMixin, SyncMixin, ValuesListMixin, ExportMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AttendancePagination
+    export_filename = 'attendance'
+    export_columns = [
+        ('id', 'id'), ('date', 'date'), ('lecture_time', 'lecture_time'), ('batch', 'batch__batch_name'),
+        ('student', 'student__inquiry__name'), ('mobile', 'student__mobile'), ('status', 'status'),
+        ('topic_taught', 'topic_taught'), ('remarks', 'remarks'), ('trainer', 'trainer__username'),
+    ]
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Attendance.objects.all()
+        queryset = self.shape_queryset(Attendance.objects.all())
         
         if user.role == User.Role.TRAINER:
-            queryset = queryset.filter(batch__trainer=user)
+            queryset = queryset.filter(batch__trainer_id=user.id)
             
-        date_param = self.request.query_params.get('date')
-        if date_param:
-            queryset = queryset.filter(date=date_param)
+        day = query_date(self.request, 'date')
+        if day:
+            queryset = queryset.filter(date=day)
             
         return queryset
 
     def perform_create(self, serializer):
-        serializer.save(trainer=self.request.user)
+        serializer.save(trainer_id=self.request.user.id)
+
+    @action(detail=False, methods=['post'])
+    def bulk_mark(self, request):
+        serializer = BulkAttendanceSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        batch = data['batch']
+
+        if request.user.role == User.Role.TRAINER and batch.trainer_id != request.user.id:
+            raise PermissionDenied('You can only mark attendance for your own batches.')
 
-class PlacementOutreachViewSet(viewsets.ModelViewSet):
+        records = [
+            Attendance(
+                batch=batch,
+                student_id=record['student'],
+                date=data['date'],
+                lecture_time=data.get('lecture_time'),
+                topic_taught=data.get('topic_taught'),
+                remarks=record.get('remarks', data.get('remarks')),
+                status=record['status'],
+                trainer_id=request.user.id,
+            )
+            for record in data['records']
+        ]
+        with transaction.atomic():
+            Attendance.objects.bulk_create(
+                records,
+                update_conflicts=True,
+                unique_fields=['student', 'date'],
+                update_fields=['batch', 'lecture_time', 'status', 'topic_taught', 'remarks', 'trainer', 'updated_at'],
+            )
+            attendance_marked(batch, data['date'], [record.status for record in records], request.user.id)
+
+        roster = self.get_queryset().filter(batch=batch, date=data['date']).order_by('student__inquiry__name')
+        return Response({
+            'batch': batch.id,
+            'date': data['date'],
+            'records': AttendanceSerializer(roster, many=True).data,
+        })
+
+class PlacementOutreachViewSet(ReplicaReadsMixin, SyncMixin, ValuesListMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     serializer_class = PlacementOutreachSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PlacementOutreachPagination
     queryset = PlacementOutreach.objects.all()
 
+    def get_queryset(self):
+        return self.shape_queryset(PlacementOutreach.objects.all())
+
     def perform_create(self, serializer):
-        serializer.save(officer=self.request.user)
+        serializer.save(officer_id=self.request.user.id)
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadsMixin, SyncMixin, ShapedQuerysetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ReferenceDataPagination
 
     def get_queryset(self):
-        queryset = User.objects.all()
+        queryset = self.shape_queryset(User.objects.all())
         role = self.request.query_params.get('role')
         if role:
             queryset = queryset.filter(role=role)
         return queryset
+
+    @cache_response(User)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=['get'])
     def me(self, request):
-        serializer = self.get_serializer(request.user)
+        # request.user is built from token claims; the profile needs the full row.
+        serializer = self.get_serializer(User.objects.get(pk=request.user.pk))
         return Response(serializer.data)
 
-class DashboardViewSet(viewsets.ViewSet):
+class DashboardViewSet(ReplicaReadsMixin, viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    replica_actions = ('stats',)
 
     @action(detail=False, methods=['get'])
+    @cache_response(User, Batch, Inquiry, Student, Fee, PlacementOutreach, daily=True)
     def stats(self, request):
-        from django.utils import timezone
-        import datetime
-        
-        today = timezone.now().date()
-        
-        data = {
-            'total_inquiries': Inquiry.objects.count(),
-            'total_students': Student.objects.count(),
-            'total_fees_collected': Fee.objects.aggregate(Sum('amount'))['amount__sum'] or 0,
-            'placements': PlacementOutreach.objects.count(),
-            
-            # Today's Stats
-            'fees_today': Fee.objects.filter(date_collected__date=today).aggregate(Sum('amount'))['amount__sum'] or 0,
-            'inquiries_today': Inquiry.objects.filter(created_at__date=today).count(),
-            'admissions_today': Student.objects.filter(enrollment_date=today).count(),
-            'placements_today': PlacementOutreach.objects.filter(date__date=today).count(),
-            
-            # Recent Activities
-            'recent_admissions': StudentSerializer(Student.objects.order_by('-enrollment_date')[:5], many=True).data,
-            'recent_fees': FeeSerializer(Fee.objects.order_by('-date_collected')[:5], many=True).data,
-        }
+        return Response(dashboard_stats())
+
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated, IsManager])
+    def cache_stats(self, request):
+        return Response(get_cache_stats())
+
+class SearchViewSet(ReplicaReadsMixin, viewsets.ViewSet):
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 50
+
+    def list(self, request):
+        query = request.query_params.get('q', '')
+        types = request.query_params.get('type', 'inquiry,student,outreach').split(',')
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 10)), self.max_limit))
+        except ValueError:
+            limit = 10
+
+        data = {'query': query}
+        if 'inquiry' in types:
+            queryset = scope_inquiries(Inquiry.objects.all(), request.user)
+            data['inquiries'] = search(queryset, 'inquiry', query, (
+                'id', 'name', 'mobile', 'email', 'college', 'interested_course', 'lead_status'
+            ), limit)
+        if 'student' in types:
+            queryset = Student.objects.annotate(name=F('inquiry__name'))
+            data['students'] = search(queryset, 'student', query, (
+                'id', 'inquiry_id', 'name', 'mobile', 'course', 'batch_id', 'status'
+            ), limit)
+        if 'outreach' in types:
+            data['outreach'] = search(PlacementOutreach.objects.all(), 'outreach', query, (
+                'id', 'company_name', 'contact_name', 'mode', 'date'
+            ), limit)
         return Response(data)
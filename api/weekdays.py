@@ -0,0 +1,63 @@
+"""
+Weekday bitmasks for Batch.days_mask: bit 0 is Monday, as date.weekday().
+A database index cannot answer "mask & bit", so "runs on day X" is asked as
+``days_mask IN masks_including(X)``, an index lookup over the 64 masks with
+that bit set.
+"""
+import re
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+DAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+ALL_DAYS = (1 << len(WEEKDAYS)) - 1
+DAY_ALIASES = {
+    'daily': ALL_DAYS,
+    'everyday': ALL_DAYS,
+    'weekdays': 0b0011111,
+    'weekends': 0b1100000,
+    'weekend': 0b1100000,
+}
+
+
+def weekday_index(token):
+    """Monday is 0; accepts full names and abbreviations of three letters or more."""
+    for index, name in enumerate(DAY_NAMES):
+        if len(token) >= 3 and name.startswith(token):
+            return index
+    raise ValueError(token)
+
+
+def parse_days(value, strict=True):
+    """
+    Bitmask of the weekdays in free text like "Mon,Wed,Fri", "Mon-Fri",
+    "Tuesday Thursday" or "weekends". Anything else raises ValueError, or
+    gives 0 when not ``strict`` (for legacy rows).
+    """
+    mask = 0
+    text = re.sub(r'\s*-\s*', '-', (value or '').strip().lower())
+    try:
+        for token in re.split(r'[\s,;/&]+', text):
+            if not token or token == 'and':
+                continue
+            if token in DAY_ALIASES:
+                mask |= DAY_ALIASES[token]
+            elif '-' in token:
+                first, _, last = token.partition('-')
+                first, last = weekday_index(first), weekday_index(last)
+                for offset in range((last - first) % len(WEEKDAYS) + 1):
+                    mask |= 1 << (first + offset) % len(WEEKDAYS)
+            else:
+                mask |= 1 << weekday_index(token)
+    except ValueError:
+        if strict:
+            raise
+        return 0
+    return mask
+
+
+def format_days(mask):
+    return ','.join(day for index, day in enumerate(WEEKDAYS) if mask & 1 << index)
+
+
+def masks_including(weekday):
+    """Every non-empty mask with ``weekday`` (0-6) set."""
+    return [mask for mask in range(1, ALL_DAYS + 1) if mask & 1 << weekday]
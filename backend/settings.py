@@ -54,16 +54,41 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  # CORS Middleware
+    "api.middleware.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # WhiteNoise for static files
+    # Below CORS and WhiteNoise, so preflights and static files are not counted;
+    # above compression, so response sizes are as sent
+    "api.middleware.MetricsMiddleware",
+    "api.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.middleware.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.AccessLogMiddleware",
+    "api.middleware.AtomicWritesMiddleware",
 ]
 
+# JSON-lines access log of API requests for replaying with loadtest.py (off when unset)
+ACCESS_LOG_PATH = os.environ.get("ACCESS_LOG_PATH")
+# Also record write request bodies, so replays can repeat them; they may contain personal data
+ACCESS_LOG_BODIES = os.environ.get("ACCESS_LOG_BODIES", "False").lower() == "true"
+
+# API responses smaller than this are sent uncompressed (api.middleware.CompressionMiddleware)
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+
+# Fraction of requests profiled for the Server-Timing header and slow/N+1 logs (0 disables)
+REQUEST_PROFILING_SAMPLE_RATE = float(os.environ.get("REQUEST_PROFILING_SAMPLE_RATE", "1.0" if DEBUG else "0.05"))
+SLOW_REQUEST_MS = float(os.environ.get("SLOW_REQUEST_MS", "500"))
+# Statements of one shape run this many times in a request are logged as a probable N+1
+N_PLUS_ONE_THRESHOLD = int(os.environ.get("N_PLUS_ONE_THRESHOLD", "10"))
+
+# Bearer token Prometheus scrapes /metrics with; without one the endpoint is only served when DEBUG
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
 
 ROOT_URLCONF = "backend.urls"
 
@@ -83,6 +108,10 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "backend.wsgi.application"
+ASGI_APPLICATION = "backend.asgi.application"
+
+# "wsgi" (default) or "asgi"; start.sh picks the gunicorn worker class from it
+SERVER_MODE = os.environ.get("SERVER_MODE", "wsgi").lower()
 
 
 # Database
@@ -93,7 +122,11 @@ if os.environ.get("DATABASE_URL"):
     DATABASES = {
         "default": dj_database_url.config(
             default=os.environ.get("DATABASE_URL"),
-            conn_max_age=600,
+            # Under ASGI each request's sync code runs on a fresh thread, so
+            # persistent connections would pile up instead of being reused
+            # (api.dashboard's fixed pool threads keep theirs regardless).
+            conn_max_age=0 if SERVER_MODE == "asgi" else 600,
+            conn_health_checks=True,
         )
     }
 else:
@@ -101,8 +134,65 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # Only write requests run in a transaction (api.middleware.AtomicWritesMiddleware).
+            # Taking the write lock when it begins makes concurrent writers wait for it instead
+            # of failing with "database is locked"; reads stay in autocommit and never wait.
+            "OPTIONS": {"transaction_mode": "IMMEDIATE", "timeout": 20},
+        }
+    }
+
+# Optional read replica: list/retrieve, export, dashboard and admin changelist reads go there (api.routers)
+if os.environ.get("DATABASE_REPLICA_URL"):
+    DATABASES["replica"] = dj_database_url.parse(
+        os.environ["DATABASE_REPLICA_URL"],
+        conn_max_age=DATABASES["default"].get("CONN_MAX_AGE", 0),
+        conn_health_checks=True,
+    )
+    # Tests run against the primary alone
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+READ_REPLICA = "replica" if "replica" in DATABASES else None
+# Seconds a user's reads stay on the primary after they write; should exceed the replica lag
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "10"))
+DATABASE_ROUTERS = ["api.routers.ReplicaRouter"]
+
+# Cache
+# Use Redis (or any Redis-compatible server) via REDIS_URL, a shared directory via
+# CACHE_DIR, or per-process local memory. Local memory is only coherent with a
+# single worker process, since version bumps are not seen by other workers.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL"),
+        }
+    }
+elif os.environ.get("CACHE_DIR"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_DIR"),
         }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a cached API response may be served before it is rebuilt
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", "300"))
+
+# Delta sync (?changed_since=, api.sync): how far behind the clock cursors stay, so rows of
+# transactions still committing are not skipped, and how long deletions are kept for clients
+SYNC_SETTLE_SECONDS = int(os.environ.get("SYNC_SETTLE_SECONDS", "5"))
+SYNC_TOMBSTONE_DAYS = int(os.environ.get("SYNC_TOMBSTONE_DAYS", "90"))
+
+# Seconds between keepalive comments on idle /api/events/ streams
+EVENTS_HEARTBEAT_SECONDS = int(os.environ.get("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# Threads (and so database connections, per process) the async dashboard runs its queries on
+DASHBOARD_WORKERS = int(os.environ.get("DASHBOARD_WORKERS", "4"))
 
 
 # Password validation
@@ -154,17 +244,40 @@ AUTH_USER_MODEL = "api.User"
 # REST Framework Configuration
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.RoleTokenAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson renders and parses the same JSON as DRF's classes, several times faster (api.renderers)
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.KeysetPagination",
+    "PAGE_SIZE": 50,
 }
 
+# Cursor pagination skips COUNT(*) unless this is on or the client sends ?count=true
+PAGINATION_INCLUDE_COUNT = os.environ.get("PAGINATION_INCLUDE_COUNT", "False").lower() == "true"
+
+# Admin changelists the PostgreSQL planner estimates above this many rows show the estimate
+# instead of running COUNT(*) (api.admin.EstimatedCountPaginator)
+ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get("ADMIN_EXACT_COUNT_LIMIT", "10000"))
+
 # JWT Configuration
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # Role claims in the token let requests skip the User lookup
+    "TOKEN_OBTAIN_SERIALIZER": "api.authentication.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "api.authentication.RoleTokenRefreshSerializer",
+    "TOKEN_USER_CLASS": "api.authentication.RoleTokenUser",
 }
 
 # CORS Configuration
@@ -0,0 +1,15 @@
+"""
+Settings for the test suite: the project settings plus a second SQLite
+database standing in for a read replica (api.tests.ReplicaRoutingTests),
+with request profiling off (api.tests.RequestProfilingTests turns it on).
+
+    python manage.py test api --settings=backend.test_settings
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES
+
+if "replica" not in DATABASES:
+    DATABASES["replica"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "replica.sqlite3"}
+
+# DEBUG profiles every request, and slow-request warnings would flood the test output
+REQUEST_PROFILING_SAMPLE_RATE = 0.0
@@ -22,3 +22,19 @@ api.interceptors.request.use(
 );
 
 export default api;
+
+// List endpoints return cursor pages ({ next, previous, results }). The server builds `next`
+// as an absolute URL; request it through the API base URL so a proxy's scheme or host is kept.
+export const nextPath = (url) => (url ? url.slice(url.indexOf('/api/') + '/api'.length) : null);
+
+// Every row of a list endpoint, following `next` until the last page.
+export const fetchAll = async (url) => {
+    const rows = [];
+    let next = url;
+    while (next) {
+        const response = await api.get(next);
+        rows.push(...response.data.results);
+        next = nextPath(response.data.next);
+    }
+    return rows;
+};
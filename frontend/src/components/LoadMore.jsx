@@ -0,0 +1,18 @@
+const LoadMore = ({ count, hasMore, loading, onLoadMore }) => (
+    <div className="flex justify-between items-center mt-4 text-sm text-gray-600">
+        <span>
+            {hasMore ? `Showing the latest ${count} records` : `Showing all ${count} records`}
+        </span>
+        {hasMore && (
+            <button
+                onClick={onLoadMore}
+                disabled={loading}
+                className="bg-gray-100 text-gray-700 px-4 py-2 rounded hover:bg-gray-200 disabled:opacity-50"
+            >
+                {loading ? 'Loading...' : 'Load more'}
+            </button>
+        )}
+    </div>
+);
+
+export default LoadMore;
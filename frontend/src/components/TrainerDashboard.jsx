@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import api from '../api';
+import api, { fetchAll } from '../api';
 import { Link } from 'react-router-dom';
 
 const TrainerDashboard = () => {
@@ -19,9 +19,12 @@ const TrainerDashboard = () => {
 
     const fetchBatches = async () => {
         try {
-            const response = await api.get('/batches/');
-            setBatches(response.data);
-            filterTodaysBatches(response.data);
+            const [all, today] = await Promise.all([
+                fetchAll('/batches/'),
+                api.get('/batches/today/'),
+            ]);
+            setBatches(all);
+            setTodaysBatches(today.data.sessions);
         } catch (error) {
             console.error("Failed to fetch batches", error);
         } finally {
@@ -29,16 +32,6 @@ const TrainerDashboard = () => {
         }
     };
 
-    const filterTodaysBatches = (allBatches) => {
-        const days = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
-        const today = days[new Date().getDay()];
-
-        const filtered = allBatches.filter(batch =>
-            batch.days_of_week && batch.days_of_week.includes(today)
-        );
-        setTodaysBatches(filtered);
-    };
-
     const toggleExpand = (batchId) => {
         setExpandedBatchId(expandedBatchId === batchId ? null : batchId);
     };
@@ -80,6 +73,7 @@ const TrainerDashboard = () => {
                                     <h3 className="text-xl font-bold text-blue-800">{batch.batch_name}</h3>
                                     <p className="text-md font-semibold text-gray-700">{batch.start_time} - {batch.end_time}</p>
                                     <p className="text-sm text-gray-600 mt-1"><strong>Classroom:</strong> {batch.classroom_name || 'N/A'}</p>
+                                    <p className="text-sm text-gray-600"><strong>Students:</strong> {batch.roster_size}{batch.attendance_marked ? ' · Attendance marked' : ''}</p>
                                 </div>
                                 <div className="text-blue-500 text-xl ml-4">
                                     {expandedBatchId === batch.id ? '▲' : '▼'}
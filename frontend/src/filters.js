@@ -0,0 +1,38 @@
+// Helpers for list pages whose filters are sent to the server as query parameters.
+
+const isoDate = (date) => {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
+};
+
+// [from, to] as YYYY-MM-DD (either may be '') for a date filter preset or a custom range.
+export const dateRange = (preset, startDate, endDate) => {
+    const today = new Date();
+    const daysAgo = (days) => {
+        const date = new Date(today);
+        date.setDate(date.getDate() - days);
+        return isoDate(date);
+    };
+    switch (preset) {
+        case 'today':
+            return [isoDate(today), isoDate(today)];
+        case 'yesterday':
+            return [daysAgo(1), daysAgo(1)];
+        case 'last_week':
+            return [daysAgo(7), ''];
+        case 'custom':
+            return [startDate, endDate];
+        default:
+            return ['', ''];
+    }
+};
+
+// `path` with the non-empty entries of `params` as its query string.
+export const withQuery = (path, params) => {
+    const query = new URLSearchParams(
+        Object.entries(params).filter(([, value]) => value !== '' && value != null),
+    ).toString();
+    if (!query) return path;
+    return `${path}${path.includes('?') ? '&' : '?'}${query}`;
+};
@@ -0,0 +1,66 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import api, { nextPath } from '../api';
+
+// The rows of a cursor-paginated list endpoint loaded so far, and a function to load the next
+// page (loadMore). Filters belong in `url`; changing it starts again from the first page.
+// `error` holds the last failed request.
+const usePaginatedList = (url) => {
+    const [items, setItems] = useState([]);
+    const [next, setNext] = useState(null);
+    const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [error, setError] = useState(null);
+    const currentUrl = useRef(url);
+    currentUrl.current = url;
+
+    useEffect(() => {
+        let cancelled = false;
+        setLoading(true);
+        setNext(null);
+        setError(null);
+        api.get(url)
+            .then((response) => {
+                if (cancelled) return;
+                setItems(response.data.results);
+                setNext(nextPath(response.data.next));
+            })
+            .catch((err) => {
+                console.error(`Failed to fetch ${url}`, err);
+                if (!cancelled) setError(err);
+            })
+            .finally(() => {
+                if (!cancelled) setLoading(false);
+            });
+        return () => {
+            cancelled = true;
+        };
+    }, [url]);
+
+    const loadMore = useCallback(async () => {
+        if (!next || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const response = await api.get(next);
+            if (currentUrl.current !== url) return; // the filters changed while this page loaded
+            setItems((current) => [...current, ...response.data.results]);
+            setNext(nextPath(response.data.next));
+            setError(null);
+        } catch (err) {
+            console.error(`Failed to fetch more of ${url}`, err);
+            setError(err);
+        } finally {
+            setLoadingMore(false);
+        }
+    }, [url, next, loadingMore]);
+
+    return {
+        items,
+        loading,
+        loadingMore,
+        error,
+        hasMore: Boolean(next),
+        loadMore,
+    };
+};
+
+export default usePaginatedList;
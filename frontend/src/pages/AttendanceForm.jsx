@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import api from '../api';
+import api, { fetchAll } from '../api';
 import { useNavigate, useParams } from 'react-router-dom';
 
 const AttendanceForm = () => {
@@ -30,8 +30,7 @@ const AttendanceForm = () => {
 
     const fetchBatches = async () => {
         try {
-            const response = await api.get('/batches/');
-            setBatches(response.data);
+            setBatches(await fetchAll('/batches/'));
         } catch (err) {
             console.error("Failed to fetch batches", err);
         }
@@ -39,11 +38,7 @@ const AttendanceForm = () => {
 
     const fetchStudentsInBatch = async (batchId) => {
         try {
-            // Ideally backend should support filtering students by batch
-            // For now, fetching all students and filtering client-side if API doesn't support it yet
-            // Or better, update StudentViewSet to filter by batch
-            const response = await api.get('/students/');
-            const batchStudents = response.data.filter(s => s.batch === parseInt(batchId));
+            const batchStudents = await fetchAll(`/students/?batch=${batchId}&page_size=200`);
             setStudents(batchStudents);
 
             // Initialize status as PRESENT_OFFLINE for all
@@ -66,21 +61,17 @@ const AttendanceForm = () => {
         setError('');
 
         try {
-            // Send multiple requests or a bulk create endpoint
-            // Since our API is simple CRUD, we'll loop. In production, use bulk create.
-            const promises = students.map(student => {
-                return api.post('/attendance/', {
+            await api.post('/attendance/bulk_mark/', {
+                batch: selectedBatch,
+                date: date,
+                lecture_time: lectureTime || null,
+                topic_taught: topic,
+                remarks: remarks,
+                records: students.map(student => ({
                     student: student.id,
-                    batch: selectedBatch,
-                    date: date,
-                    lecture_time: lectureTime,
-                    topic_taught: topic,
-                    remarks: remarks,
                     status: attendanceStatus[student.id]
-                });
+                }))
             });
-
-            await Promise.all(promises);
             navigate('/attendance');
         } catch (err) {
             console.error(err);
@@ -166,7 +157,7 @@ const AttendanceForm = () => {
                         <div className="space-y-2">
                             {students.map(student => (
                                 <div key={student.id} className="flex flex-col sm:flex-row sm:items-center justify-between p-3 bg-gray-50 rounded border gap-2">
-                                    <span className="text-sm md:text-base">{student.inquiry_details?.name} ({student.mobile})</span>
+                                    <span className="text-sm md:text-base">{student.inquiry_name} ({student.mobile})</span>
                                     <div className="flex gap-3 md:gap-4 text-sm">
                                         <label className="flex items-center gap-2 cursor-pointer">
                                             <input
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import api from '../api';
+import { fetchAll } from '../api';
 
 const AttendanceList = () => {
     const [date, setDate] = useState(new Date().toISOString().split('T')[0]);
@@ -15,8 +15,7 @@ const AttendanceList = () => {
     const fetchAttendance = async () => {
         setLoading(true);
         try {
-            const response = await api.get(`/attendance/?date=${date}`);
-            processAttendanceData(response.data);
+            processAttendanceData(await fetchAll(`/attendance/?date=${date}&page_size=200`));
         } catch (error) {
             console.error("Failed to fetch attendance", error);
         } finally {
@@ -1,11 +1,12 @@
 import { useState, useEffect } from 'react';
-import api from '../api';
+import api, { fetchAll } from '../api';
 import { useParams, Link } from 'react-router-dom';
 
 const BatchDetails = () => {
     const { id } = useParams();
     const [batch, setBatch] = useState(null);
     const [students, setStudents] = useState([]);
+    const [attendance, setAttendance] = useState({});
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
 
@@ -19,8 +20,10 @@ const BatchDetails = () => {
             const batchRes = await api.get(`/batches/${id}/`);
             setBatch(batchRes.data);
 
-            const studentRes = await api.get(`/students/?batch=${id}`);
-            setStudents(studentRes.data);
+            setStudents(await fetchAll(`/students/?batch=${id}&page_size=200`));
+
+            const matrixRes = await api.get(`/batches/${id}/attendance_matrix/`);
+            setAttendance(Object.fromEntries(matrixRes.data.students.map(row => [row.id, row])));
         } catch (err) {
             console.error(err);
             setError('Failed to fetch batch details.');
@@ -131,6 +134,7 @@ const BatchDetails = () => {
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">Mobile</th>
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">Email</th>
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">Course</th>
+                                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">Attendance</th>
                                     <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase">Status</th>
                                 </tr>
                             </thead>
@@ -143,6 +147,11 @@ const BatchDetails = () => {
                                         <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">{student.mobile}</td>
                                         <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">{student.email}</td>
                                         <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">{student.course}</td>
+                                        <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-600">
+                                            {attendance[student.id]?.present_pct != null
+                                                ? `${attendance[student.id].present_pct}% (${attendance[student.id].present}/${attendance[student.id].sessions})`
+                                                : 'N/A'}
+                                        </td>
                                         <td className="px-6 py-4 whitespace-nowrap">
                                             <span className={`px-2 inline-flex text-xs leading-5 font-semibold rounded-full 
                                                 ${student.status === 'ACTIVE' ? 'bg-green-100 text-green-800' :
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import api from '../api';
+import api, { fetchAll } from '../api';
 import { useNavigate, useParams } from 'react-router-dom';
 import { COURSE_OPTIONS } from '../constants';
 
@@ -37,8 +37,7 @@ const BatchForm = () => {
 
     const fetchTrainers = async () => {
         try {
-            const response = await api.get('/users/?role=TRAINER');
-            setTrainers(response.data);
+            setTrainers(await fetchAll('/users/?role=TRAINER'));
         } catch (err) {
             console.error("Failed to fetch trainers", err);
         }
@@ -95,7 +94,10 @@ const BatchForm = () => {
             navigate('/batches');
         } catch (err) {
             console.error(err);
-            setError('Failed to save batch. Please try again.');
+            const errors = err.response?.status === 400 ? err.response.data : null;
+            setError(errors
+                ? Object.values(errors).flat().join(' ')
+                : 'Failed to save batch. Please try again.');
         } finally {
             setLoading(false);
         }
@@ -1,5 +1,5 @@
 import { useEffect, useState } from 'react';
-import api from '../api';
+import { fetchAll } from '../api';
 import { Link } from 'react-router-dom';
 
 const BatchList = () => {
@@ -12,8 +12,7 @@ const BatchList = () => {
 
     const fetchBatches = async () => {
         try {
-            const response = await api.get('/batches/');
-            setBatches(response.data);
+            setBatches(await fetchAll('/batches/'));
         } catch (error) {
             console.error("Failed to fetch batches", error);
         } finally {
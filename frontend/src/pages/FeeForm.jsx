@@ -32,9 +32,9 @@ const FeeForm = () => {
 
         setSearchLoading(true);
         try {
-            const response = await api.get(`/students/?mobile=${searchMobile}`);
-            if (response.data && response.data.length > 0) {
-                const student = response.data[0];
+            const response = await api.get(`/students/?mobile=${searchMobile}&expand=inquiry_details`);
+            if (response.data.results.length > 0) {
+                const student = response.data.results[0];
                 setFoundStudent(student);
                 setFormData(prev => ({ ...prev, student: student.id }));
             } else {
@@ -1,25 +1,9 @@
-import { useEffect, useState } from 'react';
-import api from '../api';
 import { Link } from 'react-router-dom';
+import LoadMore from '../components/LoadMore';
+import usePaginatedList from '../hooks/usePaginatedList';
 
 const FeeList = () => {
-    const [fees, setFees] = useState([]);
-    const [loading, setLoading] = useState(true);
-
-    useEffect(() => {
-        fetchFees();
-    }, []);
-
-    const fetchFees = async () => {
-        try {
-            const response = await api.get('/fees/');
-            setFees(response.data);
-        } catch (error) {
-            console.error("Failed to fetch fees", error);
-        } finally {
-            setLoading(false);
-        }
-    };
+    const { items: fees, loading, loadingMore, hasMore, loadMore } = usePaginatedList('/fees/');
 
     if (loading) return <div>Loading fees...</div>;
 
@@ -64,6 +48,7 @@ const FeeList = () => {
                     </tbody>
                 </table>
             </div>
+            <LoadMore count={fees.length} hasMore={hasMore} loading={loadingMore} onLoadMore={loadMore} />
         </div>
     );
 };
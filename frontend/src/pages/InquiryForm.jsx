@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import api from '../api';
+import api, { fetchAll } from '../api';
 import { useNavigate, useParams } from 'react-router-dom';
 import { DEGREE_OPTIONS, BRANCH_OPTIONS, COURSE_OPTIONS } from '../constants';
 import Swal from 'sweetalert2';
@@ -59,8 +59,7 @@ const InquiryForm = () => {
 
     const fetchCounselors = async () => {
         try {
-            const response = await api.get('/users/?role=COUNSELOR');
-            setCounselors(response.data);
+            setCounselors(await fetchAll('/users/?role=COUNSELOR'));
         } catch (err) {
             console.error("Failed to fetch counselors", err);
         }
@@ -1,13 +1,12 @@
-import { useEffect, useState } from 'react';
-import api from '../api';
+import { useState } from 'react';
 import { Link } from 'react-router-dom';
 import { COURSE_OPTIONS } from '../constants';
+import { dateRange, withQuery } from '../filters';
+import LoadMore from '../components/LoadMore';
+import useDebouncedValue from '../hooks/useDebouncedValue';
+import usePaginatedList from '../hooks/usePaginatedList';
 
 const InquiryList = () => {
-    const [inquiries, setInquiries] = useState([]);
-    const [filteredInquiries, setFilteredInquiries] = useState([]);
-    const [loading, setLoading] = useState(true);
-
     // Filters
     const [courseFilter, setCourseFilter] = useState('');
     const [collegeFilter, setCollegeFilter] = useState('');
@@ -18,81 +17,19 @@ const InquiryList = () => {
     const [startDate, setStartDate] = useState('');
     const [endDate, setEndDate] = useState('');
 
-    useEffect(() => {
-        fetchInquiries();
-    }, []);
-
-    useEffect(() => {
-        filterData();
-    }, [inquiries, courseFilter, collegeFilter, createdByFilter, dateFilter, startDate, endDate]);
-
-    const fetchInquiries = async () => {
-        try {
-            const response = await api.get('/inquiries/');
-            setInquiries(response.data);
-        } catch (error) {
-            console.error("Failed to fetch inquiries", error);
-        } finally {
-            setLoading(false);
-        }
-    };
-
-    const filterData = () => {
-        let result = inquiries;
-
-        // Date Filtering
-        if (dateFilter) {
-            const today = new Date();
-            today.setHours(0, 0, 0, 0);
-
-            result = result.filter(item => {
-                const itemDate = new Date(item.created_at);
-                itemDate.setHours(0, 0, 0, 0);
-
-                if (dateFilter === 'today') {
-                    return itemDate.getTime() === today.getTime();
-                } else if (dateFilter === 'yesterday') {
-                    const yesterday = new Date(today);
-                    yesterday.setDate(yesterday.getDate() - 1);
-                    return itemDate.getTime() === yesterday.getTime();
-                } else if (dateFilter === 'last_week') {
-                    const lastWeek = new Date(today);
-                    lastWeek.setDate(lastWeek.getDate() - 7);
-                    return itemDate >= lastWeek;
-                } else if (dateFilter === 'custom') {
-                    const itemTime = new Date(item.created_at).getTime();
-                    let isValid = true;
-
-                    if (startDate) {
-                        const start = new Date(startDate);
-                        start.setHours(0, 0, 0, 0);
-                        isValid = isValid && itemTime >= start.getTime();
-                    }
-
-                    if (endDate) {
-                        const end = new Date(endDate);
-                        end.setHours(23, 59, 59, 999);
-                        isValid = isValid && itemTime <= end.getTime();
-                    }
-
-                    return isValid;
-                }
-                return true;
-            });
-        }
-
-        if (courseFilter) {
-            result = result.filter(item => item.interested_course === courseFilter);
-        }
-        if (collegeFilter) {
-            result = result.filter(item => item.college && item.college.toLowerCase().includes(collegeFilter.toLowerCase()));
-        }
-        if (createdByFilter) {
-            result = result.filter(item => item.created_by_name && item.created_by_name.toLowerCase().includes(createdByFilter.toLowerCase()));
-        }
-
-        setFilteredInquiries(result);
-    };
+    // The server filters and pages the list; typed filters wait for a pause before refetching
+    const college = useDebouncedValue(collegeFilter);
+    const createdBy = useDebouncedValue(createdByFilter);
+    const [createdFrom, createdTo] = dateRange(dateFilter, startDate, endDate);
+    const {
+        items: inquiries, loading, loadingMore, error, hasMore, loadMore,
+    } = usePaginatedList(withQuery('/inquiries/', {
+        interested_course: courseFilter,
+        college,
+        created_by_name: createdBy,
+        created_from: createdFrom,
+        created_to: createdTo,
+    }));
 
     const resetFilters = () => {
         setCourseFilter('');
@@ -103,8 +40,6 @@ const InquiryList = () => {
         setEndDate('');
     };
 
-    if (loading) return <div>Loading inquiries...</div>;
-
     return (
         <div className="w-full">
             <div className="flex flex-col sm:flex-row justify-between items-start sm:items-center gap-4 mb-6">
@@ -211,7 +146,7 @@ const InquiryList = () => {
                         </tr>
                     </thead>
                     <tbody className="bg-white divide-y divide-gray-200">
-                        {filteredInquiries.map((inquiry) => (
+                        {inquiries.map((inquiry) => (
                             <tr key={inquiry.id}>
                                 <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
                                     {new Date(inquiry.created_at).toLocaleDateString()}
@@ -236,14 +171,20 @@ const InquiryList = () => {
                                 </td>
                             </tr>
                         ))}
-                        {filteredInquiries.length === 0 && (
+                        {inquiries.length === 0 && (
                             <tr>
-                                <td colSpan="7" className="px-6 py-4 text-center text-gray-500">No inquiries found.</td>
+                                <td colSpan="7" className="px-6 py-4 text-center text-gray-500">
+                                    {loading ? 'Loading inquiries...' : 'No inquiries found.'}
+                                </td>
                             </tr>
                         )}
                     </tbody>
                 </table>
             </div>
+            {error && <div className="mt-4 text-sm text-red-600">Could not load inquiries.</div>}
+            {!loading && (
+                <LoadMore count={inquiries.length} hasMore={hasMore} loading={loadingMore} onLoadMore={loadMore} />
+            )}
         </div>
     );
 };
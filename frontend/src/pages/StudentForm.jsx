@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import api from '../api';
+import api, { fetchAll } from '../api';
 import { useNavigate, useParams } from 'react-router-dom';
 import { COURSE_OPTIONS } from '../constants';
 
@@ -95,12 +95,10 @@ const StudentForm = () => {
 
     const fetchDependencies = async () => {
         try {
-            const batchRes = await api.get('/batches/');
-            setBatches(batchRes.data);
+            setBatches(await fetchAll('/batches/'));
 
             // Also fetch counselors for creation assignment
-            const counselorRes = await api.get('/users/?role=COUNSELOR');
-            setCounselors(counselorRes.data);
+            setCounselors(await fetchAll('/users/?role=COUNSELOR'));
         } catch (err) {
             console.error("Failed to fetch dependencies", err);
         }
@@ -133,7 +131,7 @@ const StudentForm = () => {
         setSearchLoading(true);
         try {
             const response = await api.get(`/inquiries/?search=${searchQuery}`);
-            setSearchResults(response.data);
+            setSearchResults(response.data.results);
         } catch (err) {
             console.error("Search failed", err);
         } finally {
@@ -1,12 +1,12 @@
-import { useEffect, useState } from 'react';
-import api from '../api';
+import { useState } from 'react';
 import { Link } from 'react-router-dom';
 import { COURSE_OPTIONS } from '../constants';
+import { dateRange, withQuery } from '../filters';
+import LoadMore from '../components/LoadMore';
+import useDebouncedValue from '../hooks/useDebouncedValue';
+import usePaginatedList from '../hooks/usePaginatedList';
 
 const StudentList = () => {
-    const [students, setStudents] = useState([]);
-    const [filteredStudents, setFilteredStudents] = useState([]);
-    const [loading, setLoading] = useState(true);
     const [searchTerm, setSearchTerm] = useState('');
 
     // Filters
@@ -14,100 +14,26 @@ const StudentList = () => {
     const [collegeFilter, setCollegeFilter] = useState('');
     const [createdByFilter, setCreatedByFilter] = useState('');
 
-    // Date Filters
+    // Date Filters (Enrollment Date)
     const [dateFilter, setDateFilter] = useState('');
     const [startDate, setStartDate] = useState('');
     const [endDate, setEndDate] = useState('');
 
-    useEffect(() => {
-        fetchStudents();
-    }, []);
-
-    useEffect(() => {
-        filterData();
-    }, [students, searchTerm, courseFilter, collegeFilter, createdByFilter, dateFilter, startDate, endDate]);
-
-    const fetchStudents = async () => {
-        try {
-            const response = await api.get('/students/');
-            setStudents(response.data);
-        } catch (error) {
-            console.error("Failed to fetch students", error);
-        } finally {
-            setLoading(false);
-        }
-    };
-
-    const filterData = () => {
-        let result = students;
-
-        // Search Term Filtering
-        if (searchTerm) {
-            result = result.filter(student =>
-                student.inquiry_details?.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-                student.mobile?.includes(searchTerm)
-            );
-        }
-
-        // Date Filtering (Enrollment Date)
-        if (dateFilter) {
-            const today = new Date();
-            today.setHours(0, 0, 0, 0);
-
-            result = result.filter(item => {
-                const itemDate = new Date(item.enrollment_date);
-                itemDate.setHours(0, 0, 0, 0);
-
-                if (dateFilter === 'today') {
-                    return itemDate.getTime() === today.getTime();
-                } else if (dateFilter === 'yesterday') {
-                    const yesterday = new Date(today);
-                    yesterday.setDate(yesterday.getDate() - 1);
-                    return itemDate.getTime() === yesterday.getTime();
-                } else if (dateFilter === 'last_week') {
-                    const lastWeek = new Date(today);
-                    lastWeek.setDate(lastWeek.getDate() - 7);
-                    return itemDate >= lastWeek;
-                } else if (dateFilter === 'custom') {
-                    const itemTime = new Date(item.enrollment_date).getTime();
-                    let isValid = true;
-
-                    if (startDate) {
-                        const start = new Date(startDate);
-                        start.setHours(0, 0, 0, 0);
-                        isValid = isValid && itemTime >= start.getTime();
-                    }
-
-                    if (endDate) {
-                        const end = new Date(endDate);
-                        end.setHours(23, 59, 59, 999);
-                        isValid = isValid && itemTime <= end.getTime();
-                    }
-
-                    return isValid;
-                }
-                return true;
-            });
-        }
-
-        if (courseFilter) {
-            result = result.filter(item => item.course === courseFilter);
-        }
-        if (collegeFilter) {
-            result = result.filter(item => item.inquiry_details?.college && item.inquiry_details.college.toLowerCase().includes(collegeFilter.toLowerCase()));
-        }
-        if (createdByFilter) {
-            // Note: Student model doesn't strictly have created_by, but Inquiry does. 
-            // Assuming we might want to filter by who admitted them or who created the inquiry.
-            // For now, let's filter by Inquiry's created_by_name if available in inquiry_details
-            // Or if we added created_by to Student, we'd use that.
-            // Let's check serializer. StudentSerializer has inquiry_details.
-            // InquirySerializer has created_by_name.
-            result = result.filter(item => item.inquiry_details?.created_by_name && item.inquiry_details.created_by_name.toLowerCase().includes(createdByFilter.toLowerCase()));
-        }
-
-        setFilteredStudents(result);
-    };
+    // The server searches, filters and pages the list; typed filters wait for a pause before refetching
+    const search = useDebouncedValue(searchTerm);
+    const college = useDebouncedValue(collegeFilter);
+    const createdBy = useDebouncedValue(createdByFilter);
+    const [enrolledFrom, enrolledTo] = dateRange(dateFilter, startDate, endDate);
+    const {
+        items: students, loading, loadingMore, error, hasMore, loadMore,
+    } = usePaginatedList(withQuery('/students/?expand=inquiry_details', {
+        search,
+        course: courseFilter,
+        college,
+        created_by_name: createdBy,
+        enrolled_from: enrolledFrom,
+        enrolled_to: enrolledTo,
+    }));
 
     const resetFilters = () => {
         setSearchTerm('');
@@ -119,8 +45,6 @@ const StudentList = () => {
         setEndDate('');
     };
 
-    if (loading) return <div>Loading students...</div>;
-
     return (
         <div className="p-4 md:p-8">
             <div className="flex flex-col sm:flex-row justify-between items-start sm:items-center gap-4 mb-6">
@@ -230,30 +154,38 @@ const StudentList = () => {
                             <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Email</th>
                             <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Batch</th>
                             <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Enrollment Date</th>
+                            <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Balance Due</th>
                             <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">Actions</th>
                         </tr>
                     </thead>
                     <tbody className="bg-white divide-y divide-gray-200">
-                        {filteredStudents.map((student) => (
+                        {students.map((student) => (
                             <tr key={student.id}>
                                 <td className="px-6 py-4 whitespace-nowrap">{student.inquiry_details?.name || 'N/A'}</td>
                                 <td className="px-6 py-4 whitespace-nowrap">{student.mobile}</td>
                                 <td className="px-6 py-4 whitespace-nowrap">{student.email}</td>
                                 <td className="px-6 py-4 whitespace-nowrap">{student.batch_name || 'Unassigned'}</td>
                                 <td className="px-6 py-4 whitespace-nowrap">{new Date(student.enrollment_date).toLocaleDateString()}</td>
+                                <td className="px-6 py-4 whitespace-nowrap">₹{student.balance_due}</td>
                                 <td className="px-6 py-4 whitespace-nowrap text-sm font-medium">
                                     <Link to={`/students/${student.id}`} className="text-indigo-600 hover:text-indigo-900">Edit</Link>
                                 </td>
                             </tr>
                         ))}
-                        {filteredStudents.length === 0 && (
+                        {students.length === 0 && (
                             <tr>
-                                <td colSpan="6" className="px-6 py-4 text-center text-gray-500">No students found.</td>
+                                <td colSpan="7" className="px-6 py-4 text-center text-gray-500">
+                                    {loading ? 'Loading students...' : 'No students found.'}
+                                </td>
                             </tr>
                         )}
                     </tbody>
                 </table>
             </div>
+            {error && <div className="mt-4 text-sm text-red-600">Could not load students.</div>}
+            {!loading && (
+                <LoadMore count={students.length} hasMore={hasMore} loading={loadingMore} onLoadMore={loadMore} />
+            )}
         </div>
     );
 };
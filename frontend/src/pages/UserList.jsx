@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import api from '../api';
+import { fetchAll } from '../api';
 import { Link } from 'react-router-dom';
 
 const UserList = () => {
@@ -12,8 +12,7 @@ const UserList = () => {
 
     const fetchUsers = async () => {
         try {
-            const response = await api.get('/users/');
-            setUsers(response.data);
+            setUsers(await fetchAll('/users/'));
         } catch (err) {
             console.error("Failed to fetch users", err);
         } finally {
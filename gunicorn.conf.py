@@ -0,0 +1,19 @@
+# Loaded by gunicorn from the working directory (see start.sh).
+import os
+import shutil
+import tempfile
+
+# Workers share their Prometheus samples through this directory (api.metrics).
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'prometheus-metrics'))
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to this one's.
+    shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'])
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
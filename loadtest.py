@@ -0,0 +1,516 @@
+"""
+Concurrent load generator for the API. Uses only the standard library (asyncio
+streams with keep-alive HTTP/1.1), so it runs anywhere Python does.
+
+Simulate a morning rush with a weighted scenario mix per role:
+
+    python loadtest.py run --admin admin:adminpass --duration 60 \\
+        --users counselor=10,trainer=5,hr_admin=2,manager=2,placement_officer=2
+
+Record real traffic by starting the server with ACCESS_LOG_PATH=access.log
+(and ACCESS_LOG_BODIES=True to capture write bodies), then replay it, e.g.
+against a restored copy of the same database:
+
+    python loadtest.py replay access.log --admin admin:adminpass --speed 2
+
+Both modes log in as ``load-<role>-<n>`` users (created through the API when
+--admin is given) and report throughput and p50/p95/p99 latency per endpoint.
+"""
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import math
+import random
+import re
+import ssl
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+ROLES = ('COUNSELOR', 'TRAINER', 'HR_ADMIN', 'MANAGER', 'PLACEMENT_OFFICER')
+DEFAULT_USERS = 'counselor=10,trainer=5,hr_admin=2,manager=2,placement_officer=2'
+ROSTER_SIZE = 20
+
+
+class HTTPError(Exception):
+    def __init__(self, status, body):
+        super().__init__(f'HTTP {status}: {body[:200]!r}')
+        self.status = status
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self.skipped = Counter()
+        self.started = time.perf_counter()
+
+    def record(self, label, ms, status):
+        self.latencies[label].append(ms)
+        if status is None or status >= 400:
+            self.errors[label][status or 'conn'] += 1
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        rows = {}
+        for label, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            rows[label] = {
+                'requests': len(samples),
+                'errors': dict(self.errors[label]),
+                'rps': round(len(samples) / elapsed, 2),
+                **{f'p{p}': round(percentile(samples, p), 1) for p in (50, 95, 99)},
+            }
+        total = sum(row['requests'] for row in rows.values())
+        return {
+            'elapsed': round(elapsed, 1), 'requests': total, 'rps': round(total / elapsed, 2),
+            'skipped': dict(self.skipped), 'endpoints': rows,
+        }
+
+    def print(self, out=sys.stdout):
+        summary = self.summary()
+        out.write(f'\n{"endpoint":<52}{"reqs":>7}{"errors":>8}{"req/s":>8}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}\n')
+        for label, row in summary['endpoints'].items():
+            errors = sum(row['errors'].values())
+            out.write(
+                f'{label:<52}{row["requests"]:>7}{errors:>8}{row["rps"]:>8.1f}'
+                f'{row["p50"]:>9.1f}{row["p95"]:>9.1f}{row["p99"]:>9.1f}\n'
+            )
+        out.write(f'\n{summary["requests"]} requests in {summary["elapsed"]}s, {summary["rps"]} req/s\n')
+        for reason, count in summary['skipped'].items():
+            out.write(f'skipped {count}: {reason}\n')
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of sorted ``samples``."""
+    if not samples:
+        return 0.0
+    return samples[max(0, math.ceil(p / 100 * len(samples)) - 1)]
+
+
+def endpoint_label(method, path):
+    """GET /api/inquiries/12/?page_size=5 -> GET /api/inquiries/{id}/?page_size"""
+    path, _, query = path.partition('?')
+    path = re.sub(r'/\d+(?=/|$)', '/{id}', path)
+    keys = sorted({pair.split('=', 1)[0] for pair in query.split('&') if pair})
+    return f'{method} {path}' + (f'?{"&".join(keys)}' if keys else '')
+
+
+class Client:
+    """A pool of keep-alive HTTP/1.1 connections to one server."""
+
+    def __init__(self, base_url, stats):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if url.scheme == 'https' else None
+        self.prefix = url.path.rstrip('/')
+        self.stats = stats
+        self.idle = []
+
+    async def request(self, method, path, data=None, token=None, label=None, body=None, content_type=None):
+        """Send one request and return (status, parsed JSON or raw bytes); latency goes to the stats."""
+        if data is not None:
+            body, content_type = json.dumps(data).encode(), 'application/json'
+        elif isinstance(body, str):
+            body = body.encode()
+        headers = {'Host': self.host, 'Accept': 'application/json', 'Content-Length': str(len(body or b''))}
+        if content_type:
+            headers['Content-Type'] = content_type
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        raw = f'{method} {self.prefix}{path} HTTP/1.1\r\n'.encode()
+        raw += ''.join(f'{name}: {value}\r\n' for name, value in headers.items()).encode() + b'\r\n' + (body or b'')
+
+        label = label or endpoint_label(method, path)
+        start = time.perf_counter()
+        try:
+            status, response_headers, payload = await self.exchange(raw, method)
+        except (OSError, asyncio.IncompleteReadError) as exc:
+            self.stats.record(label, (time.perf_counter() - start) * 1000, None)
+            raise HTTPError(0, str(exc).encode()) from exc
+        self.stats.record(label, (time.perf_counter() - start) * 1000, status)
+        if 'json' in response_headers.get('content-type', '') and payload:
+            payload = json.loads(payload)
+        return status, payload
+
+    async def exchange(self, raw, method):
+        # A pooled connection may have been closed by the server while idle; retry those once on a new one.
+        while self.idle:
+            reader, writer = self.idle.pop()
+            try:
+                return await self.send(reader, writer, raw, method)
+            except (ConnectionError, asyncio.IncompleteReadError, EOFError):
+                writer.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        return await self.send(reader, writer, raw, method)
+
+    async def send(self, reader, writer, raw, method):
+        writer.write(raw)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise EOFError
+        version, status = status_line.split(b' ', 2)[:2]
+        status = int(status)
+        headers = {}
+        while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == b'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+        if method == 'HEAD' or status in (204, 304):
+            body = b''
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while size := int((await reader.readline()).split(b';')[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # trailers
+            body = b''.join(chunks)
+        else:
+            body, keep_alive = await reader.read(), False
+
+        if keep_alive:
+            self.idle.append((reader, writer))
+        else:
+            writer.close()
+        return status, headers, body
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class Session:
+    """One logged-in simulated user and what it has learned about its data."""
+
+    def __init__(self, client, username, password, role):
+        self.client, self.username, self.password, self.role = client, username, password, role
+        self.token = None
+        self.state = {}
+        self.rng = random.Random(username)
+
+    async def login(self):
+        status, data = await self.client.request(
+            'POST', '/api/auth/token/', {'username': self.username, 'password': self.password}
+        )
+        if status != 200:
+            raise HTTPError(status, json.dumps(data).encode() if isinstance(data, dict) else data)
+        self.token = data['access']
+
+    async def call(self, method, path, data=None, expect=(200, 201), label=None, **kwargs):
+        status, payload = await self.client.request(method, path, data, self.token, label, **kwargs)
+        if status == 401 and self.password:
+            await self.login()  # access tokens expire during long runs
+            status, payload = await self.client.request(method, path, data, self.token, label, **kwargs)
+        if expect and status not in expect:
+            raise HTTPError(status, json.dumps(payload).encode() if isinstance(payload, (dict, list)) else payload)
+        return payload
+
+    async def ids(self, path):
+        page = await self.call('GET', path, label=f'GET {path.partition("?")[0]} (setup)')
+        return [row['id'] for row in page['results']]
+
+
+def today():
+    return datetime.date.today().isoformat()
+
+
+# Scenarios: one unit of work for a simulated user. Each role picks from its mix by weight.
+
+sequence = itertools.count(random.randrange(10**4) * 10**5)
+
+
+async def list_inquiries(s):
+    await s.call('GET', '/api/inquiries/?page_size=20')
+
+
+async def followup_queue(s):
+    await s.call('GET', f'/api/inquiries/?followup_due={today()}&page_size=20')
+
+
+async def create_inquiry(s):
+    n = next(sequence)
+    inquiry = await s.call('POST', '/api/inquiries/', {
+        'name': f'Load Lead {n}', 'mobile': f'6{n:09d}', 'email': f'load{n}@example.com', 'college': 'COEP',
+        'degree': 'B.Tech', 'branch': 'CS', 'passout_year': 2025, 'interested_course': 'Data Science',
+        'source': 'Walk-in', 'next_followup_date': today(),
+    })
+    s.state.setdefault('inquiries', []).append(inquiry['id'])
+
+
+async def add_followup(s):
+    if not s.state.get('inquiries'):
+        return await create_inquiry(s)
+    inquiry = s.rng.choice(s.state['inquiries'])
+    await s.call('POST', f'/api/inquiries/{inquiry}/add_followup/', {
+        'remark': 'Called, asked for a demo', 'status': s.rng.choice(['HOT', 'WARM', 'COLD']),
+    })
+
+
+async def search_leads(s):
+    await s.call('GET', f'/api/search/?q={s.rng.choice(["load", "coep", "lead", "data"])}&type=inquiry')
+
+
+async def todays_agenda(s):
+    await s.call('GET', '/api/batches/today/')
+
+
+async def bulk_mark_attendance(s):
+    if not s.state.get('roster'):
+        return
+    await s.call('POST', '/api/attendance/bulk_mark/', {
+        'batch': s.state['batch'], 'date': today(), 'topic_taught': 'Load testing',
+        'records': [
+            {'student': student, 'status': s.rng.choice(['PRESENT_OFFLINE', 'PRESENT_ONLINE', 'ABSENT'])}
+            for student in s.state['roster']
+        ],
+    })
+
+
+async def attendance_matrix(s):
+    if s.state.get('batch'):
+        await s.call('GET', f'/api/batches/{s.state["batch"]}/attendance_matrix/')
+
+
+async def create_fee(s):
+    if s.state.get('students'):
+        await s.call('POST', '/api/fees/', {
+            'student': s.rng.choice(s.state['students']), 'amount': '500.00', 'mode': s.rng.choice(['UPI', 'CASH']),
+        })
+
+
+async def list_fees(s):
+    await s.call('GET', '/api/fees/?page_size=20')
+
+
+async def students_with_dues(s):
+    await s.call('GET', '/api/students/?balance_due__gt=0&page_size=20')
+
+
+async def dashboard(s):
+    await s.call('GET', '/api/dashboard/stats/')
+
+
+async def batch_conflicts(s):
+    await s.call('GET', '/api/batches/conflicts/')
+
+
+async def create_outreach(s):
+    n = next(sequence)
+    await s.call('POST', '/api/outreach/', {
+        'company_name': f'Load Company {n % 200}', 'contact_name': 'HR', 'mode': 'CALL',
+        'phone_email': f'hr{n}@example.com', 'remark': 'Shared placement brochure',
+    })
+
+
+async def list_outreach(s):
+    await s.call('GET', '/api/outreach/?page_size=20')
+
+
+SCENARIOS = {
+    'COUNSELOR': [(4, list_inquiries), (3, create_inquiry), (3, add_followup), (2, followup_queue), (1, search_leads)],
+    'TRAINER': [(3, todays_agenda), (2, bulk_mark_attendance), (1, attendance_matrix)],
+    'HR_ADMIN': [(3, create_fee), (2, list_fees), (1, students_with_dues)],
+    'MANAGER': [(4, dashboard), (1, students_with_dues), (1, batch_conflicts)],
+    'PLACEMENT_OFFICER': [(2, create_outreach), (2, list_outreach)],
+}
+
+
+# Setup
+
+def parse_users(value):
+    counts = {}
+    for item in value.split(','):
+        role, _, count = item.partition('=')
+        role = role.strip().upper()
+        if role not in ROLES:
+            raise argparse.ArgumentTypeError(f'unknown role {role!r}; use {", ".join(r.lower() for r in ROLES)}')
+        counts[role] = int(count)
+    return counts
+
+
+async def start_sessions(client, counts, options, prepare_data=True):
+    """Log in ``counts`` load-<role>-<n> users, creating them first when --admin is given. Returns (admin, sessions)."""
+    admin = None
+    if options.admin:
+        username, _, password = options.admin.partition(':')
+        admin = Session(client, username, password, None)
+        await admin.login()
+        for role, count in counts.items():
+            for n in range(count):
+                status, data = await client.request('POST', '/api/users/', {
+                    'username': f'load-{role.lower()}-{n}', 'password': options.password, 'role': role,
+                }, admin.token, 'POST /api/users/ (setup)')
+                if status != 201 and 'username' not in data:  # already exists from an earlier run
+                    raise HTTPError(status, json.dumps(data).encode())
+
+    sessions = [
+        Session(client, f'load-{role.lower()}-{n}', options.password, role)
+        for role, count in counts.items() for n in range(count)
+    ]
+    await asyncio.gather(*(session.login() for session in sessions))
+    if prepare_data:
+        for session in sessions:
+            await prepare(session, admin)  # one at a time: setup writes would contend for SQLite's lock
+    return admin, sessions
+
+
+async def prepare(session, admin):
+    """Load the ids a session's scenarios work on, creating a batch with a roster for trainers."""
+    if session.role == 'COUNSELOR':
+        session.state['inquiries'] = await session.ids('/api/inquiries/?fields=id&page_size=50')
+    elif session.role == 'HR_ADMIN':
+        session.state['students'] = await session.ids('/api/students/?fields=id&page_size=200')
+    elif session.role == 'TRAINER':
+        batches = await session.ids('/api/batches/?fields=id')
+        if not batches and admin:
+            batches = [await create_training_batch(session, admin)]
+        if batches:
+            session.state['batch'] = batches[0]
+            session.state['roster'] = await session.ids(f'/api/students/?batch={batches[0]}&fields=id&page_size=200')
+
+
+async def create_training_batch(trainer, admin):
+    me = await trainer.call('GET', '/api/users/me/', label='GET /api/users/me/ (setup)')
+    start = (datetime.date.today() - datetime.timedelta(days=60)).isoformat()
+    batch = await admin.call('POST', '/api/batches/', {
+        'course': 'Data Science', 'batch_name': f'Load {trainer.username}', 'trainer': me['id'],
+        'start_date': start, 'start_time': '09:00', 'end_time': '10:00', 'days_of_week': 'daily',
+    }, label='POST /api/batches/ (setup)')
+    for n in range(ROSTER_SIZE):
+        mobile = f'8{me["id"]:05d}{n:04d}'
+        inquiry = await admin.call('POST', '/api/inquiries/', {
+            'name': f'Load Student {me["id"]}-{n}', 'mobile': mobile, 'email': f'{mobile}@example.com',
+            'college': 'PICT', 'degree': 'B.E.', 'branch': 'IT', 'passout_year': 2025,
+            'interested_course': 'Data Science', 'source': 'Referral', 'lead_status': 'ENROLLED',
+        }, label='POST /api/inquiries/ (setup)')
+        await admin.call('POST', '/api/students/', {
+            'inquiry': inquiry['id'], 'mobile': mobile, 'email': f'{mobile}@example.com', 'course': 'Data Science',
+            'batch': batch['id'], 'total_fees': '30000.00', 'enrollment_date': start,
+        }, label='POST /api/students/ (setup)')
+    return batch['id']
+
+
+# Modes
+
+async def simulate(session, deadline, think):
+    weights, scenarios = zip(*SCENARIOS[session.role])
+    while time.perf_counter() < deadline:
+        scenario = session.rng.choices(scenarios, weights)[0]
+        try:
+            await scenario(session)
+        except HTTPError:
+            pass  # already counted against the endpoint
+        if think:
+            await asyncio.sleep(session.rng.expovariate(1 / think))
+
+
+async def run(options):
+    setup_stats = Stats()
+    client = Client(options.base_url, setup_stats)
+    _, sessions = await start_sessions(client, options.users, options)
+    print(f'{len(sessions)} users logged in; running for {options.duration}s...')
+
+    client.stats = stats = Stats()
+    deadline = time.perf_counter() + options.duration
+    await asyncio.gather(*(simulate(session, deadline, options.think) for session in sessions))
+    client.close()
+    return stats
+
+
+async def replay(options):
+    with open(options.log) as handle:
+        entries = sorted((json.loads(line) for line in handle if line.strip()), key=lambda entry: entry['ts'])
+    stats = Stats()
+    playable = []
+    for entry in entries:
+        if entry['path'].startswith('/api/auth/'):
+            stats.skipped['auth requests (replayed users log in once)'] += 1
+        elif entry['method'] not in ('GET', 'HEAD') and 'body' not in entry:
+            stats.skipped['writes recorded without ACCESS_LOG_BODIES'] += 1
+        else:
+            playable.append(entry)
+
+    # Recorded roles are replayed by load users of the same role; anything else
+    # (superusers, roles this script does not know) by the --admin account.
+    counts = Counter(entry['role'] for entry in playable if entry['role'] in ROLES)
+    users = {role: min(count, options.users_per_role) for role, count in counts.items()}
+    client = Client(options.base_url, Stats())
+    admin, sessions = await start_sessions(client, users, options, prepare_data=False)
+    pools = {role: itertools.cycle([s for s in sessions if s.role == role]) for role in users}
+    anonymous = Session(client, None, None, None)
+    if not admin:
+        unknown = [entry for entry in playable if entry['role'] and entry['role'] not in ROLES]
+        for entry in unknown:
+            stats.skipped[f'{entry["role"]} requests (pass --admin to replay them)'] += 1
+        playable = [entry for entry in playable if entry not in unknown]
+    print(f'Replaying {len(playable)} requests as {len(sessions)} users at {options.speed}x...')
+
+    client.stats = stats
+    stats.started = time.perf_counter()
+    inflight = asyncio.Semaphore(options.max_inflight)
+
+    async def send(entry):
+        async with inflight:
+            if entry['role'] in pools:
+                session = next(pools[entry['role']])
+            else:
+                session = admin if entry['role'] else anonymous
+            try:
+                await session.call(
+                    entry['method'], entry['path'], expect=None, body=entry.get('body'),
+                    content_type=entry.get('content_type'),
+                )
+            except HTTPError:
+                pass
+
+    tasks = []
+    first = playable[0]['ts'] if playable else 0
+    for entry in playable:
+        delay = (entry['ts'] - first) / options.speed - (time.perf_counter() - stats.started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(entry)))
+    await asyncio.gather(*tasks)
+    client.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--admin', help='username:password of an account that may create users and batches')
+    parser.add_argument('--password', default='load-test-pass', help='Password of the load-<role>-<n> users.')
+    parser.add_argument('--json', help='Also write the report to this file.')
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    mix = modes.add_parser('run', help='Replay the weighted scenario mix.')
+    mix.add_argument('--users', type=parse_users, default=parse_users(DEFAULT_USERS), help=f'default: {DEFAULT_USERS}')
+    mix.add_argument('--duration', type=float, default=60)
+    mix.add_argument('--think', type=float, default=0.5, help='Mean pause between a user\'s actions, in seconds.')
+
+    log = modes.add_parser('replay', help='Replay a log written by api.middleware.AccessLogMiddleware.')
+    log.add_argument('log')
+    log.add_argument('--speed', type=float, default=1.0, help='Time compression: 2 replays twice as fast.')
+    log.add_argument('--users-per-role', type=int, default=5)
+    log.add_argument('--max-inflight', type=int, default=200)
+
+    options = parser.parse_args(argv)
+    stats = asyncio.run(run(options) if options.mode == 'run' else replay(options))
+    stats.print()
+    if options.json:
+        with open(options.json, 'w') as handle:
+            json.dump(stats.summary(), handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
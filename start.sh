@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+# Exit on error
+set -o errexit
+
+# SERVER_MODE=asgi serves through uvicorn workers so async views
+# (e.g. /api/async/dashboard/stats/) can overlap their queries.
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+    exec gunicorn backend.asgi:application -k uvicorn_worker.UvicornWorker
+else
+    exec gunicorn backend.wsgi:application
+fi